@@ -18,6 +18,8 @@ import app.models.tenant
 import app.models.room
 import app.models.contract
 import app.models.payment
+import app.models.invoice
+import app.models.rollup
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,66 @@
+"""add room labels for faceted search
+
+Revision ID: 0b9e5d3a7c42
+Revises: f4a7d2c19b36
+Create Date: 2026-10-18 15:12:40.226105
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9e5d3a7c42'
+down_revision: Union[str, Sequence[str], None] = 'f4a7d2c19b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _values(items):
+    # mirrors app.services.rooms._label_values
+    out = set()
+    for v in items or ():
+        if isinstance(v, dict):
+            v = v.get('name')
+        if v is None:
+            continue
+        v = str(v).strip().lower()[:100]
+        if v:
+            out.add(v)
+    return out
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    labels = op.create_table(
+        'room_labels',
+        sa.Column('room_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('room_id', 'kind', 'value'),
+    )
+    op.create_index('ix_room_labels_kind_value_room', 'room_labels', ['kind', 'value', 'room_id'], unique=False)
+    op.create_index('ix_rooms_available_floor_price', 'rooms', ['available', 'floor', 'price'], unique=False)
+
+    if context.is_offline_mode():
+        return
+    # backfill from the JSON columns
+    rooms = sa.table('rooms', sa.column('id', sa.Integer), sa.column('tags', sa.JSON), sa.column('amenities', sa.JSON))
+    rows = [
+        {'room_id': room_id, 'kind': kind, 'value': value}
+        for room_id, tags, amenities in op.get_bind().execute(sa.select(rooms.c.id, rooms.c.tags, rooms.c.amenities))
+        for kind, items in (('tag', tags), ('amenity', amenities))
+        for value in _values(items)
+    ]
+    if rows:
+        op.bulk_insert(labels, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rooms_available_floor_price', table_name='rooms')
+    op.drop_index('ix_room_labels_kind_value_room', table_name='room_labels')
+    op.drop_table('room_labels')
@@ -0,0 +1,49 @@
+"""add reporting rollups
+
+Revision ID: 2d6f1b8c4e07
+Revises: 9d4b2e7f1a53
+Create Date: 2026-10-18 20:02:41.118406
+
+Existing payments and contracts are backfilled by the next revision
+(6a1f3c8e2b95).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6f1b8c4e07'
+down_revision: Union[str, Sequence[str], None] = '9d4b2e7f1a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payment_daily_totals',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('room_id', sa.Integer(), nullable=False),
+        sa.Column('method', sa.String(length=50), nullable=False),
+        sa.Column('total', sa.Numeric(14, 2), server_default='0', nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id']),
+        sa.PrimaryKeyConstraint('day', 'room_id', 'method'),
+    )
+    op.create_table(
+        'room_occupancy_monthly',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('room_id', sa.Integer(), nullable=False),
+        sa.Column('occupied_days', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id']),
+        sa.PrimaryKeyConstraint('month', 'room_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('room_occupancy_monthly')
+    op.drop_table('payment_daily_totals')
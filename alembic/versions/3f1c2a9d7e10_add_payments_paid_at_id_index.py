@@ -0,0 +1,28 @@
+"""add payments paid_at id index
+
+Revision ID: 3f1c2a9d7e10
+Revises: b1eccf4536e1
+Create Date: 2026-10-18 09:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7e10'
+down_revision: Union[str, Sequence[str], None] = 'b1eccf4536e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_payments_paid_at_id', 'payments', ['paid_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_paid_at_id', table_name='payments')
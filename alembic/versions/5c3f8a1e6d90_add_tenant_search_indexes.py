@@ -0,0 +1,51 @@
+"""add tenant search indexes
+
+Revision ID: 5c3f8a1e6d90
+Revises: 0b9e5d3a7c42
+Create Date: 2026-10-18 16:02:31.774519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3f8a1e6d90'
+down_revision: Union[str, Sequence[str], None] = '0b9e5d3a7c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must stay textually equivalent to app.models.tenant.search_document()
+SEARCH_DOCUMENT = "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(id_number, ''))"
+
+FTS_COLUMNS = "name, email, phone, id_number"
+FTS_DELETE = f"INSERT INTO tenants_fts(tenants_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, old.name, old.email, old.phone, old.id_number);"
+FTS_INSERT = f"INSERT INTO tenants_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, new.name, new.email, new.phone, new.id_number);"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(f'CREATE INDEX ix_tenants_search_trgm ON tenants USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)')
+    elif dialect == 'sqlite':
+        op.execute(f"CREATE VIRTUAL TABLE tenants_fts USING fts5({FTS_COLUMNS}, content='tenants', content_rowid='id', prefix='2 3 4')")
+        op.execute(f'CREATE TRIGGER tenants_fts_ai AFTER INSERT ON tenants BEGIN {FTS_INSERT} END')
+        op.execute(f'CREATE TRIGGER tenants_fts_ad AFTER DELETE ON tenants BEGIN {FTS_DELETE} END')
+        op.execute(f'CREATE TRIGGER tenants_fts_au AFTER UPDATE ON tenants BEGIN {FTS_DELETE} {FTS_INSERT} END')
+        # index the existing rows
+        op.execute("INSERT INTO tenants_fts(tenants_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tenants_search_trgm')
+    elif dialect == 'sqlite':
+        for trigger in ('tenants_fts_ai', 'tenants_fts_ad', 'tenants_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS tenants_fts')
@@ -0,0 +1,72 @@
+"""rebuild reporting rollups
+
+Revision ID: 6a1f3c8e2b95
+Revises: 2d6f1b8c4e07
+Create Date: 2026-10-18 21:14:05.532871
+
+Backfills payment_daily_totals and room_occupancy_monthly from the ledger.
+The occupancy rollup no longer holds open-ended contracts (they are added at
+query time), so rows projected for them by earlier builds are dropped too.
+
+"""
+import calendar
+from collections import defaultdict
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f3c8e2b95'
+down_revision: Union[str, Sequence[str], None] = '2d6f1b8c4e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _occupancy_rows(contracts):
+    # mirrors app.services.rollups._occupancy_rows
+    days = defaultdict(int)
+    for room_id, start, end in contracts:
+        d = start
+        while d <= end:
+            last = d.replace(day=calendar.monthrange(d.year, d.month)[1])
+            days[(d.replace(day=1), room_id)] += (min(end, last) - d).days + 1
+            d = last + timedelta(days=1)
+    return days
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if context.is_offline_mode():
+        return
+    op.execute("DELETE FROM payment_daily_totals")
+    op.execute(
+        """
+        INSERT INTO payment_daily_totals (day, room_id, method, total, count)
+        SELECT date(p.paid_at), c.room_id, COALESCE(p.method, ''), SUM(p.amount), COUNT(p.id)
+        FROM payments p JOIN contracts c ON c.id = p.contract_id
+        GROUP BY date(p.paid_at), c.room_id, COALESCE(p.method, '')
+        """
+    )
+
+    op.execute("DELETE FROM room_occupancy_monthly")
+    contracts = sa.table(
+        'contracts', sa.column('room_id', sa.Integer), sa.column('start_date', sa.Date),
+        sa.column('end_date', sa.Date), sa.column('active', sa.Boolean),
+    )
+    rows = op.get_bind().execute(
+        sa.select(contracts.c.room_id, contracts.c.start_date, contracts.c.end_date)
+        .where(contracts.c.active == sa.true(), contracts.c.end_date.is_not(None))
+    )
+    occupancy = sa.table('room_occupancy_monthly', sa.column('month', sa.Date), sa.column('room_id', sa.Integer), sa.column('occupied_days', sa.Integer))
+    values = [{'month': m, 'room_id': r, 'occupied_days': n} for (m, r), n in _occupancy_rows(rows).items()]
+    if values:
+        op.bulk_insert(occupancy, values)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # data only; the rebuilt rows stay valid for the previous revision
+    pass
@@ -0,0 +1,28 @@
+"""add user token version
+
+Revision ID: 7a4d9e2b5c81
+Revises: 3f1c2a9d7e10
+Create Date: 2026-10-18 10:02:17.448210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4d9e2b5c81'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,48 @@
+"""add invoices
+
+Revision ID: 9d4b2e7f1a53
+Revises: 5c3f8a1e6d90
+Create Date: 2026-10-18 19:10:05.583012
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b2e7f1a53'
+down_revision: Union[str, Sequence[str], None] = '5c3f8a1e6d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'invoices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contract_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Date(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('amount_paid', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='open', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('contract_id', 'period', name='uq_invoices_contract_period'),
+    )
+    op.create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    op.create_index(op.f('ix_invoices_updated_at'), 'invoices', ['updated_at'], unique=False)
+    op.create_index('ix_invoices_status_due_date', 'invoices', ['status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_status_due_date', table_name='invoices')
+    op.drop_index(op.f('ix_invoices_updated_at'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_id'), table_name='invoices')
+    op.drop_table('invoices')
@@ -0,0 +1,33 @@
+"""cascade invoice contract delete
+
+Revision ID: b7e2d9a4c013
+Revises: 6a1f3c8e2b95
+Create Date: 2026-10-18 23:02:41.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d9a4c013'
+down_revision: Union[str, Sequence[str], None] = '6a1f3c8e2b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the app runs SQLite without foreign key enforcement; there the ORM cascade deletes the invoices
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('invoices_contract_id_fkey', 'invoices', type_='foreignkey')
+        op.create_foreign_key('invoices_contract_id_fkey', 'invoices', 'contracts', ['contract_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('invoices_contract_id_fkey', 'invoices', type_='foreignkey')
+        op.create_foreign_key('invoices_contract_id_fkey', 'invoices', 'contracts', ['contract_id'], ['id'])
@@ -0,0 +1,33 @@
+"""tenant updated_at not null
+
+Revision ID: c3a8f5e1d742
+Revises: b7e2d9a4c013
+Create Date: 2026-10-18 23:40:12.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a8f5e1d742'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d9a4c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('UPDATE tenants SET updated_at = created_at WHERE updated_at IS NULL')
+    # SQLite can only change nullability by rebuilding the table, which would drop
+    # the tenants_fts triggers; the model's Python default keeps the column filled there
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('tenants', 'updated_at', existing_type=sa.DateTime(), existing_server_default=sa.text('now()'), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('tenants', 'updated_at', existing_type=sa.DateTime(), existing_server_default=sa.text('now()'), nullable=True)
@@ -0,0 +1,42 @@
+"""add contract running balance
+
+Revision ID: c52e8f17a3d4
+Revises: 7a4d9e2b5c81
+Create Date: 2026-10-18 11:20:53.907734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e8f17a3d4'
+down_revision: Union[str, Sequence[str], None] = '7a4d9e2b5c81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contracts', sa.Column('total_paid', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.add_column('contracts', sa.Column('payment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('contracts', sa.Column('last_paid_at', sa.DateTime(), nullable=True))
+
+    # backfill from the payments ledger
+    op.execute(
+        """
+        UPDATE contracts SET
+            total_paid = COALESCE((SELECT SUM(p.amount) FROM payments p WHERE p.contract_id = contracts.id), 0),
+            payment_count = (SELECT COUNT(*) FROM payments p WHERE p.contract_id = contracts.id),
+            last_paid_at = (SELECT MAX(p.paid_at) FROM payments p WHERE p.contract_id = contracts.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contracts', 'last_paid_at')
+    op.drop_column('contracts', 'payment_count')
+    op.drop_column('contracts', 'total_paid')
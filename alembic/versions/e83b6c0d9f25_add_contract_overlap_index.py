@@ -0,0 +1,37 @@
+"""add contract overlap index and exclusion constraint
+
+Revision ID: e83b6c0d9f25
+Revises: c52e8f17a3d4
+Create Date: 2026-10-18 12:05:38.112590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83b6c0d9f25'
+down_revision: Union[str, Sequence[str], None] = 'c52e8f17a3d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contracts_room_active_dates', 'contracts', ['room_id', 'active', 'start_date', 'end_date'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        # fails if existing active contracts already overlap; resolve those first
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        op.execute(
+            "ALTER TABLE contracts ADD CONSTRAINT contracts_no_overlap "
+            "EXCLUDE USING gist (room_id WITH =, daterange(start_date, end_date, '[]') WITH &&) WHERE (active)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE contracts DROP CONSTRAINT contracts_no_overlap')
+    op.drop_index('ix_contracts_room_active_dates', table_name='contracts')
@@ -0,0 +1,35 @@
+"""add updated_at for etags
+
+Revision ID: f4a7d2c19b36
+Revises: e83b6c0d9f25
+Create Date: 2026-10-18 14:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a7d2c19b36'
+down_revision: Union[str, Sequence[str], None] = 'e83b6c0d9f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contracts', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('payments', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    # max(updated_at) per table backs the list ETags
+    for table in ('tenants', 'rooms', 'contracts', 'payments'):
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('payments', 'contracts', 'rooms', 'tenants'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+    op.drop_column('payments', 'updated_at')
+    op.drop_column('contracts', 'updated_at')
@@ -1,3 +1,5 @@
+import os
+from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -5,12 +7,73 @@ class Settings(BaseSettings):
     # Postgres DSN — override via .env or environment
     DATABASE_URL: str
     DEBUG: bool = False
-    # optional: connection pool / timeout tuning
     SQL_ECHO: bool = False
 
+    # connection pool / engine tuning (pool sizes are per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30          # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800          # seconds; replace connections older than this
+    DB_POOL_PRE_PING: bool = True        # survive Postgres restarts / idle disconnects
+    DB_CONNECT_TIMEOUT: int = 10         # seconds
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None  # server-side statement timeout (Postgres)
+    # opt-in async engine (asyncpg / aiosqlite); derived from DATABASE_URL when unset
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # read replicas for GET-only pages and lists (app.db.replicas): comma-separated
+    # DSNs, tried round robin; locally a copy of the SQLite file will do
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    REPLICA_STICKY_SECONDS: float = 5    # after a user's own write, their reads stay on the primary
+    REPLICA_RETRY_SECONDS: float = 30    # a replica that failed to connect is skipped this long
+
     # auth
     SECRET_KEY: str = Field("change-me-to-a-secure-random-string", env="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
+    # verified-principal cache used by require_user_ui / get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAXSIZE: int = 10_000
+    # bcrypt worker pool: concurrent hashes and how many more may wait before 429
+    PASSWORD_HASH_WORKERS: int = Field(default_factory=lambda: max(1, (os.cpu_count() or 2) // 2))
+    PASSWORD_HASH_QUEUE_DEPTH: int = 32
+
+    # list endpoints / UI pages (keyset pagination)
+    PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
+    # JSON lists as plain rows encoded by orjson (app.core.serialization)
+    # instead of ORM objects through response_model
+    FAST_JSON_LISTS: bool = False
+
+    # rows validated and inserted per transaction by the CSV / JSONL importers
+    IMPORT_BATCH_SIZE: int = 1000
+    # ops accepted by one POST /{entity}/batch request (app.services.batch)
+    BATCH_MAX_OPS: int = 1000
+
+    # request / SQL instrumentation (app.core.timing)
+    LOG_LEVEL: str = "INFO"
+    TIMING_HEADERS: bool = True                 # Server-Timing on every response
+    REQUEST_LOG: bool = True                    # one JSON log line per request
+    SLOW_REQUEST_MS: Optional[float] = 1000     # logged at WARNING; None disables
+    SLOW_QUERY_MS: Optional[float] = 200        # statement + parameter types at WARNING; None disables
+
+    # /metrics (app.core.metrics). With several workers, point every worker at
+    # the same directory, emptied before the server starts, so each scrape
+    # sees all of them; worker snapshots there are at most FLUSH seconds old.
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 1.0
+    # domain gauges (active contracts, today's payments, ...) are recomputed at most this often
+    METRICS_DOMAIN_TTL_SECONDS: float = 30
+    # scrapers send "Authorization: Bearer <token>"; without a token the
+    # endpoint is open but leaves out the domain (business) gauges
+    METRICS_TOKEN: Optional[str] = None
+
+    # Jinja2 (app.core.templates). Auto-reload follows DEBUG unless set; the
+    # bytecode cache survives restarts (default dir: per-user under the temp dir).
+    TEMPLATE_AUTO_RELOAD: Optional[bool] = None
+    TEMPLATE_BYTECODE_CACHE: bool = True
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+    # {% cache %} fragments kept per worker
+    TEMPLATE_FRAGMENT_CACHE_SIZE: int = 20_000
+    TEMPLATE_FRAGMENT_CACHE_TTL_SECONDS: float = 600
 
     class Config:
         env_file = ".env"
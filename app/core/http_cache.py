@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+class Validator(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+        return headers
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def row_validator(db: Session, model, pk: int) -> Optional[Validator]:
+    """Validator for one row from its `updated_at` alone; None if the row is missing."""
+    row = db.query(model.updated_at).filter(model.id == pk).first()
+    if row is None:
+        return None
+    return Validator(_etag(model.__tablename__, pk, row.updated_at), row.updated_at)
+
+def table_validator(db: Session, model) -> Validator:
+    """Validator for a whole table from one aggregate over its indexes.
+
+    max(updated_at) moves on every insert and update, count/max(id) on deletes,
+    so any change to any row yields a new ETag without reading the rows. It
+    carries no Last-Modified: a delete does not move max(updated_at), so an
+    If-Modified-Since check would keep answering 304 for a stale list; list
+    requests are revalidated by If-None-Match only.
+    """
+    count, max_id, last = db.query(func.count(model.id), func.max(model.id), func.max(model.updated_at)).one()
+    return Validator(_etag(model.__tablename__, count, max_id, last))
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def not_modified(request: Request, validator: Validator) -> Optional[Response]:
+    """Return a bare 304 if the client's copy is current, else None.
+
+    If-None-Match wins over If-Modified-Since when both are sent.
+    """
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        fresh = _etag_matches(inm, validator.etag)
+    else:
+        ims = request.headers.get("if-modified-since")
+        fresh = False
+        if ims and validator.last_modified:
+            try:
+                since = parsedate_to_datetime(ims)
+            except (TypeError, ValueError):
+                since = None
+            if since is not None and since.tzinfo is not None:
+                last = validator.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+                fresh = last <= since
+    if fresh:
+        return Response(status_code=304, headers=validator.headers())
+    return None
+
+def set_validator(response: Response, validator: Validator) -> None:
+    response.headers.update(validator.headers())
+    # revalidate every time; a 304 costs one aggregate query
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,234 @@
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# seconds; covers a cached page (ms) up to a stuck report (10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[list]:
+        with self._lock:
+            return [[list(k), v if not isinstance(v, dict) else dict(v, buckets=list(v["buckets"]))] for k, v in self._values.items()]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels) -> None:
+        # for mirroring a cumulative count kept elsewhere (e.g. PoolStats)
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Gauge(Metric):
+    """Per-process value; across workers the live processes' values are summed."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][i] += 1
+                    break
+            entry["sum"] += value
+            entry["count"] += 1
+
+class Registry:
+    """Metrics of this process, optionally shared with sibling workers.
+
+    With `multiproc_dir` set, every worker writes its snapshot to its own file
+    there (at most every `flush_interval` seconds, and before it serves a
+    scrape); a scrape merges all files. Counters and histograms of exited
+    workers keep counting so totals never go backwards; gauges only count
+    while their process is alive.
+    """
+
+    def __init__(self, multiproc_dir: Optional[str] = None, flush_interval: float = 1.0):
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._flushed = 0.0
+
+    def _register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def on_collect(self, fn: Callable[[], None]) -> None:
+        """Run `fn` before every snapshot, to refresh values read from elsewhere."""
+        self._collectors.append(fn)
+
+    def snapshot(self) -> dict:
+        for fn in self._collectors:
+            fn()
+        return {
+            "pid": os.getpid(),
+            "metrics": {
+                m.name: {"type": m.kind, "help": m.help, "labels": list(m.labelnames),
+                         "buckets": list(getattr(m, "buckets", ())), "samples": m.samples()}
+                for m in self._metrics.values()
+            },
+        }
+
+    def flush(self, force: bool = False) -> None:
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed < self.flush_interval:
+            return
+        self._flushed = now
+        fd, tmp = tempfile.mkstemp(dir=self.multiproc_dir, prefix=".metrics-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, os.path.join(self.multiproc_dir, f"metrics-{os.getpid()}.json"))
+
+    def _snapshots(self) -> List[dict]:
+        if not self.multiproc_dir:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = []
+        for name in os.listdir(self.multiproc_dir):
+            if name.startswith("metrics-") and name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.multiproc_dir, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue  # replaced or removed mid-read; next scrape picks it up
+        return snapshots
+
+    def collect(self) -> Dict[str, dict]:
+        """Merged metrics of every worker: name -> {type, help, labels, buckets, samples}."""
+        merged: Dict[str, dict] = {}
+        for snap in self._snapshots():
+            alive = _alive(snap["pid"])
+            for name, metric in snap["metrics"].items():
+                if metric["type"] == "gauge" and not alive:
+                    continue
+                target = merged.setdefault(name, {**metric, "samples": {}})
+                for labels, value in metric["samples"]:
+                    key = tuple(labels)
+                    current = target["samples"].get(key)
+                    if metric["type"] == "histogram":
+                        if current is None:
+                            target["samples"][key] = {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+                        else:
+                            current["buckets"] = [a + b for a, b in zip(current["buckets"], value["buckets"])]
+                            current["sum"] += value["sum"]
+                            current["count"] += value["count"]
+                    else:
+                        target["samples"][key] = (current or 0) + value
+        return merged
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in pairs) + "}"
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(metrics: Dict[str, dict]) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, metric in sorted(metrics.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labels"]
+        for key, value in sorted(metric["samples"].items()):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"], value["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(names, key, ('le', _number(float(bound))))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(names, key, ('le', '+Inf'))} {value['count']}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(float(value['sum']))}")
+            lines.append(f"{name}_count{_labels(names, key)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+def gauges(values: Dict[str, Tuple[str, float]]) -> Dict[str, dict]:
+    """Unlabelled gauges ({name: (help, value)}) in collect()'s shape, for render()."""
+    return {
+        name: {"type": "gauge", "help": help, "labels": [], "buckets": [], "samples": {(): value}}
+        for name, (help, value) in values.items()
+    }
+
+registry = Registry(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+template_latency = registry.histogram("template_render_seconds", "Jinja2 render time by template.", ("template",))
+password_verify_latency = registry.histogram(
+    "password_verify_seconds", "bcrypt verify time, excluding queueing for the hash pool.",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+
+def observe_request(method: str, route: str, status: Optional[int], seconds: float) -> None:
+    http_requests.inc(method=method, route=route, status=status or 0)
+    http_latency.observe(seconds, method=method, route=route)
+    registry.flush()
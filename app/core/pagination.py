@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _from_json(value: Any, column) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [_from_json(v, k) for v, k in zip(values, keys)]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def paginate(query: Query, keys: Sequence, limit: int, after: Optional[str] = None) -> Page:
+    """Keyset pagination over `keys` in descending order.
+
+    `after` is the opaque cursor returned as `next_cursor` by the previous page;
+    the query seeks past it with an index-friendly comparison instead of OFFSET,
+    so every page costs the same regardless of how deep the client has scrolled.
+    """
+    if after:
+        values = decode_cursor(after, keys)
+        if len(keys) == 1:
+            query = query.filter(keys[0] < values[0])
+        else:
+            query = query.filter(tuple_(*keys) < tuple_(*(literal(v, k.type) for v, k in zip(values, keys))))
+
+    rows = query.order_by(*(k.desc() for k in keys)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor([getattr(last, k.key) for k in keys]))
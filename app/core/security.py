@@ -1,23 +1,129 @@
+import asyncio
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
-from typing import Optional
+from typing import Any, Hashable, NamedTuple, Optional
 
 from app.core.config import settings
+from app.core.metrics import password_verify_latency
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ALGORITHM = "HS256"
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    start = time.perf_counter()
+    try:
+        return pwd_context.verify(plain, hashed)
+    finally:
+        password_verify_latency.observe(time.perf_counter() - start)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: str | int, expires_delta: Optional[timedelta] = None) -> str:
+class PasswordPoolBusy(RuntimeError):
+    """Raised when the password hashing pool has no free worker or queue slot."""
+
+class PasswordHashPool:
+    """Bounded worker pool for bcrypt.
+
+    bcrypt releases the GIL, so a few threads hash in parallel without holding
+    the event loop or the request threadpool. At most `workers + queue_depth`
+    jobs are admitted; anything beyond that is rejected immediately instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy("password hashing pool is saturated")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # release on completion, not on await, so cancelled requests can't overcommit
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_DEPTH)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_pool.run(verify_password, plain, hashed)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+def create_access_token(subject: str | int, expires_delta: Optional[timedelta] = None, claims: Optional[dict] = None) -> str:
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
\ No newline at end of file
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+
+def metrics_token_matches(authorization: Optional[str]) -> bool:
+    """True if METRICS_TOKEN is set and `authorization` is "Bearer <that token>"."""
+    token = settings.METRICS_TOKEN
+    scheme, _, presented = (authorization or "").partition(" ")
+    return bool(token) and scheme.lower() == "bearer" and hmac.compare_digest(presented.strip().encode(), token.encode())
+
+class Principal(NamedTuple):
+    """Verified identity of the caller, detached from any DB session."""
+    id: int
+    username: str
+    email: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    token_version: int
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire `ttl` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+# user id -> Principal; lets protected routes skip the users table on a hit.
+# Entries are dropped on deactivation / revocation in this process and expire
+# after the TTL everywhere else, so the TTL bounds cross-worker staleness.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_MAXSIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
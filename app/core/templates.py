@@ -0,0 +1,56 @@
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+
+from app.core.config import settings
+from app.core.security import TTLCache
+from app.core.timing import TimedTemplate
+
+# rendered fragments by key; entries are keyed on the rows' updated_at, so a
+# stale entry is never looked up again and the TTL only bounds memory
+fragment_cache = TTLCache(settings.TEMPLATE_FRAGMENT_CACHE_SIZE, settings.TEMPLATE_FRAGMENT_CACHE_TTL_SECONDS)
+
+class FragmentCacheExtension(Extension):
+    """`{% cache "name", key, ... %}...{% endcache %}` renders the body once per key.
+
+    The body must depend only on the key's values: include the updated_at of
+    every row it reads, and nothing request-specific (user, URL, CSRF token).
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_cached", [nodes.List(parts)]), [], [], body).set_lineno(lineno)
+
+    def _cached(self, key, caller):
+        key = tuple(key)
+        fragment = fragment_cache.get(key)
+        if fragment is None:
+            fragment = caller()
+            fragment_cache.set(key, fragment)
+        return fragment
+
+def _bytecode_cache():
+    if not settings.TEMPLATE_BYTECODE_CACHE:
+        return None
+    # without a directory Jinja2 uses a per-user folder under the system temp dir
+    return FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR) if settings.TEMPLATE_BYTECODE_CACHE_DIR else FileSystemBytecodeCache()
+
+env = Environment(
+    loader=FileSystemLoader("app/templates"),
+    autoescape=True,
+    # stat() every template on every render only while developing
+    auto_reload=settings.DEBUG if settings.TEMPLATE_AUTO_RELOAD is None else settings.TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=_bytecode_cache(),
+    extensions=[FragmentCacheExtension],
+)
+# render time goes into each request's Server-Timing / log line and /metrics
+env.template_class = TimedTemplate
+
+# the one template environment every router renders with
+templates = Jinja2Templates(env=env)
@@ -0,0 +1,186 @@
+import json
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import observe_request, template_latency
+
+request_log = logging.getLogger("app.request")
+sql_log = logging.getLogger("app.sql")
+
+class RequestTimings:
+    """SQL and template figures for one request, filled in by the hooks below."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.sql = 0.0
+        self.slowest = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.templates = 0.0
+
+    def record_query(self, seconds: float, statement: str) -> None:
+        self.queries += 1
+        self.sql += seconds
+        if seconds > self.slowest:
+            self.slowest, self.slowest_sql = seconds, statement
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        # "app" is whatever is left: routing, validation, serialization
+        total = self.elapsed()
+        app = max(0.0, total - self.sql - self.templates)
+        return ", ".join((
+            f'db;dur={self.sql * 1000:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.templates * 1000:.1f}",
+            f"app;dur={app * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ))
+
+# set by TimingMiddleware; sync handlers see the same object through the
+# context copy the threadpool makes, so their queries are counted too
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+# -- SQL --
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)"
+# expanded IN lists and multi-row VALUES collapse to one shape whatever their length
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES \([^()]*\))(?:\s*,\s*\([^()]*\))+")
+
+def normalize_sql(statement: str) -> str:
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _VALUES_ROWS.sub(r"\1, ...", sql)
+    return _PLACEHOLDER_LIST.sub("(?, ...)", sql)
+
+def _shape(params: Any) -> Any:
+    if isinstance(params, dict):
+        return {k: type(v).__name__ for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [type(v).__name__ for v in params]
+    return type(params).__name__
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "shape": _shape(rows[0]) if rows else None}
+    return _shape(parameters)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.record_query(seconds, statement)
+    if settings.SLOW_QUERY_MS is not None and seconds * 1000 >= settings.SLOW_QUERY_MS:
+        sql_log.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(seconds * 1000, 2),
+            "sql": normalize_sql(statement),
+            "params": parameter_shape(parameters, executemany),
+        }))
+
+def _handle_error(context):
+    stack = context.connection.info.get("query_start") if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Time every statement on `engine` for the current request and the slow-query log."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+# -- templates --
+
+class TimedTemplate(Template):
+    """Jinja2 template that records its render time for the request and /metrics."""
+
+    def render(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            template_latency.observe(seconds, template=self.name or "<string>")
+            timings = _current.get()
+            if timings is not None:
+                timings.templates += seconds
+
+# -- requests --
+
+def _log_request(scope, status: Optional[int], timings: RequestTimings) -> None:
+    duration_ms = timings.total * 1000
+    slow = settings.SLOW_REQUEST_MS is not None and duration_ms >= settings.SLOW_REQUEST_MS
+    if not (slow or settings.REQUEST_LOG):
+        return
+    line = {
+        "event": "slow_request" if slow else "request",
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "db_queries": timings.queries,
+        "db_ms": round(timings.sql * 1000, 2),
+        "db_slowest_ms": round(timings.slowest * 1000, 2),
+        "template_ms": round(timings.templates * 1000, 2),
+    }
+    if timings.slowest_sql:
+        line["db_slowest_sql"] = normalize_sql(timings.slowest_sql)
+    request_log.log(logging.WARNING if slow else logging.INFO, json.dumps(line))
+
+class TimingMiddleware:
+    """Per-request timings as a Server-Timing header and one structured log line.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streaming responses pass
+    through untouched; the header reflects the work done before the first
+    byte, the log line the whole request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.TIMING_HEADERS:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            timings.total = timings.elapsed()
+            _log_request(scope, status, timings)
+            # the route template, not the raw path, keeps label cardinality bounded
+            observe_request(scope["method"], getattr(scope.get("route"), "path", "<unmatched>"), status, timings.total)
@@ -0,0 +1,63 @@
+"""Portable SQL date / integer helpers for the dialects this app runs on.
+
+Each construct compiles to native SQL on Postgres and SQLite so reports can
+do their arithmetic in one statement instead of row by row in Python.
+"""
+from sqlalchemy import Date, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+class add_months(FunctionElement):
+    """add_months(date, n): the date n calendar months later."""
+    type = Date()
+    inherit_cache = True
+    name = "add_months"
+
+@compiles(add_months, "postgresql")
+def _add_months_pg(element, compiler, **kw):
+    d, n = list(element.clauses)
+    return f"CAST({compiler.process(d, **kw)} + make_interval(months => {compiler.process(n, **kw)}) AS DATE)"
+
+@compiles(add_months, "sqlite")
+def _add_months_sqlite(element, compiler, **kw):
+    d, n = list(element.clauses)
+    # date(d, '+N months') rolls an overflowing day into the next month (Jan 31
+    # + 1 month = Mar 3); cap it at the target month's last day, as Postgres does.
+    # Operands are compiled once per use so positional binds line up.
+    shifted = f"date({compiler.process(d, **kw)}, '+' || ({compiler.process(n, **kw)}) || ' months')"
+    month_end = (
+        f"date({compiler.process(d, **kw)}, 'start of month', "
+        f"'+' || ({compiler.process(n, **kw)}) || ' months', '+1 month', '-1 day')"
+    )
+    return f"min({month_end}, {shifted})"
+
+class days_between(FunctionElement):
+    """days_between(later, earlier): whole days from `earlier` to `later`."""
+    type = Integer()
+    inherit_cache = True
+    name = "days_between"
+
+@compiles(days_between, "postgresql")
+def _days_between_pg(element, compiler, **kw):
+    a, b = list(element.clauses)
+    return f"(CAST({compiler.process(a, **kw)} AS DATE) - CAST({compiler.process(b, **kw)} AS DATE))"
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    a, b = list(element.clauses)
+    return f"CAST(julianday({compiler.process(a, **kw)}) - julianday({compiler.process(b, **kw)}) AS INTEGER)"
+
+class floor_int(FunctionElement):
+    """floor_int(x): floor of a non-negative numeric as an integer."""
+    type = Integer()
+    inherit_cache = True
+    name = "floor_int"
+
+@compiles(floor_int, "postgresql")
+def _floor_int_pg(element, compiler, **kw):
+    return f"CAST(floor({compiler.process(element.clauses, **kw)}) AS INTEGER)"
+
+@compiles(floor_int, "sqlite")
+def _floor_int_sqlite(element, compiler, **kw):
+    # CAST truncates toward zero, which is floor for the non-negative inputs used here
+    return f"CAST({compiler.process(element.clauses, **kw)} AS INTEGER)"
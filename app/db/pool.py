@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+class PoolStats:
+    """Running checkout-wait figures for one pool (per worker process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_seconds": round(self.wait_total, 6),
+                "wait_avg_seconds": round(self.wait_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_max_seconds": round(self.wait_max, 6),
+            }
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+def pool_status(engine: Optional[Engine]) -> dict:
+    """Occupancy and checkout-wait numbers for sizing workers against the DB."""
+    if engine is None:
+        return {}
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,115 @@
+import itertools
+import logging
+import math
+import time
+from typing import Generator, List, Optional, Sequence
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.db.pool import pool_status
+from app.db.session import SessionLocal, get_db, make_engine
+
+log = logging.getLogger("app.db")
+
+# Set on the response to a user's successful write and holding its expiry
+# (epoch seconds); while it is valid that browser reads from the primary, so
+# it sees its own changes however far the replicas lag.
+STICKY_COOKIE = "read_primary_until"
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+def replica_urls(value: Optional[str]) -> List[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+class ReplicaRouter:
+    """Read sessions on the replicas, round robin.
+
+    A replica whose connection fails is skipped for `retry_after` seconds and
+    the next one is tried in the same request; with none left, session()
+    returns None and the caller reads from the primary.
+    """
+
+    def __init__(self, engines: Sequence[Engine], retry_after: float = 30, factory: sessionmaker = SessionLocal):
+        self.factory = factory
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(self.engines)
+        self._turn = itertools.count()
+
+    def _candidates(self) -> List[int]:
+        if not self.engines:
+            return []
+        now, start, n = time.monotonic(), next(self._turn), len(self.engines)
+        return [i for i in ((start + k) % n for k in range(n)) if self._down_until[i] <= now]
+
+    def session(self) -> Optional[Session]:
+        for i in self._candidates():
+            db = self.factory(bind=self.engines[i])
+            try:
+                db.connection()  # check out now, so an unreachable replica is caught here
+                return db
+            except DBAPIError as e:
+                db.close()
+                self._down_until[i] = time.monotonic() + self.retry_after
+                log.warning("replica %s unavailable, skipped for %ss: %s", self.name(i), self.retry_after, e.orig)
+        return None
+
+    def name(self, i: int) -> str:
+        return self.engines[i].url.render_as_string(hide_password=True)
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {"url": self.name(i), "healthy": self._down_until[i] <= now, **pool_status(engine)}
+            for i, engine in enumerate(self.engines)
+        ]
+
+replicas = ReplicaRouter([make_engine(url) for url in replica_urls(settings.DATABASE_REPLICA_URLS)], settings.REPLICA_RETRY_SECONDS)
+
+def reads_own_writes(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    """get_db for GET-only routes: a replica session, unless the user has just written.
+
+    Falls back to get_db's session (which only connects if used), so without
+    DATABASE_REPLICA_URLS, or with every replica down, this is exactly get_db.
+    """
+    replica = None if reads_own_writes(request) else replicas.session()
+    if replica is None:
+        yield db
+        return
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+class ReadYourWritesMiddleware:
+    """Sets STICKY_COOKIE on every successful write response while replicas are configured."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _WRITE_METHODS or not replicas.engines:
+            await self.app(scope, receive, send)
+            return
+        sticky = settings.REPLICA_STICKY_SECONDS
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + sticky
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={math.ceil(sticky)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,20 +1,85 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.timing import instrument_engine
+from app.db.pool import TimedQueuePool
+
+def connect_args(url: str) -> dict:
+    """Per-dialect DBAPI connect arguments (timeouts, server-side statement timeout)."""
+    parsed = make_url(url)
+    backend, driver = parsed.get_backend_name(), parsed.get_driver_name()
+    if backend == "sqlite":
+        # timeout is SQLite's busy-wait on a locked database file
+        return {"check_same_thread": False, "timeout": settings.DB_CONNECT_TIMEOUT}
+    if backend == "postgresql":
+        if driver == "asyncpg":
+            args = {"timeout": settings.DB_CONNECT_TIMEOUT}
+            if settings.DB_STATEMENT_TIMEOUT_MS:
+                args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+            return args
+        args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        return args
+    return {}
+
+def engine_options(url: str) -> dict:
+    options = {
+        "echo": settings.SQL_ECHO or settings.DEBUG,
+        "connect_args": connect_args(url),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    # in-memory SQLite uses a per-thread singleton pool with no queue to size
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+def make_engine(url: str) -> Engine:
+    """Sync engine for `url` with the tuned options, timed pool and SQL instrumentation."""
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = TimedQueuePool
+    return instrument_engine(create_engine(url, **options))
 
 # Create engine from settings
-engine = create_engine(
-    settings.DATABASE_URL,
-    #echo=settings.SQL_ECHO or settings.DEBUG,
-    # only used for SQLite — ignored by Postgres
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-)
+engine = make_engine(settings.DATABASE_URL)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(url: str) -> str:
+    """Map a sync DSN onto its async driver (asyncpg for Postgres, aiosqlite for SQLite)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+# Opt-in async engine; async handlers use it through get_async_db when DB_ASYNC is set
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url))
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Either session kind; accepted by run_db and the services' *_async variants
+AnySession = Union[AsyncSession, Session]
+
 # Base for models to inherit
 Base = declarative_base()
 
@@ -23,4 +88,23 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AnySession, None]:
+    # Without DB_ASYNC this hands out a regular Session; run_db then moves its
+    # blocking I/O to the threadpool, so async handlers never block the loop.
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def run_db(db: AnySession, fn, *args, **kwargs):
+    """Await a sync service function `fn(session, *args)` against either session kind."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -1,29 +1,44 @@
+import logging
+
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.core.exceptions import RedirectException 
+from app.core.config import settings
+from app.core.security import PasswordPoolBusy, password_pool
+from app.core.templates import templates
+from app.core.timing import TimingMiddleware
 
 from app.routes import dashboard
-from app.routes import tenants, contracts, rooms, payments
+from app.routes import tenants, contracts, rooms, payments, invoices, reports, health, metrics
 from app.routes import auth as auth_routes
 from app.routes.auth import require_user_ui
-from app.db.session import get_db
+from app.db.replicas import ReadYourWritesMiddleware, get_read_db
 from app.models import User
+from app.services.reports import dashboard_kpis
 
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 app = FastAPI()
+app.add_middleware(TimingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 @app.exception_handler(RedirectException)
 async def redirect_exception_handler(request: Request, exc: RedirectException):
     return RedirectResponse(url=exc.headers["Location"])
 
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    # shed login / register load fast rather than queueing behind bcrypt
+    return JSONResponse({"detail": "Too many authentication requests, retry shortly"}, status_code=429, headers={"Retry-After": "1"})
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@app.on_event("shutdown")
+def shutdown_password_pool():
+    password_pool.shutdown()
 
-# Templates
-templates = Jinja2Templates(directory="app/templates")
+
+app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # Routes
 app.include_router(dashboard.router)
@@ -31,9 +46,13 @@ app.include_router(tenants.router)
 app.include_router(contracts.router)
 app.include_router(rooms.router)
 app.include_router(payments.router)
+app.include_router(invoices.router)
+app.include_router(reports.router)
 app.include_router(auth_routes.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
 
 @app.get("/")
-def read_root(request: Request, current_user = Depends(require_user_ui), db: Session = Depends(get_db)):
+def read_root(request: Request, current_user = Depends(require_user_ui), db: Session = Depends(get_read_db)):
     users = db.query(User).order_by(User.id.desc()).all()
-    return templates.TemplateResponse("dashboard.html", {"request": request, "current_user": current_user, "users": users})
+    return templates.TemplateResponse("dashboard.html", {"request": request, "current_user": current_user, "users": users, "kpis": dashboard_kpis(db)})
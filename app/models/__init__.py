@@ -1,7 +1,9 @@
 from .tenant import Tenant
-from .room import Room
+from .room import Room, RoomLabel
 from .contract import Contract
 from .payment import Payment
+from .invoice import Invoice
+from .rollup import PaymentDailyTotal, RoomOccupancyMonthly
 from .user import User
 
-__all__ = ["Tenant", "Room", "Contract", "Payment", "User"]
\ No newline at end of file
+__all__ = ["Tenant", "Room", "RoomLabel", "Contract", "Payment", "Invoice", "PaymentDailyTotal", "RoomOccupancyMonthly", "User"]
\ No newline at end of file
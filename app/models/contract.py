@@ -1,5 +1,5 @@
-from datetime import date
-from sqlalchemy import Column, Integer, ForeignKey, Date, Numeric, Boolean
+from datetime import date, datetime
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Numeric, Boolean, Index, DDL, event, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -14,5 +14,33 @@ class Contract(Base):
     rent_amount = Column(Numeric(10, 2), nullable=False)
     active = Column(Boolean, default=True)
 
+    # running ledger totals, maintained by create_payment / delete_payment
+    total_paid = Column(Numeric(12, 2), default=0, server_default="0", nullable=False)
+    payment_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_paid_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False, index=True)
+
     tenant = relationship("Tenant", backref="contracts")
-    room = relationship("Room", backref="contracts")
\ No newline at end of file
+    room = relationship("Room", backref="contracts")
+
+    __table_args__ = (
+        # backs the overlap check in services.contracts._find_overlap
+        Index("ix_contracts_room_active_dates", "room_id", "active", "start_date", "end_date"),
+    )
+
+# Postgres enforces non-overlap itself, closing the check-then-insert race.
+# Inclusive bounds match _overlaps; a NULL end_date is an open-ended range.
+event.listen(
+    Contract.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Contract.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE contracts ADD CONSTRAINT contracts_no_overlap "
+        "EXCLUDE USING gist (room_id WITH =, daterange(start_date, end_date, '[]') WITH &&) WHERE (active)"
+    ).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, Numeric, String, Index, UniqueConstraint, func
+from sqlalchemy.orm import backref, relationship
+from app.db.session import Base
+
+class Invoice(Base):
+    """One month's rent charge for a contract; payments are allocated to a
+    contract's invoices oldest first (services.invoices.allocate_payments)."""
+    __tablename__ = "invoices"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    period = Column(Date, nullable=False)            # first day of the billed month
+    due_date = Column(Date, nullable=False)
+    amount = Column(Numeric(10, 2), nullable=False)
+    amount_paid = Column(Numeric(12, 2), default=0, server_default="0", nullable=False)
+    status = Column(String(20), default="open", server_default="open", nullable=False)  # open / partial / paid
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False, index=True)
+
+    # a contract's invoices go with it; they are rebuilt by generate_invoices, not entered by hand
+    contract = relationship("Contract", backref=backref("invoices", cascade="all, delete-orphan"))
+
+    __table_args__ = (
+        # makes generate_invoices idempotent and backs the per-contract allocation window
+        UniqueConstraint("contract_id", "period", name="uq_invoices_contract_period"),
+        Index("ix_invoices_status_due_date", "status", "due_date"),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric, String, Index, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -12,5 +12,11 @@ class Payment(Base):
     paid_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     method = Column(String(50), nullable=True)
     note = Column(String(500), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False, index=True)
 
-    contract = relationship("Contract", backref="payments")
\ No newline at end of file
+    contract = relationship("Contract", backref="payments")
+
+    __table_args__ = (
+        # backs keyset pagination ordered by (paid_at, id)
+        Index("ix_payments_paid_at_id", "paid_at", "id"),
+    )
\ No newline at end of file
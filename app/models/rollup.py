@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Numeric, String
+from app.db.session import Base
+
+# Pre-aggregated reporting tables, maintained incrementally by the payment and
+# contract services (see app.services.rollups) and rebuildable from scratch.
+
+class PaymentDailyTotal(Base):
+    __tablename__ = "payment_daily_totals"
+
+    day = Column(Date, primary_key=True)
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    method = Column(String(50), primary_key=True, default="")  # "" when the payment had no method
+    total = Column(Numeric(14, 2), default=0, server_default="0", nullable=False)
+    count = Column(Integer, default=0, server_default="0", nullable=False)
+
+class RoomOccupancyMonthly(Base):
+    __tablename__ = "room_occupancy_monthly"
+
+    month = Column(Date, primary_key=True)  # first day of the month
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    occupied_days = Column(Integer, nullable=False)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, Numeric, Text, DateTime, func
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, Float, Numeric, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import JSON
 from app.db.session import Base
 
@@ -31,4 +32,23 @@ class Room(Base):
     available = Column(Boolean, default=True)
 
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    # Python-side onupdate keeps sub-second resolution for ETags (see app.core.http_cache)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        # leading equality filters of /rooms/search, then the price range
+        Index("ix_rooms_available_floor_price", "available", "floor", "price"),
+    )
+
+class RoomLabel(Base):
+    """One tag or amenity of a room, normalized out of the JSON columns so
+    /rooms/search can seek on it; kept in sync by services.rooms.sync_labels."""
+    __tablename__ = "room_labels"
+
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(20), primary_key=True)   # "tag" or "amenity"
+    value = Column(String(100), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_room_labels_kind_value_room", "kind", "value", "room_id"),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Boolean, func
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Boolean, DDL, event, func, literal_column
 from sqlalchemy.types import JSON
 from app.db.session import Base
 
@@ -33,4 +33,47 @@ class Tenant(Base):
     metadata_json = Column("metadata", JSON, nullable=True)  # DB column stays "metadata", attribute is metadata_json
     is_active = Column(Boolean, default=True)
 
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=True)
\ No newline at end of file
+    # Python-side onupdate keeps sub-second resolution for ETags (see app.core.http_cache)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False, index=True)
+
+def search_document():
+    """lower(name || ' ' || email || ' ' || phone || ' ' || id_number), NULL-safe.
+
+    Rendered with inline literals so Postgres matches it against the
+    ix_tenants_search_trgm expression index.
+    """
+    empty, space = literal_column("''"), literal_column("' '")
+    doc = func.coalesce(Tenant.name, empty)
+    for column in (Tenant.email, Tenant.phone, Tenant.id_number):
+        doc = doc + space + func.coalesce(column, empty)
+    return func.lower(doc)
+
+# Search indexes for services.tenants.search_tenants: a trigram GIN index on
+# Postgres, an external-content FTS5 table kept in sync by triggers on SQLite.
+event.listen(
+    Tenant.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Tenant.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_tenants_search_trgm ON tenants USING gin ("
+        "(lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(id_number, ''))) gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"),
+)
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tenants_fts USING fts5("
+    "name, email, phone, id_number, content='tenants', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS tenants_fts_ai AFTER INSERT ON tenants BEGIN "
+    "INSERT INTO tenants_fts(rowid, name, email, phone, id_number) VALUES (new.id, new.name, new.email, new.phone, new.id_number); END",
+    "CREATE TRIGGER IF NOT EXISTS tenants_fts_ad AFTER DELETE ON tenants BEGIN "
+    "INSERT INTO tenants_fts(tenants_fts, rowid, name, email, phone, id_number) VALUES ('delete', old.id, old.name, old.email, old.phone, old.id_number); END",
+    "CREATE TRIGGER IF NOT EXISTS tenants_fts_au AFTER UPDATE ON tenants BEGIN "
+    "INSERT INTO tenants_fts(tenants_fts, rowid, name, email, phone, id_number) VALUES ('delete', old.id, old.name, old.email, old.phone, old.id_number); "
+    "INSERT INTO tenants_fts(rowid, name, email, phone, id_number) VALUES (new.id, new.name, new.email, new.phone, new.id_number); END",
+)
+for statement in SQLITE_FTS_DDL:
+    event.listen(Tenant.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Tenant.__table__, "before_drop", DDL("DROP TABLE IF EXISTS tenants_fts").execute_if(dialect="sqlite"))
@@ -10,5 +10,7 @@ class User(Base):
     hashed_password = Column(String(200), nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # bumped to revoke every token issued before it (deactivation, password change)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
\ No newline at end of file
@@ -1,29 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 
 from app.db.session import get_db
 import app.services.users as users_svc
 from app.schemas.user import UserCreate, UserRead, Token
-from app.core.security import create_access_token, decode_access_token
+from app.core.security import create_access_token, decode_access_token, get_password_hash_async, Principal
 from app.core.config import settings
 from app.core.exceptions import RedirectException
+from app.core.templates import templates
 from app.models.user import User
 
-templates = Jinja2Templates(directory="app/templates")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 # API token endpoint (existing)
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = users_svc.authenticate_user(db, form_data.username, form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await users_svc.authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    access_token = create_access_token(subject=user.id)
+    access_token = create_access_token(subject=user.id, claims=users_svc.token_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 # -- UI: show login page --
@@ -33,13 +34,13 @@ def login_ui(request: Request):
 
 # -- UI: process login form, set HttpOnly cookie and redirect --
 @router.post("/login")
-def login_ui_post(request: Request, response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = users_svc.authenticate_user(db, form_data.username, form_data.password)
+async def login_ui_post(request: Request, response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await users_svc.authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         # re-render login with error
         return templates.TemplateResponse("auth_login.html", {"request": request, "error": "Invalid credentials"}, status_code=401)
 
-    token = create_access_token(subject=user.id)
+    token = create_access_token(subject=user.id, claims=users_svc.token_claims(user))
     redirect = RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     # set HttpOnly cookie with token (also set SameSite and secure as needed)
     redirect.set_cookie(
@@ -59,11 +60,12 @@ def register_ui(request: Request):
 
 # API registration endpoint
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = users_svc.get_user_by_username(db, payload.username)
+async def register(payload: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(users_svc.get_user_by_username, db, payload.username)
     if existing:
         raise HTTPException(status_code=400, detail="username already registered")
-    user = users_svc.create_user(db, payload)
+    hashed = await get_password_hash_async(payload.password)
+    user = await run_in_threadpool(users_svc.create_user, db, payload, hashed)
     return user
 
 # logout (clear cookie)
@@ -73,17 +75,24 @@ def logout():
     redirect.delete_cookie("access_token")
     return redirect
 
-# Helper: get current user from Authorization header OR cookie
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    # oauth2_scheme will look for Authorization header; if missing it will raise.
+# Verify a token and resolve its principal; the users table is only read on a
+# principal-cache miss, so the session never checks out a connection on a hit.
+def _principal_from_token(token: str, db: Session) -> Optional[Principal]:
     try:
         payload = decode_access_token(token)
         user_id = int(payload.get("sub"))
     except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-    user = users_svc.get_user(db, user_id)
+        return None
+    if payload.get("active") is False:
+        return None
+    return users_svc.get_principal(db, user_id, int(payload.get("ver", 0)))
+
+# Helper: get current user from Authorization header OR cookie
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    # oauth2_scheme will look for Authorization header; if missing it will raise.
+    user = _principal_from_token(token, db)
     if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
     return user
 
 # UI-friendly dependency: check cookie and redirect to login when missing / invalid
@@ -93,13 +102,7 @@ def require_user_ui(request: Request, db: Session = Depends(get_db)):
         # Redirect the browser to login
         raise RedirectException(path="/auth/login")
 
-    try:
-        payload = decode_access_token(token)
-        user_id = int(payload.get("sub"))
-    except Exception:
-        raise RedirectException(path="/auth/login")
-        
-    user = users_svc.get_user(db, user_id)
+    user = _principal_from_token(token, db)
     if not user:
         raise RedirectException(path="/auth/login")
         
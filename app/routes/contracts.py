@@ -1,29 +1,38 @@
+from datetime import date
 from decimal import Decimal
-from fastapi import APIRouter, Depends, Form, HTTPException, status, Request
-from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Form, HTTPException, status, Request, Response, Query
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.models.user import User
 from app.routes.auth import require_user_ui
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.http_cache import not_modified, row_validator, set_validator, table_validator
+from app.core.serialization import RowsJSONResponse
+from app.core.templates import templates
+from app.db.replicas import get_read_db
+from app.db.session import get_db, get_async_db, AnySession
 from app.models import Contract, Tenant, Room, Payment
 from app.schemas import ContractCreate, ContractRead, ContractUpdate, tenant
+from app.schemas.batch import BatchReport, BatchRequest
 import app.services.contracts as svc
 import app.services.payments as payments_svc
-
-templates = Jinja2Templates(directory="app/templates")
+import app.services.exports as exports_svc
+import app.services.batch as batch_svc
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
 # -- HTML UI endpoints (register these first so "/ui" is matched before "/{contract_id}") --
 @router.get("/ui")
-def contracts_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    contracts = svc.list_contracts(db)
+def contracts_ui(request: Request, after: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    try:
+        page = svc.page_contracts(db, settings.PAGE_SIZE, after, profile="table")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return templates.TemplateResponse(
         "contracts.html", 
-        {"request": request, "contracts": contracts, "current_user": current_user}
+        {"request": request, "contracts": page.items, "next_cursor": page.next_cursor, "after": after, "current_user": current_user}
     )
 
 @router.get("/ui/new")
@@ -37,11 +46,11 @@ def contract_new_ui(request: Request, db: Session = Depends(get_db), current_use
 
 @router.get("/ui/{contract_id}")
 def contract_detail_ui(contract_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    contract = svc.get_contract(db, contract_id)
+    contract = svc.get_contract(db, contract_id, profile="table")
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     payments = db.query(Payment).filter(Payment.contract_id == contract.id).order_by(Payment.paid_at.desc()).all()
-    total_paid = payments_svc.total_paid_for_contract(db, contract.id)
+    total_paid = contract.total_paid
     return templates.TemplateResponse(
         "contract_detail.html", 
         {"request": request, "contract": contract, "payments": payments, "total_paid": total_paid, "current_user": current_user}
@@ -60,7 +69,7 @@ def contract_edit_ui(contract_id: int, request: Request, db: Session = Depends(g
     )
 
 @router.post("/ui/new")
-async def contract_create_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+async def contract_create_ui(request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
     form = await request.form()
     print("form:", form)
     data = dict(form)
@@ -71,12 +80,12 @@ async def contract_create_ui(request: Request, db: Session = Depends(get_db), cu
     except Exception as e:
         return templates.TemplateResponse("contract_form.html", {"request": request, "action": "create", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
-    contract = svc.create_contract(db, payload)
+    contract = await svc.create_contract_async(db, payload)
     return RedirectResponse(f"/contracts/ui/{contract.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 @router.post("/ui/{contract_id}/edit")
-async def contract_edit_post(contract_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    contract = svc.get_contract(db, contract_id)
+async def contract_edit_post(contract_id: int, request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
+    contract = await svc.get_contract_async(db, contract_id)
     print("Contract:", contract)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
@@ -88,16 +97,56 @@ async def contract_edit_post(contract_id: int, request: Request, db: Session = D
     # build changes dict excluding empty strings
     changes = {k: v for k, v in data.items() if v not in (None, "")}
     try:
-        updated = svc.update_contract(db, contract, **changes)
+        updated = await svc.update_contract_async(db, contract, **changes)
     except Exception as e:
         return templates.TemplateResponse("contract_form.html", {"request": request, "contract": contract, "action": "edit", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
     return RedirectResponse(f"/contracts/ui/{updated.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 # -- JSON API endpoints --
+@router.get("/export")
+def export_contracts(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    contract_id: Optional[int] = None,
+    room_id: Optional[int] = None,
+    tenant_id: Optional[int] = None,
+    active: Optional[bool] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    return StreamingResponse(
+        exports_svc.export_contracts(db, format, start, end, contract_id, room_id, tenant_id, active),
+        media_type=exports_svc.FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=contracts.{format}"},
+    )
+
 @router.get("/", response_model=List[ContractRead])
-def list_contracts(db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    return svc.list_contracts(db)
+def list_contracts(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    validator = table_validator(db, Contract)
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
+    fast = settings.FAST_JSON_LISTS
+    try:
+        page = svc.page_contract_rows(db, limit, after) if fast else svc.page_contracts(db, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fast:
+        # pre-encoded rows; response_model still documents the shape
+        response = RowsJSONResponse(page.items)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    set_validator(response, validator)
+    return response if fast else page.items
 
 @router.post("/", response_model=ContractRead, status_code=status.HTTP_201_CREATED)
 def create_contract(payload: ContractCreate, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
@@ -109,11 +158,29 @@ def create_contract(payload: ContractCreate, db: Session = Depends(get_db), curr
             raise HTTPException(status_code=404, detail=msg)
         raise HTTPException(status_code=400, detail=msg)
 
+@router.post("/batch", response_model=BatchReport)
+def batch_contracts(payload: BatchRequest, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    # one transaction for all ops (app.services.batch); an atomic batch that was rolled back answers 400
+    try:
+        report = batch_svc.apply_batch(db, "contracts", payload.ops, payload.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not report.committed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return report
+
 @router.get("/{contract_id}", response_model=ContractRead)
-def get_contract(contract_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+def get_contract(contract_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    validator = row_validator(db, Contract, contract_id)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
     contract = svc.get_contract(db, contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
+    set_validator(response, validator)
     return contract
 
 @router.put("/{contract_id}", response_model=ContractRead)
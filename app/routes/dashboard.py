@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from sqlalchemy.orm import Session
+
+from app.core.templates import templates
+from app.db.replicas import get_read_db
 
 from app.models.user import User
 from app.routes.auth import require_user_ui
+from app.services.reports import dashboard_kpis
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter()
 
 
 @router.get("/dashboard")
-async def dashboard(request: Request, current_user: User = Depends(require_user_ui)):
-    return templates.TemplateResponse("dashboard.html", {"request": request, "current_user": current_user})
+def dashboard(request: Request, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    return templates.TemplateResponse("dashboard.html", {"request": request, "current_user": current_user, "kpis": dashboard_kpis(db)})
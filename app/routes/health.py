@@ -0,0 +1,36 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.security import metrics_token_matches
+from app.db.pool import pool_status
+from app.db.replicas import replicas
+from app.db.session import engine, async_engine, get_db
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/")
+def health():
+    return {"status": "ok"}
+
+# Up/down for anyone (load balancers); pool occupancy / checkout wait for this
+# worker process and replica URLs only with the METRICS_TOKEN bearer token.
+@router.get("/db")
+def db_health(db: Session = Depends(get_db), authorization: Optional[str] = Header(None)):
+    try:
+        db.execute(text("SELECT 1"))
+    except DBAPIError:
+        return JSONResponse({"status": "unavailable"}, status_code=503)
+    status = {"status": "ok"}
+    if not metrics_token_matches(authorization):
+        return status
+    status["engine"] = pool_status(engine)
+    if async_engine is not None:
+        status["async_engine"] = pool_status(async_engine.sync_engine)
+    if replicas.engines:
+        status["replicas"] = replicas.status()
+    return status
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.config import settings
+from app.db.replicas import get_read_db
+from app.db.session import get_db
+from app.models.user import User
+from app.routes.auth import require_user_ui
+from app.schemas import InvoiceRead, InvoiceRun
+import app.services.invoices as svc
+
+router = APIRouter(prefix="/invoices", tags=["invoices"])
+
+# API endpoints
+@router.post("/generate", response_model=InvoiceRun)
+def generate_invoices(
+    period: str = Query(..., description="YYYY-MM"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_user_ui),
+):
+    # idempotent: re-running a month only fills in contracts not yet invoiced
+    try:
+        month = svc.parse_period(period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return svc.generate_invoices(db, month)
+
+@router.get("/", response_model=List[InvoiceRead])
+def list_invoices(
+    response: Response,
+    contract_id: Optional[int] = None,
+    period: Optional[str] = Query(None, description="YYYY-MM"),
+    status: Optional[str] = Query(None, pattern="^(open|partial|paid)$"),
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    try:
+        month = svc.parse_period(period) if period else None
+        page = svc.page_invoices(db, limit, after, contract_id=contract_id, period=month, status=status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.get("/{invoice_id}", response_model=InvoiceRead)
+def get_invoice(invoice_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    invoice = svc.get_invoice(db, invoice_id)
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return invoice
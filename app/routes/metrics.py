@@ -0,0 +1,70 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import gauges, registry, render
+from app.core.security import metrics_token_matches
+from app.db.pool import pool_status
+from app.db.replicas import replicas
+from app.db.session import async_engine, engine, get_db
+from app.services.reports import domain_counters
+
+router = APIRouter(tags=["metrics"])
+
+pool_size = registry.gauge("db_pool_size", "Configured pool size.", ("engine",))
+pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out.", ("engine",))
+pool_overflow = registry.gauge("db_pool_overflow", "Connections open beyond the pool size.", ("engine",))
+pool_checkouts = registry.counter("db_pool_checkouts_total", "Connection checkouts.", ("engine",))
+pool_timeouts = registry.counter("db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection.", ("engine",))
+pool_wait = registry.counter("db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection.", ("engine",))
+
+def _collect_pools() -> None:
+    engines = {"sync": engine, "async": async_engine.sync_engine if async_engine is not None else None}
+    engines.update((f"replica{i}", eng) for i, eng in enumerate(replicas.engines))
+    for name, eng in engines.items():
+        if eng is None:
+            continue
+        status = pool_status(eng)
+        if "size" in status:
+            pool_size.set(status["size"], engine=name)
+            pool_checked_out.set(status["checked_out"], engine=name)
+            pool_overflow.set(max(0, status["overflow"]), engine=name)
+        if "checkouts" in status:
+            pool_checkouts.set_total(status["checkouts"], engine=name)
+            pool_timeouts.set_total(status["timeouts"], engine=name)
+            pool_wait.set_total(status["wait_total_seconds"], engine=name)
+
+registry.on_collect(_collect_pools)
+
+DOMAIN_HELP = {
+    "active_contracts": "Contracts active today.",
+    "payments_today": "Payments recorded today.",
+    "payments_today_amount": "Sum of payments recorded today.",
+    "overdue_invoices": "Open or partially paid invoices past their due date.",
+    "occupancy_rate": "Occupied share of active room-days this month.",
+}
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> bool:
+    """True if the scrape is authenticated; 401 if METRICS_TOKEN is set and not presented."""
+    if not settings.METRICS_TOKEN:
+        return False
+    if not metrics_token_matches(authorization):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return True
+
+# Prometheus text format; not part of the OpenAPI schema
+@router.get("/metrics", include_in_schema=False)
+def metrics(db: Session = Depends(get_db), authenticated: bool = Depends(require_metrics_token)):
+    collected = registry.collect()
+    if authenticated:
+        # the domain gauges are global, not per worker, so they are added after the merge
+        counters = domain_counters(db)
+        collected.update(gauges({f"sbms_{k}": (DOMAIN_HELP[k], v) for k, v in counters.items()}))
+    return PlainTextResponse(render(collected), media_type="text/plain; version=0.0.4")
@@ -1,30 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from functools import partial
+from typing import List, Optional
 
+from app.core.config import settings
+from app.core.http_cache import not_modified, row_validator, set_validator, table_validator
+from app.core.serialization import RowsJSONResponse
+from app.core.templates import templates
+from app.db.replicas import get_read_db
 from app.db.session import get_db
-from app.models import Payment, Contract
+from app.models import Payment, Contract, Tenant
 from app.models.user import User
 from app.routes.auth import require_user_ui
 from app.schemas import PaymentCreate, PaymentRead
+from app.schemas.batch import BatchReport, BatchRequest
 import app.services.payments as svc
-
-templates = Jinja2Templates(directory="app/templates")
+import app.services.contracts as contracts_svc
+import app.services.exports as exports_svc
+import app.services.batch as batch_svc
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+def _contract_picker(db: Session) -> dict:
+    # the <option> list is fragment-cached on both tables' validators, so the
+    # contracts are only queried (lazily, from the template) when one changed
+    key = (table_validator(db, Contract).etag, table_validator(db, Tenant).etag)
+    return {"contracts": partial(contracts_svc.list_contracts, db, profile="picker"), "picker_key": key}
+
 # UI endpoints (register before param routes)
 @router.get("/ui")
-def payments_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    payments = svc.list_payments(db)
-    contracts = db.query(Contract).order_by(Contract.id.desc()).all()
-    return templates.TemplateResponse("payments.html", {"request": request, "payments": payments, "current_user": current_user, "contracts": contracts})
+def payments_ui(request: Request, after: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    try:
+        page = svc.page_payments(db, settings.PAGE_SIZE, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return templates.TemplateResponse("payments.html", {"request": request, "payments": page.items, "next_cursor": page.next_cursor, "after": after, "current_user": current_user, **_contract_picker(db)})
 
 @router.get("/ui/new")
 def payment_new_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    contracts = db.query(Contract).order_by(Contract.id.desc()).all()
-    return templates.TemplateResponse("payment_form.html", {"request": request, "contracts": contracts, "action": "create", "current_user": current_user})
+    return templates.TemplateResponse("payment_form.html", {"request": request, "action": "create", "current_user": current_user, **_contract_picker(db)})
 
 @router.get("/ui/{payment_id}")
 def payment_detail_ui(payment_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
@@ -34,9 +50,46 @@ def payment_detail_ui(payment_id: int, request: Request, db: Session = Depends(g
     return templates.TemplateResponse("payment_detail.html", {"request": request, "payment": payment, "current_user": current_user})
 
 # API endpoints
+@router.get("/export")
+def export_payments(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    contract_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    return StreamingResponse(
+        exports_svc.export_payments(db, format, start, end, contract_id),
+        media_type=exports_svc.FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=payments.{format}"},
+    )
+
 @router.get("/", response_model=List[PaymentRead])
-def list_payments(db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    return svc.list_payments(db)
+def list_payments(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    validator = table_validator(db, Payment)
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
+    fast = settings.FAST_JSON_LISTS
+    try:
+        page = svc.page_payment_rows(db, limit, after) if fast else svc.page_payments(db, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fast:
+        # pre-encoded rows; response_model still documents the shape
+        response = RowsJSONResponse(page.items)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    set_validator(response, validator)
+    return response if fast else page.items
 
 @router.post("/", response_model=PaymentRead, status_code=status.HTTP_201_CREATED)
 def create_payment(payload: PaymentCreate, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
@@ -48,11 +101,29 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db), curren
             raise HTTPException(status_code=404, detail=msg)
         raise HTTPException(status_code=400, detail=msg)
 
+@router.post("/batch", response_model=BatchReport)
+def batch_payments(payload: BatchRequest, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    # one transaction for all ops (app.services.batch); an atomic batch that was rolled back answers 400
+    try:
+        report = batch_svc.apply_batch(db, "payments", payload.ops, payload.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not report.committed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return report
+
 @router.get("/{payment_id}", response_model=PaymentRead)
-def get_payment(payment_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+def get_payment(payment_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    validator = row_validator(db, Payment, payment_id)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
     payment = svc.get_payment(db, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
+    set_validator(response, validator)
     return payment
 
 @router.delete("/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
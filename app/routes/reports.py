@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+
+from app.core.templates import templates
+from app.db.replicas import get_read_db
+from app.models.user import User
+from app.routes.auth import require_user_ui
+from app.schemas import ArrearsReport, OccupancyReport, RevenueRow
+from app.services.invoices import parse_period
+import app.services.reports as svc
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+# UI endpoints
+@router.get("/ui")
+def reports_ui(request: Request, as_of: Optional[date] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    # the page lists only contracts with something owing; the summary covers all
+    report = svc.arrears(db, as_of)
+    report["rows"] = [r for r in report["rows"] if r["balance"] > 0]
+    return templates.TemplateResponse("reports.html", {"request": request, "report": report, "current_user": current_user})
+
+# API endpoints
+@router.get("/arrears", response_model=ArrearsReport)
+def arrears(
+    as_of: Optional[date] = None,
+    overdue_only: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    return svc.arrears(db, as_of, overdue_only)
+
+@router.get("/revenue", response_model=List[RevenueRow])
+def revenue(
+    start: date,
+    end: date,
+    group_by: str = "month",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    try:
+        return svc.revenue(db, start, end, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/occupancy", response_model=OccupancyReport)
+def occupancy(month: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    try:
+        first = parse_period(month) if month else date.today().replace(day=1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return svc.occupancy(db, first)
@@ -1,25 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Form
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Form, Query, UploadFile, File
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Optional
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.http_cache import not_modified, row_validator, set_validator, table_validator
+from app.core.serialization import RowsJSONResponse
+from app.core.templates import templates
+from app.db.replicas import get_read_db
+from app.db.session import get_db, get_async_db, AnySession
 from app.models import Room
-from app.schemas import RoomCreate, RoomRead, RoomUpdate
+from app.schemas import RoomCreate, RoomRead, RoomUpdate, RoomSearchResult, ImportReport
+from app.schemas.batch import BatchReport, BatchRequest
 import app.services.rooms as svc
+import app.services.availability as availability_svc
+import app.services.imports as imports_svc
+import app.services.batch as batch_svc
 from app.routes.auth import require_user_ui, get_current_user
 from app.schemas.user import UserRead
 from app.models.user import User
     
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 
 # UI endpoints (register before param routes)
 @router.get("/ui")
-def rooms_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    rooms = svc.list_rooms(db)
-    return templates.TemplateResponse("rooms.html", {"request": request, "rooms": rooms, "current_user": current_user})
+def rooms_ui(request: Request, after: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    try:
+        page = svc.page_rooms(db, settings.PAGE_SIZE, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return templates.TemplateResponse("rooms.html", {"request": request, "rooms": page.items, "next_cursor": page.next_cursor, "after": after, "current_user": current_user})
+
+@router.get("/ui/calendar")
+def rooms_calendar_ui(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    # defaults to the coming year
+    start = start or date.today()
+    end = end or start + timedelta(days=364)
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must be on or after start")
+    rows = availability_svc.calendar(db, start, end)
+    ticks = availability_svc.month_ticks(start, end)
+    return templates.TemplateResponse("room_calendar.html", {"request": request, "rows": rows, "ticks": ticks, "start": start, "end": end, "current_user": current_user})
 
 @router.get("/ui/new")
 def room_new_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
@@ -29,7 +58,7 @@ def room_new_ui(request: Request, db: Session = Depends(get_db), current_user: U
 
 # handle HTML form POST for creating a room
 @router.post("/ui/new")
-async def room_create_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+async def room_create_ui(request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
     form = await request.form()
     # basic parsing / normalization
     data = {k: v for k, v in form.items()}
@@ -70,7 +99,7 @@ async def room_create_ui(request: Request, db: Session = Depends(get_db), curren
     except Exception as e:
         return templates.TemplateResponse("room_form.html", {"request": request, "action": "create", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
-    room = svc.create_room(db, payload)
+    room = await svc.create_room_async(db, payload)
     return RedirectResponse(f"/rooms/ui/{room.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 @router.get("/ui/{room_id}")
@@ -89,8 +118,8 @@ def room_edit_ui(room_id: int, request: Request, db: Session = Depends(get_db),
 
 # handle HTML form POST for editing a room
 @router.post("/ui/{room_id}/edit")
-async def room_edit_post(room_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    room = svc.get_room(db, room_id)
+async def room_edit_post(room_id: int, request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
+    room = await svc.get_room_async(db, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
 
@@ -128,26 +157,120 @@ async def room_edit_post(room_id: int, request: Request, db: Session = Depends(g
     # build partial update dict (exclude empty strings)
     changes = {k: v for k, v in data.items() if v not in (None, "")}
     try:
-        updated = svc.update_room(db, room, **changes)
+        updated = await svc.update_room_async(db, room, **changes)
     except Exception as e:
         return templates.TemplateResponse("room_form.html", {"request": request, "room": room, "action": "edit", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
     return RedirectResponse(f"/rooms/ui/{updated.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 # API endpoints
+@router.post("/import", response_model=ImportReport)
+def import_rooms(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_user_ui),
+):
+    # CSV or JSONL, streamed from the spooled upload and inserted in batches
+    try:
+        fmt = imports_svc.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return imports_svc.import_rooms(db, file.file, fmt)
+
+@router.get("/available", response_model=List[RoomRead])
+def available_rooms(
+    start: date,
+    end: date,
+    capacity: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must be on or after start")
+    return availability_svc.available_rooms(db, start, end, capacity)
+
+@router.get("/search", response_model=RoomSearchResult)
+def search_rooms(
+    price_min: Optional[Decimal] = Query(None, ge=0),
+    price_max: Optional[Decimal] = Query(None, ge=0),
+    floor: Optional[str] = None,
+    capacity: Optional[int] = Query(None, ge=1),
+    has_ac: Optional[bool] = None,
+    private_bath: Optional[bool] = None,
+    accessible: Optional[bool] = None,
+    available: Optional[bool] = None,
+    tags: List[str] = Query([]),
+    amenities: List[str] = Query([]),
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    # tags / amenities are repeatable (?tags=quiet&tags=garden) and must all match
+    try:
+        return svc.search_rooms(
+            db, limit, after,
+            price_min=price_min, price_max=price_max, floor=floor, capacity=capacity,
+            has_ac=has_ac, private_bath=private_bath, accessible=accessible, available=available,
+            tags=tags, amenities=amenities,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=List[RoomRead])
-def list_rooms(db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    return svc.list_rooms(db)
+def list_rooms(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    validator = table_validator(db, Room)
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
+    fast = settings.FAST_JSON_LISTS
+    try:
+        page = svc.page_room_rows(db, limit, after) if fast else svc.page_rooms(db, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fast:
+        # pre-encoded rows; response_model still documents the shape
+        response = RowsJSONResponse(page.items)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    set_validator(response, validator)
+    return response if fast else page.items
 
 @router.post("/", response_model=RoomRead, status_code=status.HTTP_201_CREATED)
 def create_room(payload: RoomCreate, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
     return svc.create_room(db, payload)
 
+@router.post("/batch", response_model=BatchReport)
+def batch_rooms(payload: BatchRequest, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    # one transaction for all ops (app.services.batch); an atomic batch that was rolled back answers 400
+    try:
+        report = batch_svc.apply_batch(db, "rooms", payload.ops, payload.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not report.committed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return report
+
 @router.get("/{room_id}", response_model=RoomRead)
-def get_room(room_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+def get_room(room_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    validator = row_validator(db, Room, room_id)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Room not found")
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
     room = svc.get_room(db, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
+    set_validator(response, validator)
     return room
 
 @router.put("/{room_id}", response_model=RoomRead)
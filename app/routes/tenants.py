@@ -1,23 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Form
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Form, Query, UploadFile, File
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.http_cache import not_modified, row_validator, set_validator, table_validator
+from app.core.serialization import RowsJSONResponse
+from app.core.templates import templates
+from app.db.replicas import get_read_db
+from app.db.session import get_db, get_async_db, AnySession
 from app.models import Tenant
 from app.models.user import User
 from app.schemas.tenant import TenantCreate, TenantUpdate, TenantRead
+from app.schemas.imports import ImportReport
+from app.schemas.batch import BatchReport, BatchRequest
 import app.services.tenants as svc
+import app.services.imports as imports_svc
+import app.services.batch as batch_svc
 from app.routes.auth import require_user_ui
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 
 @router.get("/ui")
-def tenants_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    tenants = svc.list_tenants(db)
-    return templates.TemplateResponse("tenants.html", {"request": request, "tenants": tenants, "current_user": current_user})
+def tenants_ui(request: Request, after: Optional[str] = None, q: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(require_user_ui)):
+    if q and q.strip():
+        tenants = svc.search_tenants(db, q, settings.PAGE_SIZE)
+        return templates.TemplateResponse("tenants.html", {"request": request, "tenants": tenants, "q": q, "current_user": current_user})
+    try:
+        page = svc.page_tenants(db, settings.PAGE_SIZE, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return templates.TemplateResponse("tenants.html", {"request": request, "tenants": page.items, "next_cursor": page.next_cursor, "after": after, "current_user": current_user})
 
 @router.get("/ui/new")
 def tenant_new_ui(request: Request, current_user: User = Depends(require_user_ui)):
@@ -27,7 +40,7 @@ def tenant_new_ui(request: Request, current_user: User = Depends(require_user_ui
 
 # server-side create
 @router.post("/ui/new")
-async def tenant_create_ui(request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+async def tenant_create_ui(request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
     form = await request.form()
     data = dict(form)
 
@@ -48,7 +61,7 @@ async def tenant_create_ui(request: Request, db: Session = Depends(get_db), curr
     except Exception as e:
         return templates.TemplateResponse("tenant_form.html", {"request": request, "action": "create", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
-    tenant = svc.create_tenant(db, payload)
+    tenant = await svc.create_tenant_async(db, payload)
     return RedirectResponse(f"/tenants/ui/{tenant.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 @router.get("/ui/{tenant_id}")
@@ -69,8 +82,8 @@ def tenant_edit_ui(tenant_id: int, request: Request, db: Session = Depends(get_d
     return templates.TemplateResponse("tenant_form.html", {"request": request, "tenant": tenant, "tenant_data": tenant_data, "action": "edit", "current_user": current_user})
 
 @router.post("/ui/{tenant_id}/edit")
-async def tenant_edit_post(tenant_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    tenant = svc.get_tenant(db, tenant_id)
+async def tenant_edit_post(tenant_id: int, request: Request, db: AnySession = Depends(get_async_db), current_user: User = Depends(require_user_ui)):
+    tenant = await svc.get_tenant_async(db, tenant_id)
     print("Tenant:", tenant)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
@@ -90,26 +103,89 @@ async def tenant_edit_post(tenant_id: int, request: Request, db: Session = Depen
     # build changes dict excluding empty strings
     changes = {k: v for k, v in data.items() if v not in (None, "")}
     try:
-        updated = svc.update_tenant(db, tenant, **changes)
+        updated = await svc.update_tenant_async(db, tenant, **changes)
     except Exception as e:
         return templates.TemplateResponse("tenant_form.html", {"request": request, "tenant": tenant, "action": "edit", "error": str(e), "form": data, "current_user": current_user}, status_code=400)
 
     return RedirectResponse(f"/tenants/ui/{updated.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 # API endpoints
+@router.post("/import", response_model=ImportReport)
+def import_tenants(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_user_ui),
+):
+    # CSV or JSONL, streamed from the spooled upload and inserted in batches
+    try:
+        fmt = imports_svc.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return imports_svc.import_tenants(db, file.file, fmt)
+
+@router.get("/search", response_model=List[TenantRead])
+def search_tenants(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    return svc.search_tenants(db, q, limit)
+
 @router.get("/", response_model=List[TenantRead])
-def list_tenants(db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
-    return svc.list_tenants(db)
+def list_tenants(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_user_ui),
+):
+    validator = table_validator(db, Tenant)
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
+    fast = settings.FAST_JSON_LISTS
+    try:
+        page = svc.page_tenant_rows(db, limit, after) if fast else svc.page_tenants(db, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fast:
+        # pre-encoded rows; response_model still documents the shape
+        response = RowsJSONResponse(page.items)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    set_validator(response, validator)
+    return response if fast else page.items
 
 @router.post("/", response_model=TenantRead, status_code=status.HTTP_201_CREATED)
 def create_tenant(payload: TenantCreate, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
     return svc.create_tenant(db, payload)
 
+@router.post("/batch", response_model=BatchReport)
+def batch_tenants(payload: BatchRequest, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    # one transaction for all ops (app.services.batch); an atomic batch that was rolled back answers 400
+    try:
+        report = batch_svc.apply_batch(db, "tenants", payload.ops, payload.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not report.committed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return report
+
 @router.get("/{tenant_id}", response_model=TenantRead)
-def get_tenant(tenant_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+def get_tenant(tenant_id: int, request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(require_user_ui)):
+    validator = row_validator(db, Tenant, tenant_id)
+    if not validator:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    cached = not_modified(request, validator)
+    if cached:
+        return cached
     tenant = svc.get_tenant(db, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
+    set_validator(response, validator)
     return tenant
 
 @router.put("/{tenant_id}", response_model=TenantRead)
@@ -1,11 +1,19 @@
 from .tenant import TenantCreate, TenantRead, TenantUpdate
-from .room import RoomCreate, RoomRead, RoomUpdate
+from .room import RoomCreate, RoomRead, RoomUpdate, RoomSearchResult
 from .contract import ContractCreate, ContractRead, ContractUpdate
 from .payment import PaymentCreate, PaymentRead
+from .invoice import InvoiceRead, InvoiceRun
+from .imports import ImportReport, RowError
+from .batch import BatchItemResult, BatchOp, BatchReport, BatchRequest
+from .reports import AgingBucket, ArrearsReport, ArrearsRow, FloorOccupancy, OccupancyReport, RevenueRow
 
 __all__ = [
     "TenantCreate", "TenantRead", "TenantUpdate",
-    "RoomCreate", "RoomRead", "RoomUpdate",
+    "RoomCreate", "RoomRead", "RoomUpdate", "RoomSearchResult",
     "ContractCreate", "ContractRead", "ContractUpdate",
     "PaymentCreate", "PaymentRead",
+    "InvoiceRead", "InvoiceRun",
+    "ImportReport", "RowError",
+    "BatchItemResult", "BatchOp", "BatchReport", "BatchRequest",
+    "AgingBucket", "ArrearsReport", "ArrearsRow",
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+
+class BatchOp(BaseModel):
+    op: Literal["create", "update", "delete"]
+    # target row of an update / delete
+    id: Optional[int] = None
+    # create: the entity's create schema; update: its update schema (unset fields are left alone)
+    data: Optional[Dict[str, Any]] = None
+
+class BatchRequest(BaseModel):
+    # atomic: all ops or none; best_effort: every valid op, failures reported per item
+    mode: Literal["atomic", "best_effort"] = "atomic"
+    ops: List[BatchOp]
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    ok: bool = False
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BatchReport(BaseModel):
+    mode: str
+    committed: bool
+    total: int
+    succeeded: int
+    failed: int
+    # a failure that can't be pinned on one op (e.g. a rejected multi-row insert in atomic mode)
+    error: Optional[str] = None
+    results: List[BatchItemResult]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator, model_validator
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
 class ContractBase(BaseModel):
@@ -55,6 +55,9 @@ class ContractUpdate(BaseModel):
 class ContractRead(ContractBase):
     id: int
     active: bool
+    total_paid: Decimal = Decimal("0")
+    payment_count: int = 0
+    last_paid_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
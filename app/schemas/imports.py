@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class RowError(BaseModel):
+    row: int
+    error: str
+
+class ImportReport(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    errors: List[RowError] = []
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+class InvoiceRead(BaseModel):
+    id: int
+    contract_id: int
+    period: date
+    due_date: date
+    amount: Decimal
+    amount_paid: Decimal
+    status: str
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class InvoiceRun(BaseModel):
+    period: date
+    created: int
+    invoices: int
+    total_amount: Decimal
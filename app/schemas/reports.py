@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+from decimal import Decimal
+
+class ArrearsRow(BaseModel):
+    contract_id: int
+    tenant_id: int
+    tenant_name: str
+    room_id: int
+    room_number: str
+    start_date: date
+    end_date: Optional[date] = None
+    rent_amount: Decimal
+    periods_due: int
+    expected: Decimal
+    paid: Decimal
+    balance: Decimal
+    days_overdue: int
+    bucket: str
+
+class AgingBucket(BaseModel):
+    count: int = 0
+    balance: Decimal = Decimal("0")
+
+class ArrearsReport(BaseModel):
+    as_of: date
+    contracts: int
+    expected: Decimal
+    paid: Decimal
+    # sum of positive balances only; credit on one contract does not offset another
+    outstanding: Decimal
+    buckets: Dict[str, AgingBucket]
+    rows: List[ArrearsRow]
+
+class RevenueRow(BaseModel):
+    # "YYYY-MM", payment method (None when unrecorded) or room number
+    key: Optional[str] = None
+    total: Decimal
+    count: int
+
+class FloorOccupancy(BaseModel):
+    floor: Optional[str] = None
+    rooms: int
+    occupied_days: int
+    vacancy_days: int
+    rate: float
+
+class OccupancyReport(BaseModel):
+    month: date
+    rooms: int
+    occupied_days: int
+    vacancy_days: int
+    rate: float
+    floors: List[FloorOccupancy]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime
 from decimal import Decimal
 
@@ -61,4 +61,11 @@ class RoomRead(RoomBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RoomSearchResult(BaseModel):
+    items: List[RoomRead]
+    total: int
+    # dimension -> value -> number of matching rooms
+    facets: Dict[str, Dict[str, int]]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,115 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.http_cache import table_validator
+from app.core.security import TTLCache
+from app.models import Contract, Room
+
+Interval = Tuple[date, date]
+
+def available_rooms(db: Session, start: date, end: date, capacity: Optional[int] = None) -> List[Room]:
+    """Active, available rooms with no active contract overlapping [start, end].
+
+    One anti-join: per room, the latest active contract starting on or before
+    `end` is found with a single seek on ix_contracts_room_active_dates (the
+    same non-overlap invariant as services.contracts._find_overlap), and the
+    room is excluded if that contract reaches into the range.
+    """
+    latest = aliased(Contract)
+    latest_id = (
+        select(latest.id)
+        .where(latest.room_id == Room.id, latest.active == True, latest.start_date <= end)
+        .order_by(latest.start_date.desc())
+        .limit(1)
+        .correlate(Room)
+        .scalar_subquery()
+    )
+    blocking = select(Contract.id).where(
+        Contract.id == latest_id,
+        or_(Contract.end_date.is_(None), Contract.end_date >= start),
+    )
+    q = db.query(Room).filter(Room.active == True, Room.available == True, ~blocking.exists())
+    if capacity is not None:
+        q = q.filter(Room.capacity >= capacity)
+    return q.order_by(Room.number, Room.id).all()
+
+class IntervalIndex:
+    """Booked date intervals per room, sorted by start, for repeated lookups.
+
+    Relies on active contracts of a room never overlapping, so the ends are
+    sorted too and `is_free` is one bisect per room. Bounds are inclusive and
+    an open-ended contract runs to date.max, as in `_overlaps`.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, date, Optional[date]]]):
+        self._starts: Dict[int, List[date]] = defaultdict(list)
+        self._ends: Dict[int, List[date]] = defaultdict(list)
+        for room_id, start, end in sorted(rows, key=lambda r: (r[0], r[1])):
+            self._starts[room_id].append(start)
+            self._ends[room_id].append(end or date.max)
+
+    def is_free(self, room_id: int, start: date, end: date) -> bool:
+        starts = self._starts.get(room_id)
+        if not starts:
+            return True
+        i = bisect_right(starts, end) - 1
+        return i < 0 or self._ends[room_id][i] < start
+
+    def intervals(self, room_id: int) -> List[Interval]:
+        return list(zip(self._starts.get(room_id, ()), self._ends.get(room_id, ())))
+
+# (window, contracts table version) -> IntervalIndex. Keying on the table
+# version means any contract change in any worker misses the cache, at the
+# price of one aggregate query per lookup.
+_index_cache = TTLCache(maxsize=32, ttl=300)
+
+def interval_index(db: Session, start: date, end: date) -> IntervalIndex:
+    """IntervalIndex of active contracts overlapping [start, end], cached."""
+    key = (start, end, table_validator(db, Contract).etag)
+    index = _index_cache.get(key)
+    if index is None:
+        rows = db.execute(
+            select(Contract.room_id, Contract.start_date, Contract.end_date).where(
+                Contract.active == True,
+                Contract.start_date <= end,
+                or_(Contract.end_date.is_(None), Contract.end_date >= start),
+            )
+        ).all()
+        index = IntervalIndex(rows)
+        _index_cache.set(key, index)
+    return index
+
+def calendar(db: Session, start: date, end: date) -> List[dict]:
+    """One row per active room with its booked bars positioned within the window."""
+    index = interval_index(db, start, end)
+    days = (end - start).days + 1
+    rows = []
+    rooms = db.query(Room.id, Room.number, Room.capacity, Room.available).filter(Room.active == True).order_by(Room.number, Room.id)
+    for room in rooms:
+        bars = []
+        for s, e in index.intervals(room.id):
+            s, e = max(s, start), min(e, end)
+            bars.append({
+                "start": s,
+                "end": e,
+                "left": (s - start).days * 100 / days,
+                "width": ((e - s).days + 1) * 100 / days,
+            })
+        rows.append({"room": room, "bars": bars, "free": room.available and not bars})
+    return rows
+
+def month_ticks(start: date, end: date) -> List[dict]:
+    """Month boundaries within the window, positioned like the calendar bars."""
+    days = (end - start).days + 1
+    ticks = []
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        first = max(month, start)
+        ticks.append({"label": month.strftime("%b %Y"), "left": (first - start).days * 100 / days})
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return ticks
@@ -0,0 +1,190 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Contract, Payment, Room, Tenant
+from app.schemas.batch import BatchItemResult, BatchOp, BatchReport
+from app.schemas.contract import ContractCreate, ContractUpdate
+from app.schemas.payment import PaymentCreate
+from app.schemas.room import RoomCreate, RoomUpdate
+from app.schemas.tenant import TenantCreate, TenantUpdate
+from app.services.imports import validation_message
+import app.services.contracts as contracts_svc
+import app.services.payments as payments_svc
+import app.services.rooms as rooms_svc
+import app.services.tenants as tenants_svc
+
+MODES = ("atomic", "best_effort")
+
+class Entity(NamedTuple):
+    model: Any
+    create_schema: Type[BaseModel]
+    update_schema: Optional[Type[BaseModel]]  # None: the entity has no update
+    create: Callable
+    update: Optional[Callable]
+    delete: Callable
+    # one multi-row INSERT for all creates, where a create touches nothing but its own rows
+    create_many: Optional[Callable] = None
+
+ENTITIES: Dict[str, Entity] = {
+    "tenants": Entity(
+        Tenant, TenantCreate, TenantUpdate,
+        tenants_svc.create_tenant, tenants_svc.update_tenant, tenants_svc.delete_tenant, tenants_svc.create_tenants,
+    ),
+    "rooms": Entity(
+        Room, RoomCreate, RoomUpdate,
+        rooms_svc.create_room, rooms_svc.update_room, rooms_svc.delete_room, rooms_svc.create_rooms,
+    ),
+    # contracts and payments keep their per-row checks and running totals
+    "contracts": Entity(
+        Contract, ContractCreate, ContractUpdate,
+        contracts_svc.create_contract, contracts_svc.update_contract, contracts_svc.delete_contract,
+    ),
+    "payments": Entity(Payment, PaymentCreate, None, payments_svc.create_payment, None, payments_svc.delete_payment),
+}
+
+# (result, target row, changes); changes is None for a delete
+Write = Tuple[BatchItemResult, Any, Optional[dict]]
+Create = Tuple[BatchItemResult, BaseModel]
+
+def _message(e: Exception) -> str:
+    return str(getattr(e, "orig", None) or e) if isinstance(e, SQLAlchemyError) else str(e)
+
+def _prepare(db: Session, name: str, ops: Sequence[BatchOp], results: List[BatchItemResult]) -> Tuple[List[Write], List[Create]]:
+    """Validate every op and load all rows they target in one query; failures go into `results`."""
+    entity = ENTITIES[name]
+    ids = {op.id for op in ops if op.op != "create" and op.id is not None}
+    rows = {row.id: row for row in db.query(entity.model).filter(entity.model.id.in_(ids))} if ids else {}
+    writes: List[Write] = []
+    creates: List[Create] = []
+    for result, op in zip(results, ops):
+        try:
+            if op.op == "create":
+                creates.append((result, entity.create_schema.model_validate(op.data or {})))
+                continue
+            if op.op == "update" and entity.update is None:
+                raise ValueError(f"{name} cannot be updated")
+            if op.id is None:
+                raise ValueError(f"id is required to {op.op}")
+            row = rows.get(op.id)
+            if row is None:
+                raise ValueError(f"{entity.model.__name__} {op.id} not found")
+            result.id = op.id
+            changes = entity.update_schema.model_validate(op.data or {}).model_dump(exclude_unset=True) if op.op == "update" else None
+            writes.append((result, row, changes))
+        except ValidationError as e:
+            result.error = validation_message(e)
+        except ValueError as e:
+            result.error = str(e)
+    return writes, creates
+
+def _write(db: Session, entity: Entity, row, changes: Optional[dict]) -> None:
+    if changes is None:
+        entity.delete(db, row, commit=False)
+    else:
+        entity.update(db, row, commit=False, **changes)
+
+def _apply_atomic(db: Session, entity: Entity, writes: List[Write], creates: List[Create]) -> Optional[str]:
+    """Everything in one transaction; returns the error of a failure not tied to one op."""
+    current: Optional[BatchItemResult] = None
+    try:
+        for result, row, changes in writes:
+            current = result
+            _write(db, entity, row, changes)
+        if entity.create_many:
+            current = None
+            ids = entity.create_many(db, [payload for _, payload in creates], commit=False)
+        else:
+            ids = []
+            for result, payload in creates:
+                current = result
+                ids.append(entity.create(db, payload, commit=False).id)
+        current = None
+        db.commit()
+    except (ValueError, SQLAlchemyError) as e:
+        db.rollback()
+        if current is None:
+            return _message(e)
+        current.error = _message(e)
+        return None
+    for (result, _), new_id in zip(creates, ids):
+        result.id = new_id
+    for result in [w[0] for w in writes] + [c[0] for c in creates]:
+        result.ok = True
+    return None
+
+def _savepoint(db: Session, result: BatchItemResult, fn: Callable[[], Any]) -> Any:
+    # one op in a SAVEPOINT: a failure undoes only that op
+    try:
+        with db.begin_nested():
+            value = fn()
+            db.flush()
+    except (ValueError, SQLAlchemyError) as e:
+        result.error = _message(e)
+        return None
+    result.ok = True
+    return value
+
+def _apply_best_effort(db: Session, entity: Entity, writes: List[Write], creates: List[Create]) -> Optional[str]:
+    for result, row, changes in writes:
+        _savepoint(db, result, lambda: _write(db, entity, row, changes))
+    one_by_one = creates
+    if entity.create_many and creates:
+        try:
+            with db.begin_nested():
+                ids = entity.create_many(db, [payload for _, payload in creates], commit=False)
+            for (result, _), new_id in zip(creates, ids):
+                result.ok, result.id = True, new_id
+            one_by_one = []
+        except SQLAlchemyError:
+            pass  # the insert was rejected as a whole; retry row by row to pin down the culprits
+    for result, payload in one_by_one:
+        if entity.create_many:
+            ids = _savepoint(db, result, lambda: entity.create_many(db, [payload], commit=False))
+            result.id = ids[0] if ids else None
+        else:
+            created = _savepoint(db, result, lambda: entity.create(db, payload, commit=False))
+            result.id = created.id if created is not None else None
+    try:
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        for result, *_ in writes + creates:
+            result.ok = False  # nothing was kept
+        return _message(e)
+    return None
+
+def apply_batch(db: Session, name: str, ops: Sequence[BatchOp], mode: str = "atomic") -> BatchReport:
+    """Apply create / update / delete ops on one entity in a single transaction.
+
+    Every op is validated and its target row loaded (one query for all of
+    them) before anything is written. Updates and deletes then run in request
+    order, followed by the creates; tenants and rooms are created with one
+    multi-row INSERT. In atomic mode any failure rolls the whole batch back
+    and nothing is written if an op fails validation; in best_effort mode each
+    op runs in its own savepoint and the ops that succeed are committed.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown batch mode {mode!r}; use one of {', '.join(MODES)}")
+    if len(ops) > settings.BATCH_MAX_OPS:
+        raise ValueError(f"At most {settings.BATCH_MAX_OPS} ops per batch, got {len(ops)}")
+    entity = ENTITIES[name]
+    results = [BatchItemResult(index=i, op=op.op) for i, op in enumerate(ops)]
+    writes, creates = _prepare(db, name, ops, results)
+    if mode == "atomic" and any(r.error for r in results):
+        db.rollback()
+        error, committed = None, False
+    elif mode == "atomic":
+        error = _apply_atomic(db, entity, writes, creates)
+        committed = all(r.ok for r in results)
+    else:
+        error = _apply_best_effort(db, entity, writes, creates)
+        committed = error is None
+    succeeded = sum(r.ok for r in results)
+    return BatchReport(
+        mode=mode, committed=committed, total=len(results), succeeded=succeeded,
+        failed=sum(1 for r in results if r.error), error=error, results=results,
+    )
@@ -1,9 +1,14 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 
+from app.core.pagination import Page, paginate
+from app.core.serialization import schema_columns
+from app.db.session import AnySession, run_db
 from app.models import Contract, Tenant, Room
-from app.schemas.contract import ContractCreate
+from app.schemas.contract import ContractCreate, ContractRead
+from app.services.rollups import move_contract_payments, refresh_room_occupancy
 
 def _overlaps(a_start: date, a_end: date | None, b_start: date, b_end: date | None) -> bool:
     # Treat None end as open-ended (infinite)
@@ -11,13 +16,76 @@ def _overlaps(a_start: date, a_end: date | None, b_start: date, b_end: date | No
     b_end_eff = b_end or date.max
     return not (a_end_eff < b_start or b_end_eff < a_start)
 
-def list_contracts(db: Session) -> List[Contract]:
-    return db.query(Contract).order_by(Contract.id.desc()).all()
+def _as_date(value) -> date | None:
+    # UI form posts hand dates through as ISO strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
 
-def get_contract(db: Session, contract_id: int) -> Contract | None:
-    return db.get(Contract, contract_id)
+def _find_overlap(db: Session, room_id: int, start: date, end: date | None, exclude_id: int | None = None) -> int | None:
+    """Id of an active contract on `room_id` overlapping [start, end], or None.
 
-def create_contract(db: Session, payload: ContractCreate) -> Contract:
+    Active contracts on a room never overlap each other, so sorted by start
+    their ends are sorted too: only the latest one starting on or before `end`
+    can reach into [start, end]. That is a single descending seek on
+    ix_contracts_room_active_dates, independent of the room's history length.
+    Same inclusive semantics as `_overlaps`.
+    """
+    q = db.query(Contract.id, Contract.end_date).filter(Contract.room_id == room_id, Contract.active == True)
+    if end is not None:
+        q = q.filter(Contract.start_date <= end)
+    if exclude_id is not None:
+        q = q.filter(Contract.id != exclude_id)
+    latest = q.order_by(Contract.start_date.desc()).limit(1).first()
+    if latest is None or (latest.end_date is not None and latest.end_date < start):
+        return None
+    return latest.id
+
+def _flush_checked(db: Session, commit: bool = True) -> None:
+    # the Postgres exclusion constraint catches writes that raced past _find_overlap;
+    # flush so the violation surfaces here, before anything else runs in the
+    # transaction, and roll back unless the caller owns the transaction
+    try:
+        db.flush()
+    except IntegrityError as e:
+        if commit:
+            db.rollback()
+        if "contracts_no_overlap" in str(e.orig):
+            raise ValueError("Contract overlaps with an existing active contract")
+        raise
+
+# Loader profiles: eager-load exactly the related columns a page renders so a
+# list of N contracts costs a fixed number of queries instead of 1 + N lazy loads.
+LOADER_PROFILES = {
+    # contracts.html rows / contract_detail.html: tenant name and room number,
+    # plus their updated_at for the rows' fragment-cache key
+    "table": (
+        joinedload(Contract.tenant).load_only(Tenant.name, Tenant.updated_at),
+        joinedload(Contract.room).load_only(Room.number, Room.updated_at),
+    ),
+    # contract dropdowns on the payment pages: tenant name only
+    "picker": (
+        joinedload(Contract.tenant).load_only(Tenant.name),
+    ),
+}
+
+def _options(profile: Optional[str]) -> tuple:
+    return LOADER_PROFILES[profile] if profile else ()
+
+def list_contracts(db: Session, profile: Optional[str] = None) -> List[Contract]:
+    return db.query(Contract).options(*_options(profile)).order_by(Contract.id.desc()).all()
+
+def page_contracts(db: Session, limit: int, after: Optional[str] = None, profile: Optional[str] = None) -> Page:
+    return paginate(db.query(Contract).options(*_options(profile)), (Contract.id,), limit, after)
+
+def page_contract_rows(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    """page_contracts as plain rows of ContractRead's columns, for RowsJSONResponse."""
+    return paginate(db.query(*schema_columns(ContractRead, Contract)), (Contract.id,), limit, after)
+
+def get_contract(db: Session, contract_id: int, profile: Optional[str] = None) -> Contract | None:
+    return db.get(Contract, contract_id, options=_options(profile))
+
+# commit=False: run inside the caller's transaction, as in app.services.tenants
+
+def create_contract(db: Session, payload: ContractCreate, commit: bool = True) -> Contract:
     # verify tenant & room exist
     tenant = db.get(Tenant, payload.tenant_id)
     if not tenant:
@@ -27,24 +95,66 @@ def create_contract(db: Session, payload: ContractCreate) -> Contract:
         raise ValueError("Room not found")
 
     # check overlapping active contracts on the same room
-    existing = db.query(Contract).filter(Contract.room_id == payload.room_id, Contract.active == True).all()
-    for c in existing:
-        if _overlaps(payload.start_date, payload.end_date, c.start_date, c.end_date):
-            raise ValueError(f"Contract overlaps with existing active contract id={c.id}")
+    overlap_id = _find_overlap(db, payload.room_id, payload.start_date, payload.end_date)
+    if overlap_id is not None:
+        raise ValueError(f"Contract overlaps with existing active contract id={overlap_id}")
 
     contract = Contract(**payload.dict())
     db.add(contract)
-    db.commit()
-    db.refresh(contract)
+    _flush_checked(db, commit)
+    refresh_room_occupancy(db, [contract.room_id])
+    if commit:
+        db.commit()
+        db.refresh(contract)
     return contract
 
-def update_contract(db: Session, contract: Contract, **changes) -> Contract:
+def update_contract(db: Session, contract: Contract, commit: bool = True, **changes) -> Contract:
+    if "room_id" in changes:
+        changes["room_id"] = int(changes["room_id"])  # UI form posts it as a string
+    # re-check overlap against the contract as it will look after the update
+    if changes.keys() & {"room_id", "start_date", "end_date", "active"}:
+        active = changes.get("active", contract.active)
+        if active:
+            start = _as_date(changes.get("start_date", contract.start_date))
+            end = _as_date(changes.get("end_date", contract.end_date))
+            room_id = changes.get("room_id", contract.room_id)
+            overlap_id = _find_overlap(db, room_id, start, end, exclude_id=contract.id)
+            if overlap_id is not None:
+                raise ValueError(f"Contract overlaps with existing active contract id={overlap_id}")
+    old_room_id = contract.room_id
     for k, v in changes.items():
         setattr(contract, k, v)
-    db.commit()
-    db.refresh(contract)
+    _flush_checked(db, commit)
+    move_contract_payments(db, contract.id, old_room_id, contract.room_id)
+    if changes.keys() & {"room_id", "start_date", "end_date", "active"}:
+        refresh_room_occupancy(db, [old_room_id, contract.room_id])
+    if commit:
+        db.commit()
+        db.refresh(contract)
     return contract
 
-def delete_contract(db: Session, contract: Contract) -> None:
+def delete_contract(db: Session, contract: Contract, commit: bool = True) -> None:
     db.delete(contract)
-    db.commit()
\ No newline at end of file
+    _flush_checked(db, commit)
+    refresh_room_occupancy(db, [contract.room_id])
+    if commit:
+        db.commit()
+
+# async variants for async handlers (see app.db.session.run_db)
+async def list_contracts_async(db: AnySession, profile: Optional[str] = None) -> List[Contract]:
+    return await run_db(db, list_contracts, profile=profile)
+
+async def page_contracts_async(db: AnySession, limit: int, after: Optional[str] = None, profile: Optional[str] = None) -> Page:
+    return await run_db(db, page_contracts, limit, after, profile=profile)
+
+async def get_contract_async(db: AnySession, contract_id: int, profile: Optional[str] = None) -> Optional[Contract]:
+    return await run_db(db, get_contract, contract_id, profile=profile)
+
+async def create_contract_async(db: AnySession, payload: ContractCreate) -> Contract:
+    return await run_db(db, create_contract, payload)
+
+async def update_contract_async(db: AnySession, contract: Contract, **changes) -> Contract:
+    return await run_db(db, update_contract, contract, **changes)
+
+async def delete_contract_async(db: AnySession, contract: Contract) -> None:
+    await run_db(db, delete_contract, contract)
@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, Optional, Sequence
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models import Contract, Payment
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# rows fetched per round trip from the server-side cursor, and per emitted chunk
+CHUNK_SIZE = 1000
+
+PAYMENT_COLUMNS = (Payment.id, Payment.contract_id, Payment.amount, Payment.paid_at, Payment.method, Payment.note)
+CONTRACT_COLUMNS = (
+    Contract.id, Contract.tenant_id, Contract.room_id, Contract.start_date, Contract.end_date,
+    Contract.rent_amount, Contract.active, Contract.total_paid, Contract.payment_count, Contract.last_paid_at,
+)
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _stream(bind_from: Session, stmt: Select, columns: Sequence, fmt: str) -> Iterator[str]:
+    """Encode a query as CSV / NDJSON chunks straight off a server-side cursor.
+
+    The generator opens its own session on the request session's engine so it
+    stays valid for as long as the response is being streamed, independent of
+    when the request dependency is torn down; memory is bounded by CHUNK_SIZE rows.
+    """
+    names = [c.key for c in columns]
+    db = Session(bind=bind_from.get_bind())
+    try:
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(names)
+            yield buf.getvalue()
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=CHUNK_SIZE))
+        for rows in result.partitions():
+            if fmt == "csv":
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                writer.writerows(rows)
+                yield buf.getvalue()
+            else:
+                yield "".join(json.dumps(dict(zip(names, row)), default=_json_default) + "\n" for row in rows)
+    finally:
+        db.close()
+
+def export_payments(db: Session, fmt: str, start: Optional[date] = None, end: Optional[date] = None, contract_id: Optional[int] = None) -> Iterator[str]:
+    stmt = select(*PAYMENT_COLUMNS).order_by(Payment.paid_at, Payment.id)
+    if start:
+        stmt = stmt.where(Payment.paid_at >= datetime.combine(start, datetime.min.time()))
+    if end:
+        stmt = stmt.where(Payment.paid_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    if contract_id is not None:
+        stmt = stmt.where(Payment.contract_id == contract_id)
+    return _stream(db, stmt, PAYMENT_COLUMNS, fmt)
+
+def export_contracts(
+    db: Session,
+    fmt: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    contract_id: Optional[int] = None,
+    room_id: Optional[int] = None,
+    tenant_id: Optional[int] = None,
+    active: Optional[bool] = None,
+) -> Iterator[str]:
+    # the date range selects contracts running at any point within [start, end]
+    stmt = select(*CONTRACT_COLUMNS).order_by(Contract.id)
+    if start:
+        stmt = stmt.where(or_(Contract.end_date.is_(None), Contract.end_date >= start))
+    if end:
+        stmt = stmt.where(Contract.start_date <= end)
+    if contract_id is not None:
+        stmt = stmt.where(Contract.id == contract_id)
+    if room_id is not None:
+        stmt = stmt.where(Contract.room_id == room_id)
+    if tenant_id is not None:
+        stmt = stmt.where(Contract.tenant_id == tenant_id)
+    if active is not None:
+        stmt = stmt.where(Contract.active == active)
+    return _stream(db, stmt, CONTRACT_COLUMNS, fmt)
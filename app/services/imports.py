@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Room, Tenant
+from app.schemas.imports import ImportReport, RowError
+from app.schemas.room import RoomCreate
+from app.schemas.tenant import TenantCreate
+import app.services.rooms as rooms_svc
+
+FORMATS = ("csv", "jsonl")
+
+# CSV cells that carry structured values
+_LIST_FIELDS = {"amenities", "tags", "images"}
+_JSON_FIELDS = {"metadata_json"}
+# the tenant metadata column is exposed as metadata_json on the schema
+_CSV_ALIASES = {"metadata": "metadata_json"}
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> str:
+    fmt = (explicit or (filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format {fmt!r}; use csv or jsonl")
+    return fmt
+
+def _csv_cell(field: str, value: str):
+    if field in _LIST_FIELDS:
+        return [s.strip() for s in value.split(",") if s.strip()]
+    if field in _JSON_FIELDS:
+        return json.loads(value)
+    return value
+
+def validation_message(e: ValidationError) -> str:
+    """The failed fields on one line, e.g. "name: Field required; email: value is not a valid email address"."""
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+
+def _csv_records(text: IO[str]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    for row_no, row in enumerate(csv.DictReader(text), start=1):
+        try:
+            # blank cells mean "not given" so schema defaults apply
+            record = {}
+            for k, v in row.items():
+                if k and v not in (None, ""):
+                    field = _CSV_ALIASES.get(k, k)
+                    record[field] = _csv_cell(field, v)
+        except ValueError as e:
+            yield row_no, None, str(e)
+            continue
+        yield row_no, record, None
+
+def _jsonl_records(text: IO[str]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    row_no = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_no, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row_no, None, "expected a JSON object"
+            continue
+        yield row_no, record, None
+
+def iter_records(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, record, parse error) one line at a time from a binary stream.
+
+    Bytes that are not UTF-8, or CSV the reader cannot parse, cannot be
+    skipped reliably: they end the stream with one error on the first row
+    that could not be read, and the rows read before it are still imported.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    row_no = 0
+    try:
+        for row_no, record, error in (_csv_records if fmt == "csv" else _jsonl_records)(text):
+            yield row_no, record, error
+    except UnicodeDecodeError as e:
+        yield row_no + 1, None, f"not valid UTF-8 text: {e}"
+    except csv.Error as e:
+        yield row_no + 1, None, f"malformed CSV: {e}"
+
+# called with [(new_id, values), ...] inside the insert's transaction
+OnInsert = Callable[[Session, List[Tuple[int, dict]]], None]
+
+def _insert(db: Session, model, values: List[dict], on_insert: Optional[OnInsert]) -> None:
+    if on_insert is None:
+        db.execute(insert(model), values)
+        return
+    ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), values).all()
+    on_insert(db, list(zip(ids, values)))
+
+def _insert_chunk(db: Session, model, rows: List[Tuple[int, dict]], errors: List[RowError], on_insert: Optional[OnInsert] = None) -> int:
+    try:
+        _insert(db, model, [values for _, values in rows], on_insert)
+        db.commit()
+        return len(rows)
+    except SQLAlchemyError:
+        db.rollback()
+    # the batch was rejected as a whole; retry row by row to pin down the culprits
+    inserted = 0
+    for row_no, values in rows:
+        try:
+            _insert(db, model, [values], on_insert)
+            db.commit()
+            inserted += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            errors.append(RowError(row=row_no, error=str(e.orig if hasattr(e, "orig") else e)))
+    return inserted
+
+def import_rows(
+    db: Session,
+    model,
+    schema: Type[BaseModel],
+    records: Iterable,
+    batch_size: Optional[int] = None,
+    on_insert: Optional[OnInsert] = None,
+) -> ImportReport:
+    """Validate and insert records in chunks, one transaction per chunk.
+
+    Invalid rows are reported and skipped; valid rows in the same chunk are
+    still inserted with a single multi-row INSERT.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    records = iter(records)
+    total = inserted = 0
+    errors: List[RowError] = []
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        total += len(chunk)
+        valid = []
+        for row_no, record, parse_error in chunk:
+            if parse_error:
+                errors.append(RowError(row=row_no, error=parse_error))
+                continue
+            try:
+                valid.append((row_no, schema.model_validate(record).model_dump()))
+            except ValidationError as e:
+                errors.append(RowError(row=row_no, error=validation_message(e)))
+        if valid:
+            inserted += _insert_chunk(db, model, valid, errors, on_insert)
+    return ImportReport(total=total, inserted=inserted, failed=len(errors), errors=errors)
+
+def import_tenants(db: Session, stream: IO[bytes], fmt: str, batch_size: Optional[int] = None) -> ImportReport:
+    return import_rows(db, Tenant, TenantCreate, iter_records(stream, fmt), batch_size)
+
+def import_rooms(db: Session, stream: IO[bytes], fmt: str, batch_size: Optional[int] = None) -> ImportReport:
+    return import_rows(db, Room, RoomCreate, iter_records(stream, fmt), batch_size, on_insert=_sync_room_labels)
+
+def _sync_room_labels(db: Session, rows: List[Tuple[int, dict]]) -> None:
+    rooms_svc.sync_labels(db, [(room_id, values.get("tags"), values.get("amenities")) for room_id, values in rows])
@@ -0,0 +1,117 @@
+import calendar
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import Date, case, func, insert, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.pagination import Page, paginate
+from app.models import Contract, Invoice
+
+def parse_period(value: str) -> date:
+    """'YYYY-MM' (or any ISO date within the month) -> first day of that month."""
+    try:
+        if len(value) == 7:
+            value += "-01"
+        d = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("period must be YYYY-MM")
+    return d.replace(day=1)
+
+def list_invoices(db: Session) -> List[Invoice]:
+    return db.query(Invoice).order_by(Invoice.id.desc()).all()
+
+def page_invoices(
+    db: Session,
+    limit: int,
+    after: Optional[str] = None,
+    contract_id: Optional[int] = None,
+    period: Optional[date] = None,
+    status: Optional[str] = None,
+) -> Page:
+    q = db.query(Invoice)
+    if contract_id is not None:
+        q = q.filter(Invoice.contract_id == contract_id)
+    if period is not None:
+        q = q.filter(Invoice.period == period.replace(day=1))
+    if status is not None:
+        q = q.filter(Invoice.status == status)
+    return paginate(q, (Invoice.id,), limit, after)
+
+def get_invoice(db: Session, invoice_id: int) -> Optional[Invoice]:
+    return db.get(Invoice, invoice_id)
+
+def allocate_payments(db: Session, contract_ids: Optional[Union[Iterable[int], Select]] = None) -> int:
+    """Spread each contract's total_paid over its invoices, oldest period first.
+
+    One UPDATE ... FROM over a window-function running total, touching only
+    invoices whose allocation changed. `contract_ids` (ids or a SELECT of ids)
+    limits the contracts considered. Runs in the caller's transaction.
+    """
+    billed_before = func.coalesce(
+        func.sum(Invoice.amount).over(partition_by=Invoice.contract_id, order_by=(Invoice.period, Invoice.id), rows=(None, -1)),
+        0,
+    )
+    alloc = select(Invoice.id.label("id"), Invoice.amount.label("amount"), (Contract.total_paid - billed_before).label("credit")).join(
+        Contract, Contract.id == Invoice.contract_id
+    )
+    if contract_ids is not None:
+        alloc = alloc.where(Invoice.contract_id.in_(contract_ids))
+    alloc = alloc.subquery()
+
+    paid = case((alloc.c.credit <= 0, 0), (alloc.c.credit >= alloc.c.amount, alloc.c.amount), else_=alloc.c.credit)
+    status = case((alloc.c.credit <= 0, "open"), (alloc.c.credit >= alloc.c.amount, "paid"), else_="partial")
+    result = db.execute(
+        update(Invoice)
+        .where(Invoice.id == alloc.c.id, or_(Invoice.amount_paid != paid, Invoice.status != status))
+        .values(amount_paid=paid, status=status),
+        execution_options={"synchronize_session": False},
+    )
+    return result.rowcount
+
+def generate_invoices(db: Session, period: date) -> dict:
+    """Create the month's rent invoice for every active contract running in it.
+
+    A single INSERT ... SELECT over contracts; contracts already invoiced for
+    the period are skipped by an anti-join, and on Postgres and SQLite rows a
+    concurrent run got in first by ON CONFLICT DO NOTHING, so re-running, even
+    in parallel, is safe. The full monthly rent is charged, due on the 1st or
+    on the start date for contracts starting mid-month. Existing payment
+    credit is then allocated to the new invoices.
+    """
+    period = period.replace(day=1)
+    period_end = period.replace(day=calendar.monthrange(period.year, period.month)[1])
+    period_ = literal(period, Date)
+
+    already = select(Invoice.id).where(Invoice.contract_id == Contract.id, Invoice.period == period_).exists()
+    source = select(
+        Contract.id,
+        period_,
+        case((Contract.start_date > period_, Contract.start_date), else_=period_),
+        Contract.rent_amount,
+    ).where(
+        Contract.active == True,
+        Contract.start_date <= period_end,
+        or_(Contract.end_date.is_(None), Contract.end_date >= period_),
+        ~already,
+    )
+    columns = ["contract_id", "period", "due_date", "amount"]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        # a concurrent run can insert between the anti-join and this insert;
+        # its rows are skipped instead of failing on uq_invoices_contract_period
+        stmt = (postgresql if dialect == "postgresql" else sqlite).insert(Invoice).from_select(columns, source)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["contract_id", "period"])
+    else:
+        stmt = insert(Invoice).from_select(columns, source)
+    created = db.execute(stmt).rowcount
+
+    allocate_payments(db, select(Invoice.contract_id).where(Invoice.period == period_))
+    db.commit()
+
+    count, total = db.query(func.count(Invoice.id), func.coalesce(func.sum(Invoice.amount), 0)).filter(Invoice.period == period).one()
+    return {"period": period, "created": created, "invoices": count, "total_amount": Decimal(total)}
+
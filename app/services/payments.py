@@ -1,34 +1,130 @@
 from decimal import Decimal
 from typing import List, Optional
-from sqlalchemy import func
+from sqlalchemy import case, func, select, update
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from app.core.pagination import Page, paginate
+from app.core.serialization import schema_columns
+from app.db.session import AnySession, run_db
 from app.models import Payment, Contract
-from app.schemas.payment import PaymentCreate
+from app.schemas.payment import PaymentCreate, PaymentRead
+from app.services.invoices import allocate_payments
+from app.services.rollups import record_payment
 
 def list_payments(db: Session) -> List[Payment]:
     return db.query(Payment).order_by(Payment.paid_at.desc()).all()
 
+def page_payments(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    return paginate(db.query(Payment), (Payment.paid_at, Payment.id), limit, after)
+
+def page_payment_rows(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    """page_payments as plain rows of PaymentRead's columns, for RowsJSONResponse."""
+    return paginate(db.query(*schema_columns(PaymentRead, Payment)), (Payment.paid_at, Payment.id), limit, after)
+
 def get_payment(db: Session, payment_id: int) -> Optional[Payment]:
     return db.get(Payment, payment_id)
 
-def create_payment(db: Session, payload: PaymentCreate) -> Payment:
+# commit=False: run inside the caller's transaction, as in app.services.tenants
+
+def create_payment(db: Session, payload: PaymentCreate, commit: bool = True) -> Payment:
     contract = db.get(Contract, payload.contract_id)
     if not contract:
         raise ValueError("Contract not found")
     if payload.amount is None or payload.amount <= Decimal("0"):
         raise ValueError("amount must be greater than 0")
-    payment = Payment(**payload.dict())
+    payment = Payment(**payload.dict(), paid_at=datetime.utcnow())
     db.add(payment)
+    # SQL-side increments in the same transaction, so concurrent payments can't lose updates
+    contract.total_paid = Contract.total_paid + payment.amount
+    contract.payment_count = Contract.payment_count + 1
+    contract.last_paid_at = case(
+        (Contract.last_paid_at.is_(None), payment.paid_at),
+        (Contract.last_paid_at < payment.paid_at, payment.paid_at),
+        else_=Contract.last_paid_at,
+    )
+    db.flush()
+    allocate_payments(db, [contract.id])
+    record_payment(db, payment, contract.room_id)
+    if not commit:
+        return payment
     db.commit()
     db.refresh(payment)
     return payment
 
-def delete_payment(db: Session, payment: Payment) -> None:
+def delete_payment(db: Session, payment: Payment, commit: bool = True) -> None:
+    contract = db.get(Contract, payment.contract_id)
     db.delete(payment)
-    db.commit()
+    db.flush()
+    contract.total_paid = Contract.total_paid - payment.amount
+    contract.payment_count = Contract.payment_count - 1
+    contract.last_paid_at = (
+        select(func.max(Payment.paid_at)).where(Payment.contract_id == payment.contract_id).scalar_subquery()
+    )
+    db.flush()
+    allocate_payments(db, [contract.id])
+    record_payment(db, payment, contract.room_id, sign=-1)
+    if commit:
+        db.commit()
 
 def total_paid_for_contract(db: Session, contract_id: int) -> Decimal:
+    total = db.query(Contract.total_paid).filter(Contract.id == contract_id).scalar()
+    return Decimal(total or 0)
+
+def ledger_total_for_contract(db: Session, contract_id: int) -> Decimal:
+    """SUM over the payments ledger; the source of truth `total_paid` is reconciled against."""
     total = db.query(func.coalesce(func.sum(Payment.amount), 0)).filter(Payment.contract_id == contract_id).scalar()
-    return Decimal(total)
\ No newline at end of file
+    return Decimal(total)
+
+def reconcile_contract_balances(db: Session, fix: bool = False) -> List[dict]:
+    """Compare every contract's running totals with one grouped aggregate over payments.
+
+    Returns the mismatching contracts; with `fix=True` the stored totals are
+    overwritten with the ledger values in a single transaction.
+    """
+    ledger = (
+        db.query(
+            Payment.contract_id.label("contract_id"),
+            func.sum(Payment.amount).label("total"),
+            func.count(Payment.id).label("count"),
+            func.max(Payment.paid_at).label("last"),
+        )
+        .group_by(Payment.contract_id)
+        .subquery()
+    )
+    rows = (
+        db.query(Contract.id, Contract.total_paid, Contract.payment_count, Contract.last_paid_at, ledger.c.total, ledger.c.count, ledger.c.last)
+        .outerjoin(ledger, ledger.c.contract_id == Contract.id)
+        .all()
+    )
+    mismatches = []
+    for contract_id, total_paid, payment_count, last_paid_at, total, count, last in rows:
+        expected = {"total_paid": Decimal(total or 0), "payment_count": count or 0, "last_paid_at": last}
+        stored = {"total_paid": Decimal(total_paid or 0), "payment_count": payment_count or 0, "last_paid_at": last_paid_at}
+        if stored != expected:
+            mismatches.append({"id": contract_id, "stored": stored, "expected": expected})
+    if fix and mismatches:
+        db.execute(update(Contract), [{"id": m["id"], **m["expected"]} for m in mismatches])
+        allocate_payments(db, [m["id"] for m in mismatches])
+        db.commit()
+    return mismatches
+
+# async variants for async handlers (see app.db.session.run_db)
+async def list_payments_async(db: AnySession) -> List[Payment]:
+    return await run_db(db, list_payments)
+
+async def page_payments_async(db: AnySession, limit: int, after: Optional[str] = None) -> Page:
+    return await run_db(db, page_payments, limit, after)
+
+async def get_payment_async(db: AnySession, payment_id: int) -> Optional[Payment]:
+    return await run_db(db, get_payment, payment_id)
+
+async def create_payment_async(db: AnySession, payload: PaymentCreate) -> Payment:
+    return await run_db(db, create_payment, payload)
+
+async def delete_payment_async(db: AnySession, payment: Payment) -> None:
+    await run_db(db, delete_payment, payment)
+
+async def total_paid_for_contract_async(db: AnySession, contract_id: int) -> Decimal:
+    return await run_db(db, total_paid_for_contract, contract_id)
+
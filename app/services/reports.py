@@ -0,0 +1,231 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import Date, Integer, Numeric, and_, case, cast, extract, func, literal, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import TTLCache
+from app.db.functions import add_months, days_between, floor_int
+from app.models import Contract, Invoice, Payment, PaymentDailyTotal, Room, RoomOccupancyMonthly, Tenant
+from app.services.rollups import month_end
+
+# (max days overdue, label); anything older falls into "90+"
+AGING_BUCKETS = ((0, "current"), (30, "1-30"), (60, "31-60"), (90, "61-90"))
+OLDEST_BUCKET = "90+"
+
+def _money(expr):
+    return type_coerce(expr, Numeric(12, 2))
+
+def arrears(db: Session, as_of: Optional[date] = None, overdue_only: bool = False) -> dict:
+    """Expected vs paid rent for every active contract, in one statement.
+
+    Rent falls due monthly in advance on the contract's start day-of-month
+    (the month's last day in shorter months), up to `as_of` or the end date, whichever is earlier. Payments up to
+    `as_of` come from one grouped aggregate over the ledger and are applied
+    oldest period first, so days overdue count from the due date of the
+    oldest period not fully paid.
+    """
+    as_of = as_of or date.today()
+    cutoff = datetime.combine(as_of + timedelta(days=1), time.min)
+    as_of_ = literal(as_of, Date)
+
+    ledger = (
+        select(Payment.contract_id, func.sum(Payment.amount).label("paid"))
+        .where(Payment.paid_at < cutoff)
+        .group_by(Payment.contract_id)
+        .subquery()
+    )
+    through = case((and_(Contract.end_date.is_not(None), Contract.end_date < as_of_), Contract.end_date), else_=as_of_)
+    # periods falling due on or before `through`: every month up to its month,
+    # plus its own month's once that due date (add_months, clamped to the
+    # month's end like the days_overdue below) has been reached
+    month_diff = cast(
+        (extract("year", through) - extract("year", Contract.start_date)) * 12
+        + extract("month", through) - extract("month", Contract.start_date),
+        Integer,
+    )
+    months = month_diff + case((add_months(Contract.start_date, month_diff) <= through, 1), else_=0)
+    base = (
+        select(
+            Contract.id.label("contract_id"), Contract.tenant_id, Tenant.name.label("tenant_name"),
+            Contract.room_id, Room.number.label("room_number"),
+            Contract.start_date, Contract.end_date, Contract.rent_amount,
+            case((months > 0, months), else_=0).label("periods_due"),
+            func.coalesce(ledger.c.paid, 0).label("paid"),
+        )
+        .join(Tenant, Tenant.id == Contract.tenant_id)
+        .join(Room, Room.id == Contract.room_id)
+        .outerjoin(ledger, ledger.c.contract_id == Contract.id)
+        .where(Contract.active == True)
+        .cte("arrears_base")
+        .prefix_with("MATERIALIZED")
+    )
+    # Each stage is a materialized CTE so the planner cannot inline the date
+    # arithmetic into every later reference (SQLite flattens plain subqueries).
+    paid_periods = floor_int(base.c.paid / base.c.rent_amount)
+    computed = (
+        select(
+            *base.c,
+            (base.c.periods_due * base.c.rent_amount).label("expected"),
+            (base.c.periods_due * base.c.rent_amount - base.c.paid).label("balance"),
+            case(
+                (paid_periods < base.c.periods_due, days_between(as_of_, add_months(base.c.start_date, paid_periods))),
+                else_=0,
+            ).label("days_overdue"),
+        )
+        .cte("arrears")
+        .prefix_with("MATERIALIZED")
+    )
+    c = computed.c
+    bucket = case(*((c.days_overdue <= limit, label) for limit, label in AGING_BUCKETS), else_=OLDEST_BUCKET)
+    stmt = select(
+        c.contract_id, c.tenant_id, c.tenant_name, c.room_id, c.room_number,
+        c.start_date, c.end_date, c.rent_amount, c.periods_due,
+        _money(c.expected).label("expected"), _money(c.paid).label("paid"), _money(c.balance).label("balance"),
+        c.days_overdue, bucket.label("bucket"),
+    ).order_by(c.days_overdue.desc(), c.balance.desc(), c.contract_id)
+    if overdue_only:
+        stmt = stmt.where(c.balance > 0)
+    rows = db.execute(stmt).mappings().all()
+
+    buckets = {label: {"count": 0, "balance": Decimal("0")} for _, label in AGING_BUCKETS}
+    buckets[OLDEST_BUCKET] = {"count": 0, "balance": Decimal("0")}
+    for row in rows:
+        if row["balance"] > 0:
+            buckets[row["bucket"]]["count"] += 1
+            buckets[row["bucket"]]["balance"] += row["balance"]
+    return {
+        "as_of": as_of,
+        "contracts": len(rows),
+        "expected": sum((r["expected"] for r in rows), Decimal("0")),
+        "paid": sum((r["paid"] for r in rows), Decimal("0")),
+        "outstanding": sum((b["balance"] for b in buckets.values()), Decimal("0")),
+        "buckets": buckets,
+        "rows": rows,
+    }
+
+# -- revenue / occupancy, served from the rollup tables (app.services.rollups) --
+
+REVENUE_GROUPS = ("month", "method", "room")
+
+def revenue(db: Session, start: date, end: date, group_by: str = "month") -> List[dict]:
+    """Payments received in [start, end] by month, method or room.
+
+    Reads payment_daily_totals only, so the cost follows the length of the
+    range, not the size of the payments ledger.
+    """
+    if group_by not in REVENUE_GROUPS:
+        raise ValueError(f"group_by must be one of {', '.join(REVENUE_GROUPS)}")
+    t = PaymentDailyTotal
+    total, count = func.sum(t.total), func.sum(t.count)
+    in_range = (t.day >= start, t.day <= end)
+    if group_by == "month":
+        year, month = extract("year", t.day), extract("month", t.day)
+        rows = db.execute(select(year, month, total, count).where(*in_range).group_by(year, month).order_by(year, month))
+        return [{"key": f"{int(y):04d}-{int(m):02d}", "total": _as_money(v), "count": int(n)} for y, m, v, n in rows]
+    if group_by == "method":
+        rows = db.execute(select(t.method, total, count).where(*in_range).group_by(t.method).order_by(total.desc()))
+        return [{"key": method or None, "total": _as_money(v), "count": int(n)} for method, v, n in rows]
+    rows = db.execute(
+        select(Room.number, total, count).join(Room, Room.id == t.room_id).where(*in_range).group_by(Room.id, Room.number).order_by(total.desc())
+    )
+    return [{"key": number, "total": _as_money(v), "count": int(n)} for number, v, n in rows]
+
+def _as_money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+def occupancy(db: Session, month: date) -> dict:
+    """Occupancy rate and vacancy days per floor for one month.
+
+    Capacity is every active room for every day of the month. Occupied days
+    come from room_occupancy_monthly plus the open-ended contracts running in
+    the month, which the rollup leaves out; each is one pass over the rooms.
+    """
+    month = month.replace(day=1)
+    last = month_end(month)
+    days = last.day
+    occ = RoomOccupancyMonthly
+    occupied = func.coalesce(func.sum(occ.occupied_days), 0)
+    rows = db.execute(
+        select(Room.floor, func.count(Room.id), occupied)
+        .outerjoin(occ, and_(occ.room_id == Room.id, occ.month == month))
+        .where(Room.active == True)
+        .group_by(Room.floor)
+        .order_by(Room.floor)
+    ).all()
+    open_ended = db.execute(
+        select(Room.floor, Contract.start_date)
+        .join(Contract, Contract.room_id == Room.id)
+        .where(Room.active == True, Contract.active == True, Contract.end_date.is_(None), Contract.start_date <= last)
+    )
+    tail = defaultdict(int)
+    for floor, start in open_ended:
+        tail[floor] += (last - max(start, month)).days + 1
+    floors = []
+    for floor, rooms, occupied_days in rows:
+        occupied_days = int(occupied_days) + tail[floor]
+        capacity = rooms * days
+        floors.append({
+            "floor": floor, "rooms": rooms, "occupied_days": occupied_days,
+            "vacancy_days": capacity - occupied_days,
+            "rate": round(occupied_days / capacity, 4) if capacity else 0.0,
+        })
+    rooms = sum(f["rooms"] for f in floors)
+    occupied_total = sum(f["occupied_days"] for f in floors)
+    capacity = rooms * days
+    return {
+        "month": month, "rooms": rooms, "occupied_days": occupied_total,
+        "vacancy_days": capacity - occupied_total,
+        "rate": round(occupied_total / capacity, 4) if capacity else 0.0,
+        "floors": floors,
+    }
+
+def dashboard_kpis(db: Session, today: Optional[date] = None) -> dict:
+    """Headline numbers for the dashboard, all read from rollups or indexes."""
+    today = today or date.today()
+    month = today.replace(day=1)
+    prev = (month - timedelta(days=1)).replace(day=1)
+    t = PaymentDailyTotal
+    mtd = db.query(func.coalesce(func.sum(t.total), 0)).filter(t.day >= month, t.day <= today).scalar()
+    last = db.query(func.coalesce(func.sum(t.total), 0)).filter(t.day >= prev, t.day < month).scalar()
+    occ = occupancy(db, month)
+    overdue = db.query(func.count(Invoice.id)).filter(Invoice.status.in_(("open", "partial")), Invoice.due_date < today).scalar()
+    return {
+        "revenue_mtd": _as_money(mtd),
+        "revenue_last_month": _as_money(last),
+        "occupancy_rate": occ["rate"],
+        "vacancy_days": occ["vacancy_days"],
+        "overdue_invoices": overdue,
+    }
+
+# one entry; shared by every scrape of this worker until it expires
+_counters_cache = TTLCache(1, settings.METRICS_DOMAIN_TTL_SECONDS)
+
+def domain_counters(db: Session, today: Optional[date] = None) -> dict:
+    """Cheap business gauges for /metrics, recomputed at most once per TTL.
+
+    Payments come from the daily rollup and occupancy from the monthly one;
+    the contract and invoice counts are index-only scans.
+    """
+    today = today or date.today()
+    cached = _counters_cache.get(today)
+    if cached is not None:
+        return cached
+    t = PaymentDailyTotal
+    payments, amount = db.query(func.coalesce(func.sum(t.count), 0), func.coalesce(func.sum(t.total), 0)).filter(t.day == today).one()
+    active = db.query(func.count(Contract.id)).filter(
+        Contract.active == True, Contract.start_date <= today, or_(Contract.end_date == None, Contract.end_date >= today),
+    ).scalar()
+    overdue = db.query(func.count(Invoice.id)).filter(Invoice.status.in_(("open", "partial")), Invoice.due_date < today).scalar()
+    counters = {
+        "active_contracts": active,
+        "payments_today": int(payments),
+        "payments_today_amount": float(amount),
+        "overdue_invoices": overdue,
+        "occupancy_rate": occupancy(db, today)["rate"],
+    }
+    _counters_cache.set(today, counters)
+    return counters
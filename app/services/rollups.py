@@ -0,0 +1,119 @@
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Contract, Payment, PaymentDailyTotal, RoomOccupancyMonthly
+
+def month_end(month: date) -> date:
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+def _add_to_day(db: Session, day: date, room_id: int, method: str, amount: Decimal, count: int) -> None:
+    values = {"day": day, "room_id": room_id, "method": method, "total": amount, "count": count}
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (postgresql if dialect == "postgresql" else sqlite).insert(PaymentDailyTotal).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["day", "room_id", "method"],
+            set_={"total": PaymentDailyTotal.total + stmt.excluded.total, "count": PaymentDailyTotal.count + stmt.excluded.count},
+        ))
+        return
+    key = (PaymentDailyTotal.day == day, PaymentDailyTotal.room_id == room_id, PaymentDailyTotal.method == method)
+    result = db.execute(update(PaymentDailyTotal).where(*key).values(total=PaymentDailyTotal.total + amount, count=PaymentDailyTotal.count + count))
+    if result.rowcount == 0:
+        db.execute(insert(PaymentDailyTotal).values(**values))
+
+def record_payment(db: Session, payment: Payment, room_id: int, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) a payment from its day's totals.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    method = payment.method or ""
+    day = payment.paid_at.date()
+    _add_to_day(db, day, room_id, method, payment.amount * sign, sign)
+    if sign < 0:
+        db.execute(delete(PaymentDailyTotal).where(
+            PaymentDailyTotal.day == day, PaymentDailyTotal.room_id == room_id,
+            PaymentDailyTotal.method == method, PaymentDailyTotal.count <= 0,
+        ))
+
+def move_contract_payments(db: Session, contract_id: int, from_room_id: int, to_room_id: int) -> None:
+    """Move a contract's payments in the daily totals from one room to another.
+
+    Revenue is credited to the room the contract is on now, the same rule
+    rebuild() applies, so a room change carries the contract's history
+    along. Runs in the caller's transaction; the caller commits.
+    """
+    if from_room_id == to_room_id:
+        return
+    moved: Dict[tuple, list] = defaultdict(lambda: [Decimal("0"), 0])
+    for paid_at, method, amount in db.execute(
+        select(Payment.paid_at, Payment.method, Payment.amount).where(Payment.contract_id == contract_id)
+    ):
+        totals = moved[(paid_at.date(), method or "")]
+        totals[0] += amount
+        totals[1] += 1
+    for (day, method), (amount, count) in moved.items():
+        _add_to_day(db, day, from_room_id, method, -amount, -count)
+        _add_to_day(db, day, to_room_id, method, amount, count)
+    db.execute(delete(PaymentDailyTotal).where(PaymentDailyTotal.room_id == from_room_id, PaymentDailyTotal.count <= 0))
+
+# The occupancy rollup holds contracts with an end date only. An open-ended
+# contract has no last month to stop at, so reports.occupancy() adds those
+# (at most one active per room) at query time for whatever month is asked.
+_BOUNDED = (Contract.active == True, Contract.end_date.is_not(None))
+
+def _occupancy_rows(contracts: Iterable) -> Dict[tuple, int]:
+    """(month, room_id) -> occupied days for (room_id, start, end) rows with an end date."""
+    days: Dict[tuple, int] = defaultdict(int)
+    for room_id, start, end in contracts:
+        d = start
+        while d <= end:
+            last = month_end(d)
+            days[(d.replace(day=1), room_id)] += (min(end, last) - d).days + 1
+            d = last + timedelta(days=1)
+    return days
+
+def _insert_occupancy(db: Session, days: Dict[tuple, int]) -> None:
+    if days:
+        db.execute(insert(RoomOccupancyMonthly), [{"month": m, "room_id": r, "occupied_days": n} for (m, r), n in days.items()])
+
+def refresh_room_occupancy(db: Session, room_ids: Iterable[int]) -> None:
+    """Recompute the occupancy rollup of the given rooms from their active, bounded contracts.
+
+    Cost is proportional to those rooms' own contracts. Runs in the caller's
+    transaction; the caller commits.
+    """
+    room_ids = [r for r in set(room_ids) if r is not None]
+    if not room_ids:
+        return
+    db.flush()
+    db.execute(delete(RoomOccupancyMonthly).where(RoomOccupancyMonthly.room_id.in_(room_ids)))
+    contracts = db.execute(
+        select(Contract.room_id, Contract.start_date, Contract.end_date).where(Contract.room_id.in_(room_ids), *_BOUNDED)
+    )
+    _insert_occupancy(db, _occupancy_rows(contracts))
+
+def rebuild(db: Session) -> dict:
+    """Recreate both rollups from payments and contracts (backfill / repair)."""
+    db.execute(delete(PaymentDailyTotal))
+    day = func.date(Payment.paid_at)
+    method = func.coalesce(Payment.method, "")
+    totals = (
+        select(day, Contract.room_id, method, func.sum(Payment.amount), func.count(Payment.id))
+        .join(Contract, Contract.id == Payment.contract_id)
+        .group_by(day, Contract.room_id, method)
+    )
+    payment_rows = db.execute(insert(PaymentDailyTotal).from_select(["day", "room_id", "method", "total", "count"], totals)).rowcount
+
+    db.execute(delete(RoomOccupancyMonthly))
+    contracts = db.execute(select(Contract.room_id, Contract.start_date, Contract.end_date).where(*_BOUNDED))
+    days = _occupancy_rows(contracts)
+    _insert_occupancy(db, days)
+    db.commit()
+    return {"payment_daily_totals": payment_rows, "room_occupancy_monthly": len(days)}
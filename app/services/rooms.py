@@ -1,29 +1,217 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import case, delete, func, insert, select
 from sqlalchemy.orm import Session
 
-from app.models import Room
-from app.schemas.room import RoomCreate
+from app.core.http_cache import table_validator
+from app.core.pagination import Page, paginate
+from app.core.security import TTLCache
+from app.core.serialization import schema_columns
+from app.db.session import AnySession, run_db
+from app.models import Room, RoomLabel
+from app.schemas.room import RoomCreate, RoomRead
+
+# upper bounds of the price facet buckets; the last bucket is open-ended
+PRICE_BUCKETS = (100, 250, 500, 1000)
 
 def list_rooms(db: Session) -> List[Room]:
     return db.query(Room).order_by(Room.id.desc()).all()
 
+def page_rooms(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    return paginate(db.query(Room), (Room.id,), limit, after)
+
+def page_room_rows(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    """page_rooms as plain rows of RoomRead's columns, for RowsJSONResponse."""
+    return paginate(db.query(*schema_columns(RoomRead, Room)), (Room.id,), limit, after)
+
 def get_room(db: Session, room_id: int) -> Optional[Room]:
     return db.get(Room, room_id)
 
-def create_room(db: Session, payload: RoomCreate) -> Room:
+def _label_values(values: Optional[Iterable]) -> Set[str]:
+    out = set()
+    for v in values or ():
+        if isinstance(v, dict):
+            v = v.get("name")  # amenities may be stored as objects
+        if v is None:
+            continue
+        v = str(v).strip().lower()[:100]
+        if v:
+            out.add(v)
+    return out
+
+def sync_labels(db: Session, rooms: Sequence[Tuple[int, Optional[list], Optional[list]]]) -> None:
+    """Rewrite the room_labels rows for (room_id, tags, amenities) triples.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not rooms:
+        return
+    db.execute(delete(RoomLabel).where(RoomLabel.room_id.in_([room_id for room_id, _, _ in rooms])))
+    rows = [
+        {"room_id": room_id, "kind": kind, "value": value}
+        for room_id, tags, amenities in rooms
+        for kind, values in (("tag", tags), ("amenity", amenities))
+        for value in _label_values(values)
+    ]
+    if rows:
+        db.execute(insert(RoomLabel), rows)
+
+# commit=False: run inside the caller's transaction, as in app.services.tenants
+
+def create_room(db: Session, payload: RoomCreate, commit: bool = True) -> Room:
     room = Room(**payload.dict())
     db.add(room)
+    db.flush()
+    sync_labels(db, [(room.id, room.tags, room.amenities)])
+    if not commit:
+        return room
     db.commit()
     db.refresh(room)
     return room
 
-def update_room(db: Session, room: Room, **changes) -> Room:
+def create_rooms(db: Session, payloads: Sequence[RoomCreate], commit: bool = True) -> List[int]:
+    """Insert many rooms and their labels with one multi-row INSERT each; returns the room ids in order."""
+    if not payloads:
+        return []
+    values = [p.model_dump() for p in payloads]
+    # render_nulls: as in tenants_svc.create_tenants, one statement whatever fields are unset
+    stmt = insert(Room).returning(Room.id, sort_by_parameter_order=True).execution_options(render_nulls=True)
+    ids = db.scalars(stmt, values).all()
+    sync_labels(db, [(room_id, v.get("tags"), v.get("amenities")) for room_id, v in zip(ids, values)])
+    if commit:
+        db.commit()
+    return list(ids)
+
+def update_room(db: Session, room: Room, commit: bool = True, **changes) -> Room:
     for k, v in changes.items():
         setattr(room, k, v)
+    if "tags" in changes or "amenities" in changes:
+        sync_labels(db, [(room.id, room.tags, room.amenities)])
+    if not commit:
+        return room
     db.commit()
     db.refresh(room)
     return room
 
-def delete_room(db: Session, room: Room) -> None:
+def delete_room(db: Session, room: Room, commit: bool = True) -> None:
+    db.execute(delete(RoomLabel).where(RoomLabel.room_id == room.id))
     db.delete(room)
-    db.commit()
\ No newline at end of file
+    if commit:
+        db.commit()
+
+def _search_filters(
+    price_min=None, price_max=None, floor=None, capacity=None,
+    has_ac=None, private_bath=None, accessible=None, available=None,
+    tags=None, amenities=None,
+) -> Dict[str, list]:
+    """Filter conditions keyed by the facet dimension they restrict."""
+    conds: Dict[str, list] = defaultdict(list)
+    if price_min is not None:
+        conds["price"].append(Room.price >= price_min)
+    if price_max is not None:
+        conds["price"].append(Room.price <= price_max)
+    if floor is not None:
+        conds["floor"].append(Room.floor == floor)
+    if capacity is not None:
+        conds["capacity"].append(Room.capacity >= capacity)
+    for name, flag in (("has_ac", has_ac), ("private_bath", private_bath), ("accessible", accessible), ("available", available)):
+        if flag is not None:
+            conds[name].append(getattr(Room, name) == flag)
+    # every requested label must be present: one index seek per label
+    for kind, name, values in (("tag", "tags", tags), ("amenity", "amenities", amenities)):
+        for value in sorted(_label_values(values)):
+            conds[name].append(Room.id.in_(select(RoomLabel.room_id).where(RoomLabel.kind == kind, RoomLabel.value == value)))
+    return conds
+
+def _facet_key(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+_FACET_COLUMNS = {
+    "floor": Room.floor, "capacity": Room.capacity, "has_ac": Room.has_ac,
+    "private_bath": Room.private_bath, "accessible": Room.accessible, "available": Room.available,
+}
+
+def _label_facets(db: Session, conds: list) -> Dict[str, Dict[str, int]]:
+    facets: Dict[str, Dict[str, int]] = {"tags": {}, "amenities": {}}
+    query = select(RoomLabel.kind, RoomLabel.value, func.count())
+    if conds:
+        query = query.where(RoomLabel.room_id.in_(select(Room.id).where(*conds)))
+    rows = db.execute(query.group_by(RoomLabel.kind, RoomLabel.value).order_by(func.count().desc(), RoomLabel.value))
+    for kind, value, n in rows:
+        facets["tags" if kind == "tag" else "amenities"][value] = n
+    return facets
+
+def _facet(db: Session, name: str, conds: list) -> Dict[str, Any]:
+    if name == "labels":
+        return _label_facets(db, conds)
+    if name == "price":
+        bounds = (0,) + PRICE_BUCKETS
+        bucket = case(
+            *((Room.price < hi, f"{lo}-{hi}") for lo, hi in zip(bounds, PRICE_BUCKETS)),
+            else_=f"{PRICE_BUCKETS[-1]}+",
+        )
+        return dict(db.execute(select(bucket, func.count()).where(*conds, Room.price.is_not(None)).group_by(bucket)).all())
+    column = _FACET_COLUMNS[name]
+    rows = db.execute(select(column, func.count()).where(*conds, column.is_not(None)).group_by(column))
+    return {_facet_key(value): n for value, n in rows}
+
+# (facet, rooms table version) -> counts over every room, for facets with no
+# filter left to apply; like availability.interval_index, any room change in
+# any worker misses the cache.
+_facet_cache = TTLCache(maxsize=32, ttl=300)
+
+def search_rooms(db: Session, limit: int, after: Optional[str] = None, **filters) -> dict:
+    """Filtered, keyset-paginated rooms plus facet counts.
+
+    Facets are disjunctive: each one is counted with every filter but its own,
+    so a chosen floor (or price range, flag, ...) still shows the counts of
+    the alternatives. Tags and amenities are the exception: every chosen
+    label must match, so their counts are over the full match set, i.e. what
+    adding one more label would leave. One grouped query per facet; facets
+    with nothing left to filter on come from a cache keyed on the rooms
+    table's ETag.
+    """
+    by_facet = _search_filters(**filters)
+    conds = [cond for group in by_facet.values() for cond in group]
+    page = paginate(db.query(Room).filter(*conds), (Room.id,), limit, after)
+    total = db.scalar(select(func.count()).select_from(Room).where(*conds))
+
+    etag: Optional[str] = None
+    facets: Dict[str, Dict[str, int]] = {}
+    for name in (*_FACET_COLUMNS, "price", "labels"):
+        where = conds if name == "labels" else [cond for facet, group in by_facet.items() if facet != name for cond in group]
+        if where:
+            counts = _facet(db, name, where)
+        else:
+            etag = etag or table_validator(db, Room).etag
+            counts = _facet_cache.get((name, etag))
+            if counts is None:
+                counts = _facet(db, name, [])
+                _facet_cache.set((name, etag), counts)
+        if name == "labels":
+            facets.update(counts)
+        else:
+            facets[name] = counts
+
+    return {"items": page.items, "next_cursor": page.next_cursor, "total": total, "facets": facets}
+
+# async variants for async handlers (see app.db.session.run_db)
+async def list_rooms_async(db: AnySession) -> List[Room]:
+    return await run_db(db, list_rooms)
+
+async def page_rooms_async(db: AnySession, limit: int, after: Optional[str] = None) -> Page:
+    return await run_db(db, page_rooms, limit, after)
+
+async def get_room_async(db: AnySession, room_id: int) -> Optional[Room]:
+    return await run_db(db, get_room, room_id)
+
+async def create_room_async(db: AnySession, payload: RoomCreate) -> Room:
+    return await run_db(db, create_room, payload)
+
+async def update_room_async(db: AnySession, room: Room, **changes) -> Room:
+    return await run_db(db, update_room, room, **changes)
+
+async def delete_room_async(db: AnySession, room: Room) -> None:
+    await run_db(db, delete_room, room)
@@ -1,29 +1,132 @@
-from typing import List, Optional
+import re
+from typing import List, Optional, Sequence
+from sqlalchemy import func, insert, or_, text
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, paginate
+from app.core.serialization import schema_columns
+from app.db.session import AnySession, run_db
 from app.models import Tenant
-from app.schemas.tenant import TenantCreate
+from app.models.tenant import search_document
+from app.schemas.tenant import TenantCreate, TenantRead
 
 def list_tenants(db: Session) -> List[Tenant]:
     return db.query(Tenant).order_by(Tenant.id.desc()).all()
 
+def page_tenants(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    return paginate(db.query(Tenant), (Tenant.id,), limit, after)
+
+def page_tenant_rows(db: Session, limit: int, after: Optional[str] = None) -> Page:
+    """page_tenants as plain rows of TenantRead's columns, for RowsJSONResponse."""
+    return paginate(db.query(*schema_columns(TenantRead, Tenant)), (Tenant.id,), limit, after)
+
 def get_tenant(db: Session, tenant_id: int) -> Optional[Tenant]:
     return db.get(Tenant, tenant_id)
 
-def create_tenant(db: Session, payload: TenantCreate) -> Tenant:
+_TERM = re.compile(r"\w+")
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _search_fts5(db: Session, q: str, limit: int) -> List[Tenant]:
+    terms = _TERM.findall(q)
+    if not terms:
+        return []
+    # every term must prefix-match a token in some column; name weighs most
+    match = " ".join(f'"{term}"*' for term in terms)
+    # ranked over every hit, so the best match is found whatever its rowid
+    ids = db.execute(
+        text(
+            "SELECT rowid FROM tenants_fts WHERE tenants_fts MATCH :match"
+            " ORDER BY bm25(tenants_fts, 10.0, 4.0, 2.0, 2.0) LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    ).scalars().all()
+    if not ids:
+        return []
+    by_id = {t.id: t for t in db.query(Tenant).filter(Tenant.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+def search_tenants(db: Session, q: str, limit: int = 20) -> List[Tenant]:
+    """Ranked lookup by name, email, phone or ID number.
+
+    Postgres matches substrings and trigram word similarity on
+    search_document(), both served by the GIN index; SQLite uses the FTS5
+    table with per-term prefix matching. Other backends fall back to LIKE.
+    """
+    q = q.strip().lower()
+    if not q:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return _search_fts5(db, q, limit)
+
+    doc = search_document()
+    escaped = _like_escape(q)
+    match = doc.like(f"%{escaped}%", escape="\\")
+    order = [func.lower(Tenant.name).like(f"{escaped}%", escape="\\").desc()]
+    if dialect == "postgresql":
+        match = or_(match, doc.op("%>")(q))
+        order.append(func.word_similarity(q, doc).desc())
+    return db.query(Tenant).filter(match).order_by(*order, Tenant.id.desc()).limit(limit).all()
+
+# Writes take commit=False to run inside the caller's transaction (see
+# app.services.batch): nothing is committed or refreshed, a new row is only
+# flushed for its id, and the caller commits.
+
+def create_tenant(db: Session, payload: TenantCreate, commit: bool = True) -> Tenant:
     tenant = Tenant(**payload.dict())
     db.add(tenant)
+    if not commit:
+        db.flush()
+        return tenant
     db.commit()
     db.refresh(tenant)
     return tenant
 
-def update_tenant(db: Session, tenant: Tenant, **changes) -> Tenant:
+def create_tenants(db: Session, payloads: Sequence[TenantCreate], commit: bool = True) -> List[int]:
+    """Insert many tenants with one multi-row INSERT; returns their ids in order."""
+    if not payloads:
+        return []
+    # render_nulls: rows that leave different optional fields unset still share one statement
+    stmt = insert(Tenant).returning(Tenant.id, sort_by_parameter_order=True).execution_options(render_nulls=True)
+    ids = db.scalars(stmt, [p.model_dump() for p in payloads]).all()
+    if commit:
+        db.commit()
+    return list(ids)
+
+def update_tenant(db: Session, tenant: Tenant, commit: bool = True, **changes) -> Tenant:
     for k, v in changes.items():
         setattr(tenant, k, v)
+    if not commit:
+        return tenant
     db.commit()
     db.refresh(tenant)
     return tenant
 
-def delete_tenant(db: Session, tenant: Tenant) -> None:
+def delete_tenant(db: Session, tenant: Tenant, commit: bool = True) -> None:
     db.delete(tenant)
-    db.commit()
\ No newline at end of file
+    if commit:
+        db.commit()
+
+# async variants for async handlers (see app.db.session.run_db)
+async def list_tenants_async(db: AnySession) -> List[Tenant]:
+    return await run_db(db, list_tenants)
+
+async def page_tenants_async(db: AnySession, limit: int, after: Optional[str] = None) -> Page:
+    return await run_db(db, page_tenants, limit, after)
+
+async def search_tenants_async(db: AnySession, q: str, limit: int = 20) -> List[Tenant]:
+    return await run_db(db, search_tenants, q, limit)
+
+async def get_tenant_async(db: AnySession, tenant_id: int) -> Optional[Tenant]:
+    return await run_db(db, get_tenant, tenant_id)
+
+async def create_tenant_async(db: AnySession, payload: TenantCreate) -> Tenant:
+    return await run_db(db, create_tenant, payload)
+
+async def update_tenant_async(db: AnySession, tenant: Tenant, **changes) -> Tenant:
+    return await run_db(db, update_tenant, tenant, **changes)
+
+async def delete_tenant_async(db: AnySession, tenant: Tenant) -> None:
+    await run_db(db, delete_tenant, tenant)
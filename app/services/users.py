@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 
 from app.models import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_password, verify_password_async, Principal, principal_cache
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
@@ -11,8 +12,8 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
 def get_user(db: Session, user_id: int) -> Optional[User]:
     return db.get(User, user_id)
 
-def create_user(db: Session, payload: UserCreate) -> User:
-    hashed = get_password_hash(payload.password)
+def create_user(db: Session, payload: UserCreate, hashed_password: Optional[str] = None) -> User:
+    hashed = hashed_password or get_password_hash(payload.password)
     user = User(username=payload.username, email=payload.email, hashed_password=hashed)
     db.add(user)
     db.commit()
@@ -25,4 +26,71 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
         return None
     if not verify_password(password, user.hashed_password):
         return None
-    return user
\ No newline at end of file
+    return user
+
+def _lookup_and_release(db: Session, username: str) -> Optional[User]:
+    user = get_user_by_username(db, username)
+    # hand the pooled connection back before the slow bcrypt check by ending
+    # the transaction; `user` is expunged first so the rollback does not expire
+    # its loaded attributes. The session itself stays open for get_db to close.
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[User]:
+    # lookup runs in the threadpool so the event loop stays free; bcrypt runs in the hash pool
+    user = await run_in_threadpool(_lookup_and_release, db, username)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+def token_claims(user: User) -> dict:
+    return {"active": bool(user.is_active), "su": bool(user.is_superuser), "ver": user.token_version or 0}
+
+def to_principal(user: User) -> Principal:
+    return Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser),
+        token_version=user.token_version or 0,
+    )
+
+def get_principal(db: Session, user_id: int, token_version: int = 0) -> Optional[Principal]:
+    """Resolve the principal for a verified token, hitting the users table only on a cache miss.
+
+    A token carrying a newer version than the cached entry forces a reload, so a
+    fresh login is never rejected because of a stale cache entry.
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None or principal.token_version < token_version:
+        user = get_user(db, user_id)
+        if not user:
+            principal_cache.invalidate(user_id)
+            return None
+        principal = to_principal(user)
+        principal_cache.set(user_id, principal)
+    if not principal.is_active or principal.token_version != token_version:
+        return None
+    return principal
+
+def revoke_tokens(db: Session, user: User) -> User:
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
+    return user
+
+def set_user_active(db: Session, user: User, is_active: bool) -> User:
+    user.is_active = is_active
+    if not is_active:
+        # deactivation revokes every outstanding token
+        user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
+    return user
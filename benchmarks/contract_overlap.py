@@ -0,0 +1,80 @@
+"""Contract-creation cost versus the room's contract history length.
+
+Seeds one room with N back-to-back active monthly contracts, then times
+create_contract for a new contract after the last one. `--legacy` also times
+the old approach (load every active contract of the room, loop _overlaps).
+
+    python benchmarks/contract_overlap.py [--sizes 10 1000 10000 50000] [--legacy]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Contract, Room, Tenant
+from app.schemas.contract import ContractCreate
+from app.services.contracts import _overlaps, create_contract
+
+def seed(db, n: int):
+    tenant, room = Tenant(name="Bench"), Room(number="B1")
+    db.add_all([tenant, room])
+    db.commit()
+    start = date(1900, 1, 1)
+    rows = []
+    for i in range(n):
+        end = start + timedelta(days=27)
+        rows.append({"tenant_id": tenant.id, "room_id": room.id, "start_date": start, "end_date": end, "rent_amount": Decimal("100"), "active": True})
+        start = end + timedelta(days=1)
+    db.execute(insert(Contract), rows)
+    db.commit()
+    return tenant.id, room.id, start
+
+def legacy_check(db, room_id, start, end):
+    existing = db.query(Contract).filter(Contract.room_id == room_id, Contract.active == True).all()
+    return any(_overlaps(start, end, c.start_date, c.end_date) for c in existing)
+
+def timed(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def main(args):
+    for n in args.sizes:
+        engine = create_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(), f"overlap_{n}.db"))
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        tenant_id, room_id, free_from = seed(db, n)
+
+        def create():
+            # create then delete so every round sees the same history
+            c = create_contract(db, ContractCreate(tenant_id=tenant_id, room_id=room_id, start_date=free_from, end_date=free_from + timedelta(days=27), rent_amount=Decimal("100")))
+            db.delete(c)
+            db.commit()
+
+        line = f"history={n:>7}  create_contract={timed(create):8.2f}ms"
+        if args.legacy:
+            line += f"  legacy_check={timed(lambda: legacy_check(db, room_id, free_from, None), repeat=5):9.2f}ms"
+        print(line)
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 50000])
+    parser.add_argument("--legacy", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,244 @@
+"""Throughput, latency percentiles and SQL query counts for the hot routes.
+
+Boots app.main:app against a seeded database and drives each route with a
+fixed number of requests at a fixed concurrency. By default the app runs
+in-process over ASGI against a throwaway SQLite file loaded with
+`scripts/seed.py --scale small`; `--workers N` starts `uvicorn --workers N`
+on the same database instead, and `--url` targets a server that is already
+running (it must use the same DATABASE_URL for the query-count pass).
+
+Query counts come from an in-process pass that replays each route once with
+a statement counter on the engine, so they are exact in every mode.
+
+    python benchmarks/http_routes.py [--scale small] [--requests 200] [--concurrency 8] [--out run.json]
+    python benchmarks/http_routes.py --workers 4 --out run.json
+    python benchmarks/http_routes.py --compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+os.chdir(project_root)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx
+from sqlalchemy import event, func
+
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models import Contract, Tenant
+from app.schemas.user import UserCreate
+from app.core.security import create_access_token
+import app.services.users as users_svc
+from scripts.seed import PROFILES, seed_scale
+
+USERNAME, PASSWORD = "bench", "bench-password"
+
+# name -> (method, path template, request kwargs); templates are filled from setup()'s ids
+ROUTES = {
+    "tenants_ui": ("GET", "/tenants/ui", {}),
+    "contracts_ui": ("GET", "/contracts/ui", {}),
+    "contract_detail_ui": ("GET", "/contracts/ui/{contract_id}", {}),
+    "payments_list": ("GET", "/payments/", {}),
+    "payments_create": ("POST", "/payments/", {"json": {"contract_id": "{contract_id}", "amount": "10.00", "method": "cash"}}),
+    "auth_token": ("POST", "/auth/token", {"data": {"username": USERNAME, "password": PASSWORD}}),
+    "tenants_api": ("GET", "/tenants/", {}),
+    "tenant_api": ("GET", "/tenants/{tenant_id}", {}),
+    "contract_api": ("GET", "/contracts/{contract_id}", {}),
+    "rooms_api": ("GET", "/rooms/", {}),
+}
+
+def setup(scale: str) -> dict:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(Contract.id).first():
+            seed_scale(PROFILES[scale])
+        user = users_svc.get_user_by_username(db, USERNAME) or users_svc.create_user(db, UserCreate(username=USERNAME, password=PASSWORD))
+        # the middle of the id range, so detail pages see a typical history
+        contract_id = db.query(func.max(Contract.id)).scalar() // 2 or 1
+        tenant_id = db.query(func.max(Tenant.id)).scalar() // 2 or 1
+        token = create_access_token(subject=user.id, claims=users_svc.token_claims(user))
+        return {"token": token, "contract_id": contract_id, "tenant_id": tenant_id}
+    finally:
+        db.close()
+
+def _fill(value, ids: dict):
+    if isinstance(value, str):
+        # a bare "{name}" becomes the id itself, so JSON bodies get integers
+        if value.startswith("{") and value.endswith("}"):
+            return ids[value[1:-1]]
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {k: _fill(v, ids) for k, v in value.items()}
+    return value
+
+def build_requests(names, ids: dict) -> dict:
+    return {name: (ROUTES[name][0], _fill(ROUTES[name][1], ids), _fill(ROUTES[name][2], ids)) for name in names}
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def drive(client, method, path, kwargs, n, concurrency) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            res = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": n,
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(n / elapsed, 1),
+        "mean_ms": round(sum(latencies) / n, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+async def count_queries(requests: dict, token: str) -> dict:
+    """Statements each route issues, replayed in-process after one warm-up call."""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    counts = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", cookies={"access_token": token}) as client:
+            for name, (method, path, kwargs) in requests.items():
+                await client.request(method, path, **kwargs)
+                statements.clear()
+                await client.request(method, path, **kwargs)
+                counts[name] = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return counts
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(workers: int):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log", "--log-level", "warning"],
+        cwd=project_root, env=os.environ.copy(),
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/health/").status_code == 200:
+                return proc, url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("uvicorn did not become ready within 30s")
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args) -> dict:
+    ids = setup(args.scale)
+    requests = build_requests(args.routes, ids)
+    server, url = None, args.url
+    if args.workers:
+        server, url = start_server(args.workers)
+    try:
+        if url:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            client = httpx.AsyncClient(base_url=url, cookies={"access_token": ids["token"]}, limits=limits, timeout=60)
+        else:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", cookies={"access_token": ids["token"]}, timeout=60)
+        results = {}
+        async with client:
+            for name, (method, path, kwargs) in requests.items():
+                await drive(client, method, path, kwargs, max(1, args.requests // 10), args.concurrency)  # warm up
+                results[name] = {"method": method, "path": ROUTES[name][1], **await drive(client, method, path, kwargs, args.requests, args.concurrency)}
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    for name, n in (await count_queries(requests, ids["token"])).items():
+        results[name]["queries"] = n
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "mode": "server" if url else "asgi",
+            "workers": args.workers,
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "database": engine.url.get_backend_name(),
+            "python": platform.python_version(),
+        },
+        "routes": results,
+    }
+
+def print_results(report: dict) -> None:
+    meta = report["meta"]
+    print(f"{meta['mode']} ({meta['workers'] or 1} worker(s)), {meta['requests']} requests x {meta['concurrency']} concurrent, commit {meta['commit']}")
+    print(f"{'route':<20} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'errors':>7}")
+    for name, r in report["routes"].items():
+        print(f"{name:<20} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['queries']:>8} {r['errors']:>7}")
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = json.load(f)["routes"]
+    with open(after_path) as f:
+        after = json.load(f)["routes"]
+    print(f"{'route':<20} {'p50 ms':>18} {'p99 ms':>18} {'rps':>18} {'queries':>10}")
+    for name in after:
+        if name not in before:
+            continue
+        b, a = before[name], after[name]
+        delta = lambda key: f"{b[key]:.1f}->{a[key]:.1f} {(a[key] - b[key]) / b[key] * 100 if b[key] else 0:+.0f}%"
+        print(f"{name:<20} {delta('p50_ms'):>18} {delta('p99_ms'):>18} {delta('rps'):>18} {b['queries']:>4}->{a['queries']:<4}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(PROFILES), default="small", help="seed profile when the database is empty")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES))
+    parser.add_argument("--workers", type=int, help="start uvicorn with this many worker processes")
+    parser.add_argument("--url", help="benchmark an already running server at this base URL")
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two saved results and exit")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+    report = asyncio.run(run(args))
+    print_results(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
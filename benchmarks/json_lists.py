@@ -0,0 +1,83 @@
+"""Encode cost of the JSON list endpoints: ORM + pydantic versus column rows + orjson.
+
+Seeds a throwaway SQLite database with N tenants, rooms, contracts and
+payments, then times one N-row page per entity both ways:
+
+  pydantic  the previous path: ORM entities, validated through the
+            response_model (from_attributes), dumped in JSON mode and
+            encoded by JSONResponse, as FastAPI does for a returned list
+  rows      schema_columns rows encoded by RowsJSONResponse
+
+Both produce the same JSON. The time includes the query.
+
+    python benchmarks/json_lists.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import json
+import tempfile
+import time
+from typing import List
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.serialization import RowsJSONResponse
+from app.db.session import Base, SessionLocal, engine
+import app.models  # noqa: F401  (registers the tables for create_all)
+from app.schemas import ContractRead, PaymentRead, RoomRead, TenantRead
+import app.services.contracts as contracts_svc
+import app.services.payments as payments_svc
+import app.services.rooms as rooms_svc
+import app.services.tenants as tenants_svc
+from scripts.seed import seed_scale
+
+ENTITIES = {
+    "tenants": (TenantRead, tenants_svc.page_tenants, tenants_svc.page_tenant_rows),
+    "rooms": (RoomRead, rooms_svc.page_rooms, rooms_svc.page_room_rows),
+    "contracts": (ContractRead, contracts_svc.page_contracts, contracts_svc.page_contract_rows),
+    "payments": (PaymentRead, payments_svc.page_payments, payments_svc.page_payment_rows),
+}
+
+def pydantic_path(db, schema, page, n) -> bytes:
+    adapter = TypeAdapter(List[schema])
+    items = page(db, n).items
+    return JSONResponse(adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")).body
+
+def rows_path(db, page_rows, n) -> bytes:
+    return RowsJSONResponse(page_rows(db, n).items).body
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db = SessionLocal()  # fresh identity map, as in a request
+        try:
+            start = time.perf_counter()
+            body = fn(db)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            db.close()
+    return best * 1000, body
+
+def main(args):
+    Base.metadata.create_all(bind=engine)
+    n = args.rows
+    seed_scale({"rooms": n, "tenants": n, "contracts": n, "payments": n})
+    print(f"{'entity':<10} {'pydantic ms':>12} {'rows ms':>9} {'speedup':>8} {'bytes':>10}")
+    for name, (schema, page, page_rows) in ENTITIES.items():
+        slow, slow_body = timed(lambda db: pydantic_path(db, schema, page, n), args.repeat)
+        fast, fast_body = timed(lambda db: rows_path(db, page_rows, n), args.repeat)
+        assert json.loads(slow_body) == json.loads(fast_body), f"{name}: outputs differ"
+        print(f"{name:<10} {slow:>12.1f} {fast:>9.1f} {slow / fast:>7.1f}x {len(fast_body):>10,}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+"""Login-storm benchmark: latency of a non-auth route while logins hammer bcrypt.
+
+Runs the app in-process over ASGI against a throwaway SQLite database and
+reports p50/p99 of `GET /rooms/` with and without a concurrent login storm.
+
+    python benchmarks/login_storm.py [--logins 200] [--concurrency 32] [--inline]
+
+`--inline` runs bcrypt in the request threadpool the way the routes used to,
+for a before/after comparison.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+os.chdir(project_root)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models import Room
+from app.schemas.user import UserCreate
+from app.core.security import create_access_token
+import app.services.users as users_svc
+
+USERNAME, PASSWORD = "bench", "bench-password"
+
+def setup() -> str:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = users_svc.get_user_by_username(db, USERNAME) or users_svc.create_user(db, UserCreate(username=USERNAME, password=PASSWORD))
+        if not db.query(Room).first():
+            db.add_all([Room(number=str(100 + i)) for i in range(20)])
+            db.commit()
+        return create_access_token(subject=user.id, claims=users_svc.token_claims(user))
+    finally:
+        db.close()
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def probe(client, token, n):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        res = await client.get("/rooms/", cookies={"access_token": token})
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert res.status_code == 200, res.status_code
+    return latencies
+
+async def storm(client, logins, concurrency, outcomes):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            res = await client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD})
+            outcomes[res.status_code] = outcomes.get(res.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(logins)))
+
+async def main(args):
+    token = setup()
+    if args.inline:
+        async def authenticate_inline(db, username, password):
+            return await run_in_threadpool(users_svc.authenticate_user, db, username, password)
+        users_svc.authenticate_user_async = authenticate_inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await probe(client, token, 20)  # warm up
+        idle = await probe(client, token, args.probes)
+
+        outcomes = {}
+        storm_task = asyncio.ensure_future(storm(client, args.logins, args.concurrency, outcomes))
+        loaded = await probe(client, token, args.probes)
+        await storm_task
+
+    mode = "inline (threadpool bcrypt)" if args.inline else "hash pool"
+    print(f"mode: {mode}")
+    print(f"idle   GET /rooms/  p50={percentile(idle, 50):7.2f}ms  p99={percentile(idle, 99):7.2f}ms")
+    print(f"storm  GET /rooms/  p50={percentile(loaded, 50):7.2f}ms  p99={percentile(loaded, 99):7.2f}ms")
+    print(f"logins: {dict(sorted(outcomes.items()))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--inline", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# ensure project root is on sys.path so "import app" works when running the script directly
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+from datetime import date
+
+from app.db.session import SessionLocal
+import app.services.invoices as invoices_svc
+
+def generate(period: date) -> int:
+    session = SessionLocal()
+    try:
+        run = invoices_svc.generate_invoices(session, period)
+        print(f"{run['period']:%Y-%m}: created {run['created']} invoice(s); {run['invoices']} in total, {run['total_amount']} billed.")
+        return 0
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the month's rent invoices for all active contracts (safe to re-run).")
+    parser.add_argument("--period", type=invoices_svc.parse_period, default=date.today().replace(day=1), help="month to bill, YYYY-MM (default: current month)")
+    sys.exit(generate(parser.parse_args().period))
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# ensure project root is on sys.path so "import app" works when running the script directly
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import time
+
+from app.db.session import SessionLocal
+import app.services.imports as imports_svc
+
+IMPORTERS = {"tenants": imports_svc.import_tenants, "rooms": imports_svc.import_rooms}
+
+def run(kind: str, path: str, fmt: str | None, batch_size: int | None, max_errors: int) -> int:
+    fmt = imports_svc.detect_format(path, fmt)
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as stream:
+            report = IMPORTERS[kind](session, stream, fmt, batch_size)
+    finally:
+        session.close()
+    elapsed = time.perf_counter() - started
+    print(f"{kind}: {report.inserted}/{report.total} rows inserted, {report.failed} failed in {elapsed:.2f}s")
+    for err in report.errors[:max_errors]:
+        print(f"  row {err.row}: {err.error}")
+    if report.failed > max_errors:
+        print(f"  ... {report.failed - max_errors} more")
+    return 1 if report.failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import tenants or rooms from CSV / JSONL.")
+    parser.add_argument("kind", choices=sorted(IMPORTERS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, help="rows per transaction (default IMPORT_BATCH_SIZE)")
+    parser.add_argument("--max-errors", type=int, default=20, help="row errors to print")
+    args = parser.parse_args()
+    sys.exit(run(args.kind, args.path, args.format, args.batch_size, args.max_errors))
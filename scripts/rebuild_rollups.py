@@ -0,0 +1,25 @@
+import os
+import sys
+
+# ensure project root is on sys.path so "import app" works when running the script directly
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+
+from app.db.session import SessionLocal
+import app.services.rollups as rollups_svc
+
+def rebuild() -> int:
+    session = SessionLocal()
+    try:
+        counts = rollups_svc.rebuild(session)
+        print(f"Rebuilt {counts['payment_daily_totals']} payment day row(s) and {counts['room_occupancy_monthly']} occupancy row(s).")
+        return 0
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Recompute the reporting rollup tables from payments and contracts.").parse_args()
+    sys.exit(rebuild())
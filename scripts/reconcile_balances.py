@@ -0,0 +1,33 @@
+import os
+import sys
+
+# ensure project root is on sys.path so "import app" works when running the script directly
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+
+from app.db.session import SessionLocal
+import app.services.payments as payments_svc
+
+def reconcile(fix: bool = False) -> int:
+    session = SessionLocal()
+    try:
+        mismatches = payments_svc.reconcile_contract_balances(session, fix=fix)
+        for m in mismatches:
+            print(f"contract {m['id']}: stored={m['stored']} ledger={m['expected']}")
+        if not mismatches:
+            print("All contract balances match the payments ledger.")
+        elif fix:
+            print(f"Fixed {len(mismatches)} contract(s).")
+        else:
+            print(f"{len(mismatches)} contract(s) out of sync; re-run with --fix to repair.")
+        return 1 if mismatches and not fix else 0
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check contract running balances against the payments ledger.")
+    parser.add_argument("--fix", action="store_true", help="overwrite stored totals with the ledger values")
+    sys.exit(reconcile(parser.parse_args().fix))
@@ -6,12 +6,22 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+import argparse
+import csv
+import io
+import json
+import random
+import time
 from decimal import Decimal
-from datetime import date, datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, text
 
 from app.db.session import SessionLocal, engine, Base
 from app.models import Tenant, Room, Contract, Payment
+import app.services.rollups as rollups_svc
+import app.services.rooms as rooms_svc
 
 # Optional: create tables if you didn't run migrations (safe in dev)
 # Base.metadata.create_all(bind=engine)
@@ -100,5 +110,195 @@ def seed():
     finally:
         session.close()
 
+# -- synthetic bulk data (--scale) --
+
+PROFILES = {
+    "small": {"rooms": 50, "tenants": 2_000, "contracts": 5_000, "payments": 50_000},
+    "medium": {"rooms": 300, "tenants": 20_000, "contracts": 40_000, "payments": 800_000},
+    "large": {"rooms": 1_000, "tenants": 100_000, "contracts": 200_000, "payments": 5_000_000},
+}
+# contract histories run from HISTORY_START to HISTORY_END; fixed so a seed always yields the same rows
+HISTORY_START, HISTORY_END = date(2016, 1, 1), date(2025, 12, 31)
+
+FIRST_NAMES = ["Abebe", "Almaz", "Dawit", "Hana", "Kebede", "Liya", "Meron", "Samuel", "Selam", "Tesfaye",
+               "Alice", "Bob", "Carlos", "Fatima", "Ivan", "Maria", "Omar", "Priya", "Wei", "Yara"]
+LAST_NAMES = ["Alemu", "Bekele", "Desta", "Girma", "Haile", "Kassa", "Mekonnen", "Tadesse", "Wolde", "Yohannes",
+              "Garcia", "Ivanova", "Khan", "Nguyen", "Okafor", "Rossi", "Schmidt", "Smith", "Tanaka", "Silva"]
+CITIES = ["Addis Ababa", "Adama", "Bahir Dar", "Dire Dawa", "Gondar", "Hawassa", "Jimma", "Mekelle"]
+TAGS = ["quiet", "sunny", "garden-view", "street-view", "renovated", "corner", "top-floor"]
+AMENITIES = ["wifi", "desk", "wardrobe", "fridge", "balcony", "kitchenette", "heater"]
+METHODS = ["cash", "bank", "card", "mobile"]
+
+class BulkWriter:
+    """Buffers rows per table and writes them in batches.
+
+    Postgres on psycopg2 uses COPY; everything else uses executemany Core
+    inserts. Flushing a table (by hand or when its buffer fills) flushes the
+    buffered rows of the tables it references first, so foreign keys hold.
+    """
+
+    def __init__(self, session, batch_size: int):
+        self.session = session
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[dict]] = {}
+        self.models: Dict[str, type] = {}
+        self.counts: Dict[str, int] = {}
+        self.copy = session.get_bind().dialect.name == "postgresql" and hasattr(session.connection().connection.dbapi_connection.cursor(), "copy_expert")
+
+    def add(self, model, row: dict) -> None:
+        self.models[model.__tablename__] = model
+        rows = self.buffers.setdefault(model.__tablename__, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model) -> None:
+        for fk in model.__table__.foreign_keys:
+            parent = fk.column.table.name
+            if parent != model.__tablename__ and self.buffers.get(parent):
+                self.flush(self.models[parent])
+        rows = self.buffers.pop(model.__tablename__, [])
+        if not rows:
+            return
+        if self.copy:
+            self._copy(model.__table__, rows)
+        else:
+            self.session.execute(insert(model), rows)
+        self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+
+    def _copy(self, table, rows: List[dict]) -> None:
+        columns = list(rows[0])
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([_copy_value(row[c]) for c in columns])
+        buf.seek(0)
+        cols = ", ".join(table.c[c].name for c in columns)
+        cursor = self.session.connection().connection.dbapi_connection.cursor()
+        cursor.copy_expert(f"COPY {table.name} ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+
+def _copy_value(value):
+    # unquoted empty fields are NULL in COPY's csv format
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def _next_id(session, model) -> int:
+    return (session.query(func.max(model.id)).scalar() or 0) + 1
+
+def _reset_sequences(session, models) -> None:
+    # rows were written with explicit ids; move Postgres sequences past them
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        session.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+
+def _spread(total: int, parts: int) -> List[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+def seed_scale(profile: dict, seed_value: int = 42, batch_size: int = 10_000) -> None:
+    """Bulk-load a deterministic synthetic dataset of the given size.
+
+    Every room gets a back-to-back history of non-overlapping contracts over
+    HISTORY_START..HISTORY_END (the last one open-ended for most rooms), each
+    with payments spread across its term. Contract running balances are
+    written with the rows; the reporting rollups are rebuilt at the end.
+    """
+    rng = random.Random(seed_value)
+    window = (HISTORY_END - HISTORY_START).days + 1
+    per_room = _spread(profile["contracts"], profile["rooms"])
+    if window // max(per_room) < 2:
+        raise SystemExit(f"{max(per_room)} contracts per room do not fit in {window} days of history")
+
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        writer = BulkWriter(session, batch_size)
+        tenant_base, room_base, contract_base, payment_base = (_next_id(session, m) for m in (Tenant, Room, Contract, Payment))
+        created = datetime.combine(HISTORY_START, datetime.min.time())
+
+        print(f"Seeding {profile['tenants']:,} tenants...")
+        for i in range(profile["tenants"]):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            tenant_id = tenant_base + i
+            writer.add(Tenant, {
+                "id": tenant_id, "name": f"{first} {last}", "email": f"{first}.{last}.{tenant_id}@example.com".lower(),
+                "phone": f"+2519{rng.randrange(10**8):08d}", "city": rng.choice(CITIES), "country": "Ethiopia",
+                "id_type": "national_id", "id_number": f"ID{tenant_id:08d}", "is_active": True, "created_at": created,
+            })
+        writer.flush(Tenant)
+
+        print(f"Seeding {profile['rooms']:,} rooms...")
+        labels = []
+        for i in range(profile["rooms"]):
+            floor = i // 50 + 1
+            tags, amenities = rng.sample(TAGS, rng.randint(0, 3)), rng.sample(AMENITIES, rng.randint(1, 4))
+            writer.add(Room, {
+                "id": room_base + i, "number": f"{floor}{i % 50 + 1:02d}", "floor": str(floor), "capacity": rng.choice((1, 1, 1, 2)),
+                "active": True, "available": True, "price": Decimal(rng.randrange(300, 1500, 25)), "bed_count": 1,
+                "has_ac": rng.random() < 0.3, "private_bath": rng.random() < 0.5, "accessible": rng.random() < 0.1,
+                "tags": tags, "amenities": amenities, "created_at": created,
+            })
+            labels.append((room_base + i, tags, amenities))
+        writer.flush(Room)
+        rooms_svc.sync_labels(session, labels)
+
+        print(f"Seeding {profile['contracts']:,} contracts and {profile['payments']:,} payments...")
+        payments_per_contract = _spread(profile["payments"], profile["contracts"])
+        contract_id, payment_id = contract_base, payment_base
+        for room_offset, count in enumerate(per_room):
+            slot = window // count
+            for j in range(count):
+                start = HISTORY_START + timedelta(days=j * slot + rng.randint(0, slot // 6))
+                open_ended = j == count - 1 and rng.random() < 0.85
+                end = None if open_ended else HISTORY_START + timedelta(days=(j + 1) * slot - 1)
+                rent = Decimal(rng.randrange(300, 1500, 25))
+                term = ((end or HISTORY_END) - start).days + 1
+                n = payments_per_contract[contract_id - contract_base]
+                total, last_paid, payments = Decimal("0"), None, []
+                for k in range(n):
+                    paid_at = datetime.combine(start + timedelta(days=term * k // n), datetime.min.time()) + timedelta(minutes=rng.randrange(8 * 60, 20 * 60))
+                    amount = rent if rng.random() < 0.9 else (rent / 2).quantize(Decimal("0.01"))
+                    payments.append({"id": payment_id, "contract_id": contract_id, "amount": amount, "paid_at": paid_at, "method": rng.choice(METHODS), "updated_at": paid_at})
+                    total, last_paid, payment_id = total + amount, paid_at, payment_id + 1
+                # the contract is buffered before its payments; flushing payments flushes contracts first
+                writer.add(Contract, {
+                    "id": contract_id, "tenant_id": tenant_base + rng.randrange(profile["tenants"]), "room_id": room_base + room_offset,
+                    "start_date": start, "end_date": end, "rent_amount": rent, "active": True,
+                    "total_paid": total, "payment_count": n, "last_paid_at": last_paid,
+                    "updated_at": last_paid or datetime.combine(start, datetime.min.time()),
+                })
+                for row in payments:
+                    writer.add(Payment, row)
+                contract_id += 1
+        writer.flush(Contract)
+        writer.flush(Payment)
+        _reset_sequences(session, (Tenant, Room, Contract, Payment))
+        session.commit()
+        loaded = time.perf_counter() - started
+
+        print("Rebuilding reporting rollups...")
+        rollups_svc.rebuild(session)
+        counts = ", ".join(f"{n:,} {table}" for table, n in writer.counts.items())
+        print(f"Loaded {counts} in {loaded:.1f}s (rollups {time.perf_counter() - started - loaded:.1f}s).")
+        print("Run scripts/generate_invoices.py --period YYYY-MM to bill a month.")
+    finally:
+        session.close()
+
 if __name__ == "__main__":
-    seed()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed demo data, or bulk-load a synthetic dataset with --scale.")
+    parser.add_argument("--scale", choices=sorted(PROFILES), help="bulk-load a synthetic dataset of this size instead of the demo rows")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed and scale give the same rows (default: 42)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows per insert / COPY batch (default: 10000)")
+    for key in ("rooms", "tenants", "contracts", "payments"):
+        parser.add_argument(f"--{key}", type=int, help=f"override the profile's number of {key}")
+    args = parser.parse_args()
+    if args.scale:
+        profile = {k: getattr(args, k) or v for k, v in PROFILES[args.scale].items()}
+        seed_scale(profile, args.seed, args.batch_size)
+    else:
+        seed()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base, async_database_url
+from app.services.rooms import create_room_async, get_room_async, page_rooms_async, update_room_async, delete_room_async
+from app.schemas.room import RoomCreate
+
+def test_async_database_url():
+    assert async_database_url("postgresql://u:p@db/sbms") == "postgresql+asyncpg://u:p@db/sbms"
+    assert async_database_url("postgresql+psycopg2://u:p@db/sbms") == "postgresql+asyncpg://u:p@db/sbms"
+    assert async_database_url("sqlite:///./sbms.db") == "sqlite+aiosqlite:///./sbms.db"
+
+async def _crud(db):
+    room = await create_room_async(db, RoomCreate(number="401", amenities=["wifi"]))
+    assert room.id is not None
+    room = await update_room_async(db, room, capacity=2)
+    assert room.capacity == 2
+    page = await page_rooms_async(db, 10)
+    assert [r.number for r in page.items] == ["401"]
+    await delete_room_async(db, room)
+    assert await get_room_async(db, room.id) is None
+
+def test_async_services_with_sync_session():
+    # the threadpool fallback touches the session from worker threads
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        asyncio.run(_crud(db))
+    finally:
+        db.close()
+
+def test_async_services_with_async_session():
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            await _crud(db)
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Contract, Room, Tenant
+from app.services.availability import available_rooms, calendar, interval_index
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _contract(db, tenant, room, start, end=None, active=True):
+    db.add(Contract(tenant_id=tenant.id, room_id=room.id, start_date=start, end_date=end, rent_amount=Decimal("500.00"), active=active))
+
+def test_available_rooms_matches_interval_index(session):
+    t = Tenant(name="T")
+    rooms = [Room(number=str(100 + i), capacity=1 + i % 3) for i in range(5)]
+    off = Room(number="999", available=False)
+    session.add_all([t, off, *rooms])
+    session.flush()
+    # 100: long history ending before the window; 101: overlaps the end of it
+    for year in range(2015, 2024):
+        _contract(session, t, rooms[0], date(year, 1, 1), date(year, 12, 31))
+    _contract(session, t, rooms[1], date(2024, 8, 31), date(2024, 12, 31))
+    # 102: open-ended; 103: overlapping but inactive; 104: free
+    _contract(session, t, rooms[2], date(2020, 1, 1))
+    _contract(session, t, rooms[3], date(2024, 7, 1), date(2024, 7, 31), active=False)
+    session.commit()
+
+    start, end = date(2024, 6, 1), date(2024, 8, 31)
+    free = [r.number for r in available_rooms(session, start, end)]
+    assert free == ["100", "103", "104"]
+    assert [r.number for r in available_rooms(session, start, end, capacity=2)] == ["104"]
+
+    index = interval_index(session, start, end)
+    assert [r.number for r in rooms if index.is_free(r.id, start, end)] == free
+    assert index.is_free(rooms[1].id, start, end - timedelta(days=1))
+
+def test_calendar_cache_follows_contract_changes(session):
+    t, r = Tenant(name="T"), Room(number="1")
+    session.add_all([t, r])
+    session.commit()
+    start, end = date(2025, 1, 1), date(2025, 12, 31)
+    assert calendar(session, start, end)[0]["free"]
+
+    _contract(session, t, r, date(2024, 12, 1), date(2025, 1, 31))
+    session.commit()
+    row = calendar(session, start, end)[0]
+    assert not row["free"]
+    assert row["bars"][0]["start"] == start and row["bars"][0]["left"] == 0
+    assert round(row["bars"][0]["width"], 2) == round(31 * 100 / 365, 2)
@@ -0,0 +1,128 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Contract, Payment, Room, RoomLabel, Tenant, User
+from app.routes.auth import require_user_ui
+
+@pytest.fixture
+def env():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    # same session settings as app.db.session.SessionLocal
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    db.add_all([Tenant(name="Alice"), Tenant(name="Bob"), Room(number="101"), Room(number="102")])
+    db.flush()
+    db.add(Contract(tenant_id=1, room_id=1, start_date=date(2025, 1, 1), rent_amount=Decimal("500")))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield engine, SessionLocal, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def test_atomic_tenants_batch_commits_once(env):
+    engine, SessionLocal, client = env
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    res = client.post("/tenants/batch", json={"ops": [
+        {"op": "create", "data": {"name": "Carol"}},
+        {"op": "update", "id": 1, "data": {"phone": "555-1"}},
+        {"op": "create", "data": {"name": "Dan", "email": "dan@example.com"}},
+        {"op": "delete", "id": 2},
+    ]})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert (body["committed"], body["succeeded"], body["failed"]) == (True, 4, 0)
+    assert [r["id"] for r in body["results"]] == [3, 1, 4, 2]
+    assert len(commits) == 1
+
+    db = SessionLocal()
+    assert [(t.id, t.name, t.phone) for t in db.query(Tenant).order_by(Tenant.id)] == [(1, "Alice", "555-1"), (3, "Carol", None), (4, "Dan", None)]
+
+def test_atomic_batch_with_an_invalid_op_writes_nothing(env):
+    _, SessionLocal, client = env
+    res = client.post("/tenants/batch", json={"ops": [
+        {"op": "create", "data": {"name": "Carol"}},
+        {"op": "update", "id": 1, "data": {"email": "not-an-email"}},
+        {"op": "delete", "id": 99},
+    ]})
+    assert res.status_code == 400
+    body = res.json()
+    assert (body["committed"], body["succeeded"], body["failed"]) == (False, 0, 2)
+    assert body["results"][0]["error"] is None
+    assert body["results"][1]["error"].startswith("email:")
+    assert body["results"][2]["error"] == "Tenant 99 not found"
+    assert SessionLocal().query(Tenant).count() == 2
+
+def test_atomic_contracts_batch_rolls_back_on_overlap_within_the_batch(env):
+    _, SessionLocal, client = env
+    res = client.post("/contracts/batch", json={"ops": [
+        {"op": "create", "data": {"tenant_id": 2, "room_id": 2, "start_date": "2025-01-01", "end_date": "2025-06-30", "rent_amount": "400"}},
+        {"op": "create", "data": {"tenant_id": 1, "room_id": 2, "start_date": "2025-06-01", "rent_amount": "400"}},
+    ]})
+    assert res.status_code == 400
+    results = res.json()["results"]
+    assert results[0]["ok"] is False and results[0]["error"] is None
+    assert "overlaps" in results[1]["error"]
+    assert SessionLocal().query(Contract).count() == 1
+
+def test_best_effort_payments_batch_keeps_the_ops_that_succeed(env):
+    _, SessionLocal, client = env
+    res = client.post("/payments/batch", json={"mode": "best_effort", "ops": [
+        {"op": "create", "data": {"contract_id": 1, "amount": "200", "method": "cash"}},
+        {"op": "create", "data": {"contract_id": 42, "amount": "200"}},
+        {"op": "create", "data": {"contract_id": 1, "amount": "50"}},
+        {"op": "update", "id": 1, "data": {"amount": "1"}},
+    ]})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert (body["committed"], body["succeeded"], body["failed"]) == (True, 2, 2)
+    assert [r["ok"] for r in body["results"]] == [True, False, True, False]
+    assert body["results"][1]["error"] == "Contract not found"
+    assert body["results"][3]["error"] == "payments cannot be updated"
+
+    db = SessionLocal()
+    contract = db.get(Contract, 1)
+    assert (contract.total_paid, contract.payment_count) == (Decimal("250"), 2)
+    assert db.query(Payment).count() == 2
+
+def test_best_effort_rooms_batch_syncs_labels(env):
+    _, SessionLocal, client = env
+    res = client.post("/rooms/batch", json={"mode": "best_effort", "ops": [
+        {"op": "create", "data": {"number": "201", "tags": ["Quiet"], "amenities": ["wifi"]}},
+        {"op": "create", "data": {"capacity": 2}},
+        {"op": "update", "id": 2, "data": {"tags": ["sunny"]}},
+    ]})
+    body = res.json()
+    assert [r["ok"] for r in body["results"]] == [True, False, True]
+    assert body["results"][1]["error"].startswith("number:")
+
+    db = SessionLocal()
+    labels = db.query(RoomLabel.room_id, RoomLabel.kind, RoomLabel.value).order_by(RoomLabel.room_id, RoomLabel.kind).all()
+    assert labels == [(2, "tag", "sunny"), (3, "amenity", "wifi"), (3, "tag", "quiet")]
+
+def test_batch_size_is_capped(env, monkeypatch):
+    _, _, client = env
+    monkeypatch.setattr(settings, "BATCH_MAX_OPS", 2)
+    res = client.post("/rooms/batch", json={"ops": [{"op": "delete", "id": 1}] * 3})
+    assert res.status_code == 400
+    assert "At most 2 ops" in res.json()["detail"]
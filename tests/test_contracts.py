@@ -1,10 +1,10 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import Base
-from app.models import Tenant, Room
-from app.services.contracts import create_contract
+from app.models import Contract, RoomOccupancyMonthly, Tenant, Room
+from app.services.contracts import create_contract, update_contract
 from app.schemas.contract import ContractCreate
 from decimal import Decimal
 from datetime import date
@@ -59,4 +59,37 @@ def test_create_and_detect_overlap(session):
         rent_amount=Decimal("1200.00")
     )
     c2 = create_contract(session, payload2)
-    assert c2.id is not None
\ No newline at end of file
+    assert c2.id is not None
+
+def test_update_rechecks_overlap(session):
+    t = Tenant(name="Frank")
+    r = Room(number="102")
+    session.add_all([t, r])
+    session.commit()
+
+    c1 = create_contract(session, ContractCreate(tenant_id=t.id, room_id=r.id, start_date=date(2025,1,1), end_date=date(2025,6,30), rent_amount=Decimal("900.00")))
+    c2 = create_contract(session, ContractCreate(tenant_id=t.id, room_id=r.id, start_date=date(2025,7,1), end_date=None, rent_amount=Decimal("950.00")))
+
+    with pytest.raises(ValueError):
+        update_contract(session, c1, end_date=date(2025,7,15))
+
+    # inactive contracts don't block, and a contract never overlaps itself
+    update_contract(session, c2, active=False)
+    updated = update_contract(session, c1, end_date=date(2025,7,15))
+    assert updated.end_date == date(2025,7,15)
+
+def test_exclusion_violation_is_a_value_error(session):
+    t = Tenant(name="Gina")
+    r = Room(number="103")
+    session.add_all([t, r])
+    session.commit()
+    # stands in for the Postgres contracts_no_overlap constraint rejecting a racing insert
+    session.execute(text("CREATE TEMP TRIGGER no_overlap BEFORE INSERT ON contracts BEGIN SELECT RAISE(ABORT, 'contracts_no_overlap'); END"))
+    session.commit()
+
+    payload = ContractCreate(tenant_id=t.id, room_id=r.id, start_date=date(2025,1,1), end_date=date(2025,3,31), rent_amount=Decimal("900.00"))
+    with pytest.raises(ValueError, match="overlaps"):
+        create_contract(session, payload)
+    # rolled back, nothing half-written, and the session is usable
+    assert session.query(Contract).count() == 0
+    assert session.query(RoomOccupancyMonthly).count() == 0
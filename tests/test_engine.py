@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, text
+
+from app.db.pool import TimedQueuePool, pool_status
+from app.db.session import connect_args, engine_options
+
+def test_connect_args_per_dialect(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    assert connect_args("postgresql://u:p@db/sbms")["options"] == "-c statement_timeout=5000"
+    assert connect_args("postgresql+asyncpg://u:p@db/sbms")["server_settings"] == {"statement_timeout": "5000"}
+    assert connect_args("sqlite:///./sbms.db")["check_same_thread"] is False
+
+    assert "pool_size" not in engine_options("sqlite://")
+    assert engine_options("postgresql://u:p@db/sbms")["pool_size"] == settings.DB_POOL_SIZE
+
+def test_timed_pool_reports_occupancy(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=TimedQueuePool, pool_size=2, max_overflow=0)
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+        assert status["size"] == 2
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+    engine.dispose()
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Contract, Payment, Room, Tenant
+from app.services import exports
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    t = Tenant(name="Ann")
+    r1, r2 = Room(number="101"), Room(number="102")
+    db.add_all([t, r1, r2])
+    db.flush()
+    c1 = Contract(tenant_id=t.id, room_id=r1.id, start_date=date(2025, 1, 1), end_date=date(2025, 6, 30), rent_amount=Decimal("500.00"))
+    c2 = Contract(tenant_id=t.id, room_id=r2.id, start_date=date(2025, 7, 1), rent_amount=Decimal("650.00"))
+    db.add_all([c1, c2])
+    db.flush()
+    for day in (5, 15, 25):
+        db.add(Payment(contract_id=c1.id, amount=Decimal("100.00"), paid_at=datetime(2025, 3, day, 12)))
+    db.add(Payment(contract_id=c2.id, amount=Decimal("650.00"), paid_at=datetime(2025, 7, 2)))
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def test_export_payments_csv_filters_by_date_and_contract(session, monkeypatch):
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 1)
+    chunks = list(exports.export_payments(session, "csv", start=date(2025, 3, 5), end=date(2025, 3, 15), contract_id=1))
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["id", "contract_id", "amount", "paid_at", "method", "note"]
+    assert [r[3] for r in rows[1:]] == ["2025-03-05 12:00:00", "2025-03-15 12:00:00"]
+    assert len(chunks) == 3  # header + one chunk per streamed batch
+
+def test_export_contracts_ndjson_overlapping_range(session):
+    lines = "".join(exports.export_contracts(session, "ndjson", start=date(2025, 8, 1))).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["room_id"] for r in records] == [2]
+    assert records[0]["rent_amount"] == "650.00"
+    assert records[0]["end_date"] is None
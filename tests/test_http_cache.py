@@ -0,0 +1,99 @@
+import pytest
+from decimal import Decimal
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import User
+from app.routes.auth import require_user_ui
+
+@pytest.fixture
+def env():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield statements, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def test_detail_etag_and_304(env):
+    statements, client = env
+    tenant = client.post("/tenants/", json={"name": "Ann"}).json()
+
+    res = client.get(f"/tenants/{tenant['id']}")
+    etag = res.headers["etag"]
+    assert res.status_code == 200 and "last-modified" in res.headers
+
+    statements.clear()
+    res = client.get(f"/tenants/{tenant['id']}", headers={"If-None-Match": etag})
+    assert res.status_code == 304 and res.content == b""
+    assert len(statements) == 1  # only the updated_at probe, no row load
+
+    client.put(f"/tenants/{tenant['id']}", json={"name": "Anna"})
+    res = client.get(f"/tenants/{tenant['id']}", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and res.json()["name"] == "Anna"
+    assert res.headers["etag"] != etag
+
+    assert client.get("/tenants/999", headers={"If-None-Match": etag}).status_code == 404
+
+def test_list_etag_changes_on_insert_update_delete(env):
+    statements, client = env
+    room = client.post("/rooms/", json={"number": "101"}).json()
+    client.post("/rooms/", json={"number": "102"})
+
+    etag = client.get("/rooms/").headers["etag"]
+    assert client.get("/rooms/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/rooms/{room['id']}", json={"floor": "1"})
+    updated = client.get("/rooms/", headers={"If-None-Match": etag})
+    assert updated.status_code == 200 and updated.headers["etag"] != etag
+
+    client.delete(f"/rooms/{room['id']}")
+    deleted = client.get("/rooms/", headers={"If-None-Match": updated.headers["etag"]})
+    assert deleted.status_code == 200 and len(deleted.json()) == 1
+
+def test_list_ignores_if_modified_since_after_delete(env):
+    statements, client = env
+    room = client.post("/rooms/", json={"number": "101"}).json()
+    client.post("/rooms/", json={"number": "102"})
+
+    res = client.get("/rooms/")
+    assert "last-modified" not in res.headers
+    # a delete leaves max(updated_at) where it was; IMS must not yield a stale 304
+    client.delete(f"/rooms/{room['id']}")
+    res = client.get("/rooms/", headers={"If-Modified-Since": "Fri, 31 Dec 2999 23:59:59 GMT"})
+    assert res.status_code == 200 and len(res.json()) == 1
+
+def test_payment_bumps_contract_etag(env):
+    statements, client = env
+    tenant = client.post("/tenants/", json={"name": "Ann"}).json()
+    room = client.post("/rooms/", json={"number": "101"}).json()
+    contract = client.post("/contracts/", json={
+        "tenant_id": tenant["id"], "room_id": room["id"], "start_date": str(date(2025, 1, 1)), "rent_amount": "500.00",
+    }).json()
+
+    res = client.get(f"/contracts/{contract['id']}")
+    etag, last_modified = res.headers["etag"], res.headers["last-modified"]
+    assert client.get(f"/contracts/{contract['id']}", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    client.post("/payments/", json={"contract_id": contract["id"], "amount": str(Decimal("100.00"))})
+    res = client.get(f"/contracts/{contract['id']}", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and res.json()["total_paid"] == "100.00"
@@ -0,0 +1,63 @@
+import io
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Room, RoomLabel, Tenant
+from app.services.imports import detect_format, import_rooms, import_tenants
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def test_import_tenants_csv_reports_bad_rows(session):
+    data = (
+        "name,email,phone,is_active,metadata\n"
+        "Gina,gina@example.com,555-1,true,\n"
+        ",nobody@example.com,,,\n"
+        "Hank,not-an-email,,,\n"
+        'Ivy,,555-3,false,"{""floor"": 2}"\n'
+    )
+    report = import_tenants(session, io.BytesIO(data.encode()), "csv", batch_size=2)
+    assert (report.total, report.inserted, report.failed) == (4, 2, 2)
+    assert [e.row for e in report.errors] == [2, 3]
+
+    ivy = session.query(Tenant).filter_by(name="Ivy").one()
+    assert ivy.is_active is False
+    assert ivy.metadata_json == {"floor": 2}
+
+def test_import_rooms_jsonl(session):
+    data = (
+        '{"number": "501", "floor": "5", "amenities": ["wifi"], "price": "120.00"}\n'
+        "\n"
+        "{not json}\n"
+        '{"number": "502", "capacity": 2}\n'
+    )
+    report = import_rooms(session, io.BytesIO(data.encode()), detect_format("rooms.ndjson"))
+    assert (report.total, report.inserted, report.failed) == (3, 2, 1)
+    assert report.errors[0].row == 2
+    assert session.query(Room).filter_by(number="501").one().amenities == ["wifi"]
+    assert session.query(RoomLabel.value).filter_by(kind="amenity").all() == [("wifi",)]
+
+    with pytest.raises(ValueError):
+        detect_format("rooms.xlsx")
+
+@pytest.mark.parametrize("fmt,data,error", [
+    ("csv", b"name\n" + b"Gina\n" * 3000 + b"H\xe9ctor\n", "not valid UTF-8"),
+    ("jsonl", b'{"name": "Gina"}\n' * 1000 + b'{"name": "H\xe9ctor"}\n', "not valid UTF-8"),
+    ("csv", b"name\n" + b"Gina\n" * 3000 + b'"' + b"x" * 200_000 + b'"\n', "malformed CSV"),
+])
+def test_import_reports_unreadable_input(session, fmt, data, error):
+    report = import_tenants(session, io.BytesIO(data), fmt)
+    # the rows read before the bad bytes are kept, the rest become one error
+    assert report.inserted > 0 and report.failed == 1
+    assert report.total == report.errors[0].row == report.inserted + 1
+    assert report.errors[0].error.startswith(error)
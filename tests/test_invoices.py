@@ -0,0 +1,93 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Contract, Invoice, Room, Tenant
+from app.schemas.payment import PaymentCreate
+from app.services.contracts import delete_contract
+from app.services.invoices import generate_invoices, parse_period
+from app.services.payments import create_payment, delete_payment
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _contract(db, number, start, end=None, active=True):
+    t, r = Tenant(name=f"T{number}"), Room(number=number)
+    db.add_all([t, r])
+    db.flush()
+    c = Contract(tenant_id=t.id, room_id=r.id, start_date=start, end_date=end, rent_amount=Decimal("500.00"), active=active)
+    db.add(c)
+    db.commit()
+    return c
+
+def _statuses(db, contract):
+    return [(i.period.month, i.amount_paid, i.status) for i in db.query(Invoice).filter_by(contract_id=contract.id).order_by(Invoice.period)]
+
+def test_generate_invoices_is_idempotent(session):
+    running = _contract(session, "1", date(2025, 1, 1))
+    mid_month = _contract(session, "2", date(2025, 3, 10))
+    _contract(session, "3", date(2024, 1, 1), end=date(2025, 2, 28))
+    _contract(session, "4", date(2025, 1, 1), active=False)
+    _contract(session, "5", date(2025, 4, 1))
+
+    run = generate_invoices(session, parse_period("2025-03"))
+    assert (run["created"], run["invoices"], run["total_amount"]) == (2, 2, Decimal("1000.00"))
+    assert generate_invoices(session, date(2025, 3, 17))["created"] == 0
+
+    due = dict(session.query(Invoice.contract_id, Invoice.due_date).all())
+    assert due == {running.id: date(2025, 3, 1), mid_month.id: date(2025, 3, 10)}
+
+def test_generate_invoices_skips_rows_a_concurrent_run_inserted(session):
+    first = _contract(session, "1", date(2025, 1, 1))
+    second = _contract(session, "2", date(2025, 1, 1))
+    # another run inserts the first contract's invoice after our anti-join has passed it
+    session.execute(text(
+        f"CREATE TEMP TRIGGER concurrent_run BEFORE INSERT ON invoices WHEN NEW.contract_id = {first.id} BEGIN "
+        "INSERT OR IGNORE INTO invoices (contract_id, period, due_date, amount) "
+        "VALUES (NEW.contract_id, NEW.period, NEW.due_date, NEW.amount); END"
+    ))
+
+    run = generate_invoices(session, date(2025, 3, 1))
+    assert (run["created"], run["invoices"]) == (1, 2)
+    assert sorted(c for (c,) in session.query(Invoice.contract_id)) == [first.id, second.id]
+
+def test_deleting_a_contract_deletes_its_invoices(session):
+    gone = _contract(session, "1", date(2025, 1, 1))
+    kept = _contract(session, "2", date(2025, 1, 1))
+    generate_invoices(session, date(2025, 1, 1))
+    generate_invoices(session, date(2025, 2, 1))
+
+    delete_contract(session, gone)
+    assert [c for (c,) in session.query(Invoice.contract_id)] == [kept.id, kept.id]
+
+def test_payments_are_allocated_oldest_first(session):
+    c = _contract(session, "1", date(2025, 1, 1))
+    create_payment(session, PaymentCreate(contract_id=c.id, amount=Decimal("700.00")))
+    for period in ("2025-01", "2025-02", "2025-03"):
+        generate_invoices(session, parse_period(period))
+    session.expire_all()
+    assert _statuses(session, c) == [(1, Decimal("500.00"), "paid"), (2, Decimal("200.00"), "partial"), (3, Decimal("0.00"), "open")]
+
+    payment = create_payment(session, PaymentCreate(contract_id=c.id, amount=Decimal("800.00")))
+    session.expire_all()
+    assert [s for _, _, s in _statuses(session, c)] == ["paid", "paid", "paid"]
+
+    delete_payment(session, payment)
+    session.expire_all()
+    assert [s for _, _, s in _statuses(session, c)] == ["paid", "partial", "open"]
+
+def test_parse_period():
+    assert parse_period("2025-02") == date(2025, 2, 1)
+    with pytest.raises(ValueError):
+        parse_period("02/2025")
@@ -0,0 +1,109 @@
+import json
+import subprocess
+import sys
+import pytest
+from datetime import date
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.metrics import Registry, render
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Contract, Room, Tenant, User
+from app.routes.auth import require_user_ui
+from app.services.reports import _counters_cache
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    db.add_all([Tenant(name="T"), Room(number="101")])
+    db.flush()
+    db.add(Contract(tenant_id=1, room_id=1, start_date=date(2025, 1, 1), rent_amount=Decimal("500.00")))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    _counters_cache.clear()
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        _counters_cache.clear()
+
+def _value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{sample} not in metrics")
+
+def test_metrics_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    client.headers["Authorization"] = "Bearer s3cret"
+    before = client.get("/metrics").text
+    assert client.get("/rooms/ui").status_code == 200
+    res = client.get("/metrics")
+    assert res.headers["content-type"].startswith("text/plain")
+
+    sample = 'http_requests_total{method="GET",route="/rooms/ui",status="200"}'
+    assert _value(res.text, sample) == (_value(before, sample) if sample in before else 0) + 1
+    assert _value(res.text, 'template_render_seconds_count{template="rooms.html"}') >= 1
+    assert _value(res.text, 'http_request_duration_seconds_bucket{method="GET",route="/rooms/ui",le="+Inf"}') >= 1
+    assert _value(res.text, "sbms_active_contracts") == 1
+    assert "# TYPE http_request_duration_seconds histogram" in res.text
+
+def test_metrics_token(client, monkeypatch):
+    # no token configured: open, but without the business gauges
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert "sbms_" not in res.text and "http_requests_total" in res.text
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    res = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert res.status_code == 200 and "sbms_active_contracts" in res.text
+
+def test_health_db_details_need_the_metrics_token(client, monkeypatch):
+    assert client.get("/health/db").json() == {"status": "ok"}
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/health/db", headers={"Authorization": "Bearer wrong"}).json() == {"status": "ok"}
+    res = client.get("/health/db", headers={"Authorization": "Bearer s3cret"}).json()
+    assert res["status"] == "ok" and "engine" in res
+
+def test_workers_are_merged(tmp_path):
+    registry = Registry(str(tmp_path))
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    busy = registry.gauge("busy", "Busy connections.")
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(2, route="/a")
+    busy.set(1)
+    latency.observe(0.05)
+
+    # a worker that has since exited: its counters still count, its gauges do not
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True).stdout.strip()
+    snapshot = registry.snapshot()
+    snapshot["pid"] = int(dead)
+    (tmp_path / f"metrics-{dead}.json").write_text(json.dumps(snapshot))
+    latency.observe(0.5)
+
+    text = render(registry.collect())
+    assert _value(text, 'requests_total{route="/a"}') == 4
+    assert _value(text, "busy") == 1
+    assert _value(text, 'latency_seconds_bucket{le="0.1"}') == 2
+    assert _value(text, 'latency_seconds_bucket{le="1.0"}') == 3
+    assert _value(text, "latency_seconds_count") == 3
@@ -2,11 +2,11 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime
 
 from app.db.session import Base
-from app.models import Tenant, Room, Contract
-from app.services.payments import create_payment, total_paid_for_contract
+from app.models import Tenant, Room, Contract, Payment
+from app.services.payments import create_payment, delete_payment, total_paid_for_contract, page_payments, reconcile_contract_balances
 from app.schemas.payment import PaymentCreate
 
 @pytest.fixture
@@ -37,4 +37,63 @@ def test_create_payment_and_total(session):
     assert p.id is not None
 
     total = total_paid_for_contract(session, c.id)
-    assert total == Decimal("500.00")
\ No newline at end of file
+    assert total == Decimal("500.00")
+
+def test_page_payments_keyset(session):
+    t = Tenant(name="Dana")
+    r = Room(number="301")
+    session.add_all([t, r])
+    session.commit()
+    c = Contract(tenant_id=t.id, room_id=r.id, start_date=date(2025,1,1), end_date=None, rent_amount=Decimal("500.00"))
+    session.add(c)
+    session.commit()
+
+    # several payments share a paid_at so the id tie-breaker is exercised
+    for i in range(7):
+        session.add(Payment(contract_id=c.id, amount=Decimal("10.00"), paid_at=datetime(2025, 1, 1 + i // 3)))
+    session.commit()
+
+    seen = []
+    after = None
+    while True:
+        page = page_payments(session, 3, after)
+        seen.extend(p.id for p in page.items)
+        if not page.next_cursor:
+            break
+        after = page.next_cursor
+
+    expected = [p.id for p in session.query(Payment).order_by(Payment.paid_at.desc(), Payment.id.desc())]
+    assert seen == expected
+
+    with pytest.raises(ValueError):
+        page_payments(session, 3, "not-a-cursor")
+
+
+def test_running_balance_and_reconcile(session):
+    t = Tenant(name="Eve")
+    r = Room(number="401")
+    session.add_all([t, r])
+    session.commit()
+    c = Contract(tenant_id=t.id, room_id=r.id, start_date=date(2025,1,1), end_date=None, rent_amount=Decimal("500.00"))
+    session.add(c)
+    session.commit()
+
+    p1 = create_payment(session, PaymentCreate(contract_id=c.id, amount=Decimal("200.00")))
+    p2 = create_payment(session, PaymentCreate(contract_id=c.id, amount=Decimal("300.00")))
+    session.refresh(c)
+    assert c.total_paid == Decimal("500.00")
+    assert c.payment_count == 2
+    assert c.last_paid_at == p2.paid_at
+
+    delete_payment(session, p2)
+    session.refresh(c)
+    assert c.total_paid == Decimal("200.00")
+    assert c.payment_count == 1
+    assert c.last_paid_at == p1.paid_at
+    assert reconcile_contract_balances(session) == []
+
+    # drift is detected and repaired
+    c.total_paid = Decimal("999.00")
+    session.commit()
+    assert [m["id"] for m in reconcile_contract_balances(session, fix=True)] == [c.id]
+    assert total_paid_for_contract(session, c.id) == Decimal("200.00")
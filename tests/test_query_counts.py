@@ -0,0 +1,67 @@
+import pytest
+from decimal import Decimal
+from datetime import date, datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Tenant, Room, Contract, Payment, User
+from app.routes.auth import require_user_ui
+
+@pytest.fixture
+def env():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield SessionLocal, statements, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def _seed(SessionLocal, n: int):
+    db = SessionLocal()
+    for i in range(n):
+        t = Tenant(name=f"Tenant {i}")
+        r = Room(number=f"{100 + i}")
+        db.add_all([t, r])
+        db.flush()
+        c = Contract(tenant_id=t.id, room_id=r.id, start_date=date(2025, 1, 1), rent_amount=Decimal("500.00"))
+        db.add(c)
+        db.flush()
+        db.add(Payment(contract_id=c.id, amount=Decimal("500.00"), paid_at=datetime(2025, 1, 5)))
+    db.commit()
+    db.close()
+
+def _count(client, statements, path: str) -> int:
+    statements.clear()
+    res = client.get(path)
+    assert res.status_code == 200
+    return len(statements)
+
+@pytest.mark.parametrize("path", ["/contracts/ui", "/payments/ui", "/payments/ui/new", "/contracts/ui/1"])
+def test_page_query_count_is_constant(env, path):
+    SessionLocal, statements, client = env
+
+    _seed(SessionLocal, 2)
+    small = _count(client, statements, path)
+
+    _seed(SessionLocal, 20)
+    large = _count(client, statements, path)
+
+    assert large == small
@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.replicas as replicas_mod
+from app.db.replicas import STICKY_COOKIE, ReplicaRouter, replica_urls
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Tenant, User
+from app.routes.auth import require_user_ui
+
+def _database(path, name):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Tenant(name=name))
+    db.commit()
+    db.close()
+    return engine
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    # two SQLite files stand in for the primary and a (lagging) replica
+    primary = _database(tmp_path / "primary.db", "on primary")
+    replica = _database(tmp_path / "replica.db", "on replica")
+    PrimarySession = sessionmaker(autocommit=False, autoflush=False, bind=primary)
+
+    def override_get_db():
+        db = PrimarySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    router = ReplicaRouter([replica])
+    monkeypatch.setattr(replicas_mod, "replicas", router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield router, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def _names(client):
+    res = client.get("/tenants/")
+    assert res.status_code == 200, res.text
+    return [t["name"] for t in res.json()]
+
+def test_list_reads_go_to_the_replica_and_writes_to_the_primary(env):
+    _, client = env
+    assert _names(client) == ["on replica"]
+    # single-row reads stay on the primary
+    assert client.get("/tenants/1").json()["name"] == "on primary"
+
+def test_reads_stick_to_the_primary_after_a_write(env):
+    _, client = env
+    res = client.post("/tenants/", json={"name": "new"})
+    assert res.status_code == 201
+    assert STICKY_COOKIE in res.cookies
+    assert _names(client) == ["new", "on primary"]
+
+    client.cookies.clear()
+    assert _names(client) == ["on replica"]
+
+def test_failed_writes_do_not_stick(env):
+    _, client = env
+    res = client.post("/tenants/", json={})
+    assert res.status_code == 422
+    assert STICKY_COOKIE not in res.cookies
+
+def test_unreachable_replica_is_skipped(env, tmp_path, monkeypatch):
+    router, client = env
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monkeypatch.setattr(replicas_mod, "replicas", ReplicaRouter([broken, *router.engines]))
+    assert _names(client) == ["on replica"]
+    assert _names(client) == ["on replica"]
+    assert [r["healthy"] for r in replicas_mod.replicas.status()] == [False, True]
+
+    # with no replica left, reads fall back to the primary
+    monkeypatch.setattr(replicas_mod, "replicas", ReplicaRouter([broken]))
+    assert _names(client) == ["on primary"]
+
+def test_no_replicas_configured(env, monkeypatch):
+    _, client = env
+    monkeypatch.setattr(replicas_mod, "replicas", ReplicaRouter([]))
+    assert _names(client) == ["on primary"]
+    assert STICKY_COOKIE not in client.post("/tenants/", json={"name": "new"}).cookies
+    assert replica_urls(" sqlite:///a.db, ,postgresql://r2/sbms ") == ["sqlite:///a.db", "postgresql://r2/sbms"]
@@ -0,0 +1,71 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Contract, Payment, Room, Tenant
+from app.services.reports import arrears
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _contract(db, number, start, rent, end=None, active=True, payments=()):
+    t, r = Tenant(name=f"T{number}"), Room(number=number)
+    db.add_all([t, r])
+    db.flush()
+    c = Contract(tenant_id=t.id, room_id=r.id, start_date=start, end_date=end, rent_amount=Decimal(rent), active=active)
+    db.add(c)
+    db.flush()
+    for paid_at, amount in payments:
+        db.add(Payment(contract_id=c.id, amount=Decimal(amount), paid_at=paid_at))
+    return c
+
+def test_arrears(session):
+    late = _contract(session, "1", date(2025, 1, 15), "500.00", payments=[
+        (datetime(2025, 1, 15), "500.00"), (datetime(2025, 2, 20), "700.00"),
+        (datetime(2025, 4, 21), "800.00"),  # after as_of, ignored
+    ])
+    due_today = _contract(session, "2", date(2025, 4, 20), "500.00")
+    ended = _contract(session, "3", date(2024, 1, 1), "100.00", end=date(2024, 6, 30), payments=[(datetime(2024, 3, 1), "600.00")])
+    future = _contract(session, "4", date(2025, 5, 1), "500.00")
+    _contract(session, "5", date(2024, 1, 1), "500.00", active=False)
+    session.commit()
+
+    report = arrears(session, as_of=date(2025, 4, 20))
+    rows = {r["contract_id"]: r for r in report["rows"]}
+    assert set(rows) == {late.id, due_today.id, ended.id, future.id}
+
+    r = rows[late.id]
+    assert (r["periods_due"], r["expected"], r["paid"], r["balance"]) == (4, Decimal("2000.00"), Decimal("1200.00"), Decimal("800.00"))
+    assert (r["days_overdue"], r["bucket"]) == (36, "31-60")  # oldest unpaid period fell due on Mar 15
+
+    assert (rows[due_today.id]["balance"], rows[due_today.id]["days_overdue"], rows[due_today.id]["bucket"]) == (Decimal("500.00"), 0, "current")
+    assert (rows[ended.id]["periods_due"], rows[ended.id]["balance"]) == (6, Decimal("0.00"))
+    assert (rows[future.id]["periods_due"], rows[future.id]["balance"]) == (0, Decimal("0.00"))
+
+    assert report["outstanding"] == Decimal("1300.00")
+    assert report["buckets"]["31-60"] == {"count": 1, "balance": Decimal("800.00")}
+    assert [r["contract_id"] for r in arrears(session, date(2025, 4, 20), overdue_only=True)["rows"]] == [late.id, due_today.id]
+
+def test_arrears_month_end_start(session):
+    # Jan 31 + 1 month falls due on Feb 28, not Mar 3
+    c = _contract(session, "1", date(2025, 1, 31), "500.00", payments=[(datetime(2025, 1, 31), "500.00")])
+    session.commit()
+    row = arrears(session, as_of=date(2025, 3, 10))["rows"][0]
+    assert (row["contract_id"], row["periods_due"], row["days_overdue"]) == (c.id, 2, 10)
+
+    # and it counts as due on Feb 28 itself, in expected, balance and days overdue alike
+    row = arrears(session, as_of=date(2025, 2, 28))["rows"][0]
+    assert (row["periods_due"], row["expected"], row["balance"], row["days_overdue"]) == (2, Decimal("1000.00"), Decimal("500.00"), 0)
+    row = arrears(session, as_of=date(2025, 2, 27))["rows"][0]
+    assert (row["periods_due"], row["balance"]) == (1, Decimal("0.00"))
@@ -3,8 +3,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import Base
-from app.models import Room
-from app.services.rooms import create_room, get_room, list_rooms, update_room, delete_room
+from app.models import Room, RoomLabel
+from app.services.rooms import _facet_cache, create_room, get_room, list_rooms, update_room, delete_room, search_rooms
 from app.schemas.room import RoomCreate
 
 @pytest.fixture
@@ -13,6 +13,7 @@ def session():
     Base.metadata.create_all(bind=engine)
     SessionLocal = sessionmaker(bind=engine)
     db = SessionLocal()
+    _facet_cache.clear()
     try:
         yield db
     finally:
@@ -56,4 +57,59 @@ def test_crud_room(session):
     assert updated.capacity == 3
 
     delete_room(session, updated)
-    assert get_room(session, r.id) is None
\ No newline at end of file
+    assert get_room(session, r.id) is None
+def test_search_rooms_filters_and_facets(session):
+    specs = [
+        ("101", "1", 80, True, True, ["quiet"], ["wifi", "tv"]),
+        ("201", "2", 120, True, True, ["quiet", "garden"], ["wifi"]),
+        ("202", "2", 300, True, False, ["garden"], ["WiFi "]),
+        ("203", "2", 150, False, True, [], []),
+    ]
+    for number, floor, price, has_ac, private_bath, tags, amenities in specs:
+        create_room(session, RoomCreate(number=number, floor=floor, price=price, has_ac=has_ac, private_bath=private_bath, tags=tags, amenities=amenities))
+
+    res = search_rooms(session, 10, floor="2", has_ac=True, amenities=["wifi"])
+    assert sorted(r.number for r in res["items"]) == ["201", "202"]
+    assert res["total"] == 2
+    assert res["facets"]["private_bath"] == {"true": 1, "false": 1}
+    assert res["facets"]["price"] == {"100-250": 1, "250-500": 1}
+    assert res["facets"]["tags"] == {"garden": 2, "quiet": 1}
+
+    res = search_rooms(session, 1, tags=["quiet", "garden"], price_max=200)
+    assert [r.number for r in res["items"]] == ["201"] and res["next_cursor"] is None
+
+    page = search_rooms(session, 2)
+    assert page["total"] == 4 and page["next_cursor"]
+    rest = search_rooms(session, 2, page["next_cursor"])
+    assert [r.number for r in rest["items"]] == ["201", "101"]
+
+def test_search_rooms_facets_are_disjunctive(session):
+    for number, floor, has_ac in (("101", "1", True), ("201", "2", True), ("202", "2", True), ("203", "2", False)):
+        create_room(session, RoomCreate(number=number, floor=floor, has_ac=has_ac, tags=["quiet"] if floor == "1" else []))
+
+    res = search_rooms(session, 10, floor="2", has_ac=True)
+    assert res["total"] == 2
+    # each facet ignores its own filter, so the alternatives keep their counts
+    assert res["facets"]["floor"] == {"1": 1, "2": 2}
+    assert res["facets"]["has_ac"] == {"true": 2, "false": 1}
+    assert res["facets"]["tags"] == {}
+
+    res = search_rooms(session, 10, floor="1")
+    assert res["facets"]["floor"] == {"1": 1, "2": 3}
+    assert res["facets"]["tags"] == {"quiet": 1}
+
+def test_search_rooms_caches_unfiltered_facets(session):
+    create_room(session, RoomCreate(number="101", floor="1"))
+    assert search_rooms(session, 10)["facets"]["floor"] == {"1": 1}
+    assert len(_facet_cache._data) == 8
+
+    # a new room changes the table's ETag, so the cached counts are not reused
+    create_room(session, RoomCreate(number="201", floor="2"))
+    assert search_rooms(session, 10)["facets"]["floor"] == {"1": 1, "2": 1}
+
+def test_room_labels_follow_updates(session):
+    room = create_room(session, RoomCreate(number="1", tags=["a", "b"]))
+    update_room(session, room, tags=["c"])
+    assert session.query(RoomLabel.value).filter_by(room_id=room.id).all() == [("c",)]
+    delete_room(session, room)
+    assert session.query(RoomLabel).count() == 0
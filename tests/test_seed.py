@@ -0,0 +1,20 @@
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+import scripts.seed as seed
+from app.db.session import Base
+from app.models import Contract, Payment
+
+def test_seed_scale_keeps_foreign_keys(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(seed, "SessionLocal", sessionmaker(bind=engine))
+
+    # far more payments per room than one batch holds
+    seed.seed_scale({"rooms": 2, "tenants": 5, "contracts": 4, "payments": 600}, batch_size=50)
+
+    db = sessionmaker(bind=engine)()
+    assert db.query(func.count(Payment.id)).scalar() == 600
+    assert db.query(func.sum(Contract.payment_count)).scalar() == 600
+    db.close()
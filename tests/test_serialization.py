@@ -0,0 +1,78 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Contract, Payment, Room, Tenant, User
+from app.routes.auth import require_user_ui
+from app.schemas import ContractRead, PaymentRead, RoomRead, TenantRead
+
+@pytest.fixture(params=[True, False], ids=["fast", "pydantic"])
+def env(request, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_LISTS", request.param)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    db.add_all([
+        Tenant(name="Ābebe \"Q\"", email="a@example.com", dob=date(1990, 5, 17), metadata_json={"vip": True, "n": [1, 2]}),
+        Tenant(name="Bob"),
+        Room(number="101", price=Decimal("450.50"), sq_meters=12.25, tags=["quiet"], amenities=["wifi", "desk"]),
+        Room(number="102"),
+    ])
+    db.flush()
+    db.add(Contract(tenant_id=1, room_id=1, start_date=date(2025, 1, 1), rent_amount=Decimal("450.50")))
+    db.flush()
+    db.add(Payment(contract_id=1, amount=Decimal("100.10"), paid_at=datetime(2025, 1, 5, 9, 30, 0, 123456), method="cash"))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield SessionLocal, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+@pytest.mark.parametrize("path,model,schema,order", [
+    ("/tenants/", Tenant, TenantRead, Tenant.id.desc()),
+    ("/rooms/", Room, RoomRead, Room.id.desc()),
+    ("/contracts/", Contract, ContractRead, Contract.id.desc()),
+    ("/payments/", Payment, PaymentRead, Payment.id.desc()),
+])
+def test_list_bodies_match_pydantic(env, path, model, schema, order):
+    SessionLocal, client = env
+    db = SessionLocal()
+    adapter = TypeAdapter(List[schema])
+    expected = adapter.dump_python(adapter.validate_python(db.query(model).order_by(order).all(), from_attributes=True), mode="json")
+    db.close()
+
+    res = client.get(path)
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+    assert "ETag" in res.headers
+    assert res.json() == expected
+
+def test_list_keeps_cursor_and_openapi(env):
+    _, client = env
+    res = client.get("/tenants/", params={"limit": 1})
+    assert [t["name"] for t in res.json()] == ["Bob"]
+    assert [t["name"] for t in client.get("/tenants/", params={"limit": 1, "after": res.headers["X-Next-Cursor"]}).json()] == ["Ābebe \"Q\""]
+
+    schema = app.openapi()["paths"]["/tenants/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"type": "array", "items": {"$ref": "#/components/schemas/TenantRead"}, "title": "Response List Tenants Tenants  Get"}
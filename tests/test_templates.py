@@ -0,0 +1,27 @@
+from app.core.templates import env, fragment_cache, templates
+
+def test_fragment_cache_renders_once_per_key():
+    fragment_cache.clear()
+    tpl = env.from_string('{% cache "greeting", key %}<b>{{ name }}</b>{% endcache %}')
+    assert tpl.render(key=1, name="Abebe") == "<b>Abebe</b>"
+    # same key: the cached fragment wins even though the context changed
+    assert tpl.render(key=1, name="Almaz") == "<b>Abebe</b>"
+    assert tpl.render(key=2, name="<Almaz>") == "<b>&lt;Almaz&gt;</b>"
+
+def test_cached_fragment_skips_lazy_loader():
+    fragment_cache.clear()
+    calls = []
+
+    def rows():
+        calls.append(1)
+        return [1, 2, 3]
+
+    tpl = env.from_string('{% cache "rows", key %}{% for r in rows() %}{{ r }}{% endfor %}{% endcache %}')
+    assert [tpl.render(key="v1", rows=rows) for _ in range(3)] == ["123"] * 3
+    assert len(calls) == 1
+
+def test_routers_share_one_environment():
+    import app.main
+    from app.routes import auth, contracts, payments, tenants
+    assert all(m.templates is templates for m in (app.main, auth, contracts, payments, tenants))
+    assert env.bytecode_cache is not None
@@ -4,7 +4,7 @@ from sqlalchemy.orm import sessionmaker
 
 from app.db.session import Base
 from app.models import Tenant
-from app.services.tenants import create_tenant, get_tenant, list_tenants, update_tenant, delete_tenant
+from app.services.tenants import create_tenant, get_tenant, list_tenants, page_tenants, search_tenants, update_tenant, delete_tenant
 from app.schemas.tenant import TenantCreate
 
 @pytest.fixture
@@ -34,4 +34,44 @@ def test_crud_tenant(session):
     assert updated.name == "Charles"
 
     delete_tenant(session, updated)
-    assert get_tenant(session, t.id) is None
\ No newline at end of file
+    assert get_tenant(session, t.id) is None
+
+def test_page_tenants(session):
+    for i in range(5):
+        create_tenant(session, TenantCreate(name=f"Tenant {i}"))
+
+    first = page_tenants(session, 2)
+    assert [t.name for t in first.items] == ["Tenant 4", "Tenant 3"]
+    assert first.next_cursor
+
+    second = page_tenants(session, 2, first.next_cursor)
+    assert [t.name for t in second.items] == ["Tenant 2", "Tenant 1"]
+
+    last = page_tenants(session, 2, second.next_cursor)
+    assert [t.name for t in last.items] == ["Tenant 0"]
+    assert last.next_cursor is None
+
+def test_search_tenants(session):
+    ann = create_tenant(session, TenantCreate(name="Ann Smith", email="ann@example.com", phone="555-0101"))
+    create_tenant(session, TenantCreate(name="Bob Annadale", email="bob@example.com", id_number="X-9921"))
+    create_tenant(session, TenantCreate(name="Cid", email="cid@annex.org"))
+
+    # name hits rank above email-domain hits
+    assert [t.name for t in search_tenants(session, "ann")][0] == "Ann Smith"
+    assert len(search_tenants(session, "ann")) == 3
+    assert [t.name for t in search_tenants(session, "smi ann")] == ["Ann Smith"]
+    assert [t.name for t in search_tenants(session, "9921")] == ["Bob Annadale"]
+    assert [t.name for t in search_tenants(session, "555-01")] == ["Ann Smith"]
+    assert search_tenants(session, '"*') == []
+
+    # the FTS table follows updates and deletes
+    update_tenant(session, ann, name="Anne Jones")
+    assert [t.name for t in search_tenants(session, "jones")] == ["Anne Jones"]
+    delete_tenant(session, ann)
+    assert search_tenants(session, "jones") == []
+
+def test_search_ranks_all_prefix_matches(session):
+    session.add_all([Tenant(name=f"Tenant {i}", email=f"ann{i}@example.com") for i in range(600)])
+    session.commit()
+    best = create_tenant(session, TenantCreate(name="Ann Smith"))
+    assert [t.id for t in search_tenants(session, "ann", limit=1)] == [best.id]
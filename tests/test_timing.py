@@ -0,0 +1,74 @@
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.timing import instrument_engine, normalize_sql, parameter_shape
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import Room, User
+from app.routes.auth import require_user_ui
+
+@pytest.fixture
+def env():
+    engine = instrument_engine(create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool))
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user_ui] = lambda: User(id=1, username="admin")
+    try:
+        yield engine, SessionLocal, TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def _timing(header: str) -> dict:
+    parts = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        parts[name] = dict(p.split("=", 1) for p in params)
+    return parts
+
+def test_server_timing_and_request_log(env, caplog):
+    _, SessionLocal, client = env
+    db = SessionLocal()
+    db.add_all([Room(number=str(100 + i)) for i in range(3)])
+    db.commit()
+    db.close()
+
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        res = client.get("/rooms/ui")
+    assert res.status_code == 200
+    timing = _timing(res.headers["Server-Timing"])
+    assert set(timing) == {"db", "tpl", "app", "total"}
+    assert timing["db"]["desc"] != '"0 queries"'
+    assert float(timing["tpl"]["dur"]) > 0
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert (line["event"], line["path"], line["status"]) == ("request", "/rooms/ui", 200)
+    assert line["db_queries"] >= 1 and line["template_ms"] > 0 and "db_slowest_sql" in line
+
+def test_slow_query_log_has_normalized_sql_and_parameter_types(env, caplog, monkeypatch):
+    engine, _, _ = env
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql"), engine.connect() as conn:
+        conn.execute(text("SELECT id FROM rooms\n  WHERE id IN (:a, :b, :c) AND number = :n"), {"a": 1, "b": 2, "c": 3, "n": "101"})
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["event"] == "slow_query"
+    assert line["sql"] == "SELECT id FROM rooms WHERE id IN (?, ...) AND number = ?"
+    assert line["params"] == ["int", "int", "int", "str"]
+
+def test_normalize_sql_collapses_value_rows():
+    assert normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    assert parameter_shape([{"a": 1}, {"a": 2}], executemany=True) == {"rows": 2, "shape": {"a": "int"}}
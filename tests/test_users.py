@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.core.security import create_access_token, decode_access_token, principal_cache, PasswordHashPool, PasswordPoolBusy
+from app.services.users import authenticate_user_async, create_user, get_principal, set_user_active, token_claims
+from app.schemas.user import UserCreate
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    principal_cache.clear()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    db.info["statements"] = statements
+    try:
+        yield db
+    finally:
+        db.close()
+        principal_cache.clear()
+
+def test_principal_cache_and_deactivation(session):
+    statements = session.info["statements"]
+    user = create_user(session, UserCreate(username="erin", password="secret"))
+    payload = decode_access_token(create_access_token(subject=user.id, claims=token_claims(user)))
+    assert payload["active"] is True and payload["ver"] == 0
+
+    session.expunge_all()
+    statements.clear()
+    principal = get_principal(session, user.id, payload["ver"])
+    assert principal.username == "erin"
+    assert len(statements) == 1
+
+    # cache hit: no users query
+    statements.clear()
+    assert get_principal(session, user.id, payload["ver"]) == principal
+    assert statements == []
+
+    user = session.get(type(user), user.id)
+    set_user_active(session, user, False)
+    assert get_principal(session, user.id, payload["ver"]) is None
+
+def test_async_login_leaves_the_session_to_its_owner():
+    # the lookup runs on a threadpool worker, so the connection must be shareable
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    create_user(session, UserCreate(username="erin", password="secret"))
+    other = create_user(session, UserCreate(username="frank", password="secret"))
+
+    user = asyncio.run(authenticate_user_async(session, "erin", "secret"))
+    assert user.username == "erin"
+    # the connection went back to the pool, but the session was not closed
+    assert not session.in_transaction()
+    assert other in session
+    assert asyncio.run(authenticate_user_async(session, "erin", "wrong")) is None
+    session.close()
+
+def test_password_pool_rejects_when_saturated():
+    pool = PasswordHashPool(workers=1, queue_depth=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordPoolBusy):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        # slots are returned once the jobs finish
+        assert await pool.run(lambda: 42) == 42
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()